@@ -10,6 +10,7 @@ import PySimpleGUI as sg
 
 import REM.constants as mod_const
 import REM.data_collections as mod_col
+import REM.database as mod_db
 import REM.data_manipulation as mod_dm
 import REM.elements as mod_elem
 import REM.layouts as mod_lo
@@ -1051,7 +1052,8 @@ class BankRule:
         logger.debug('BankRule {NAME}: attempting to find associations for account {ACCT} records'
                      .format(NAME=self.name, ACCT=acct.name))
         func_args = {'df': df, 'ref_df': merged_df, 'rules': transactions}
-        func_results = thread_operation(search_associations, func_args, message='reconciling accounts')
+        func_results = thread_operation(search_associations, func_args, message='reconciling accounts',
+                                        use_process=True)
         if func_results['success']:
             matches = func_results['value']
         else:
@@ -1098,7 +1100,8 @@ class BankRule:
             df.drop(matched_indices, inplace=True)
 
             func_args = {'df': df, 'ref_df': merged_df, 'rules': transactions}
-            func_results = thread_operation(search_associations_expanded, func_args, message='reconciling accounts')
+            func_results = thread_operation(search_associations_expanded, func_args, message='reconciling accounts',
+                                            use_process=True)
             if func_results['success']:
                 matches = func_results['value']
             else:
@@ -1267,7 +1270,7 @@ class BankRule:
         Save record modifications and new record associations to the database.
         """
         pd.set_option('display.max_columns', None)
-        statements = {}
+        statements = mod_db.StatementBatch()
 
         # Prepare to save the account references and records
 
@@ -1396,13 +1399,7 @@ class BankRule:
         logger.info('BankRule {NAME}: saving the results of account {ACCT} reconciliation'
                     .format(NAME=self.name, ACCT=self.current_account))
 
-        sstrings = []
-        psets = []
-        for i, j in statements.items():
-            sstrings.append(i)
-            psets.append(j)
-
-        success = user.write_db(sstrings, psets)
+        success = mod_db.write_statements(statements)
         print(statements)
         #success = True
 
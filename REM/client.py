@@ -10,15 +10,21 @@ import locale
 import logging
 import logging.handlers as handlers
 import os
+import queue
+import re
+import selectors
 import socket
 import struct
 import sys
 import textwrap
+import threading
 import time
-from random import randint
+from collections import OrderedDict, deque
+from random import randint, uniform
 
 import PySimpleGUI as sg
 import dateutil
+import numpy as np
 import pandas as pd
 import yaml
 from bson import json_util
@@ -28,10 +34,21 @@ import REM.constants as mod_const
 
 
 class ServerConnection:
+    # Maximum time, in seconds, to wait on the socket before refreshing the progress animation
+    poll_interval = 0.05
+
+    # Requests that can be safely sent again after the connection to the server is restored
+    idempotent_actions = ('constants', 'db_schema', 'db_aggregate', 'db_login', 'permissions')
+
     def __init__(self, sock, addr):
         self.sock = sock
         self.addr = addr
 
+        # Connection state: connected, reconnecting, or disconnected
+        self.state = 'connected'
+        self._connection_lost = False
+        self._watchers = []
+
         # Dynamic attributes
         self.request = None
         self._recv_buffer = b""
@@ -43,6 +60,17 @@ class ServerConnection:
         self.header = None
         self.response = None
 
+        # Time spent serializing and decoding the current request
+        self._timings = {}
+
+        # Whether all of the current request has been sent to the server
+        self._request_sent = False
+
+        # Requests are sent to the server in order by a single I/O thread that owns the socket
+        self._requests = queue.Queue()
+        self._io_thread = None
+        self._io_lock = threading.Lock()
+
     def _reset(self):
         """
         Reset dynamic attributes.
@@ -57,44 +85,94 @@ class ServerConnection:
         self.header = None
         self.response = None
 
-    def _reset_connection(self, timeout: int = 20):
+    def _set_state(self, state):
+        """
+        Set the connection state and notify any windows watching the connection.
+        """
+        if state == self.state:
+            return
+
+        logger.info('connection to server {ADDR} is {STATE}'.format(ADDR=self.addr, STATE=state))
+        self.state = state
+
+        for window, event in self._watchers[:]:
+            try:
+                window.write_event_value(event, state)
+            except Exception as e:  # window was closed
+                logger.debug('removing connection state watcher - {}'.format(e))
+                self._watchers.remove((window, event))
+
+    def _reset_connection(self, timeout: int = None):
         """
-        Reset a lost connection to the server.
+        Reset a lost connection to the server, waiting between attempts with jittered exponential backoff. Only
+        called from the I/O thread.
         """
+        timeout = timeout if timeout is not None else settings.reconnect_timeout
+
+        self._set_state('reconnecting')
+        try:
+            self.sock.close()
+        except (OSError, AttributeError):
+            pass
+
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        except socket.error as e:
-            msg = 'socket creation failed - {ERR}'.format(ERR=e)
-            logger.error('{MSG}'.format(MSG=msg))
+            self.sock = connect_socket(self.addr, timeout=timeout)
+        except ConnectionError:
+            self.sock = None
+            self._set_state('disconnected')
+
             raise
-        else:
-            sock.setblocking(False)
 
-        self.sock = sock
+        self._connection_lost = False
+        self._set_state('connected')
 
-        success = False
-        start_time = time.time()
-        sg.popup_animated(image_source=None)
-        while time.time() - start_time < timeout:
-            sg.popup_animated(mod_const.PROGRESS_GIF, time_between_frames=50, keep_on_top=True, alpha_channel=0.8)
+    def _peer_closed(self):
+        """
+        Check whether the server has closed the connection, such as after the connection was left idle. Only called
+        from the I/O thread, between requests.
+        """
+        sel = selectors.DefaultSelector()
+        try:
+            sel.register(self.sock, selectors.EVENT_READ)
+            if not sel.select(timeout=0):  # nothing to read and no end of file
+                return False
+
+            return self.sock.recv(1, socket.MSG_PEEK) == b''
+        except BlockingIOError:
+            return False
+        except (OSError, ValueError):
+            return True
+        finally:
+            sel.close()
 
+    def _is_idempotent(self, request):
+        """
+        Check whether a request can be safely sent to the server again.
+        """
+        try:
+            action = request['content']['action']
+        except (KeyError, TypeError):
+            return False
+
+        if action == 'db_transact':
             try:
-                self.sock.connect(self.addr)
-            except BlockingIOError:
-                # Resource temporarily unavailable (errno EWOULDBLOCK)
-                pass
-            except socket.error:
-                time.sleep(1)
-            else:
-                msg = 'connection accepted from server {ADDR}'.format(ADDR=self.addr)
-                logger.info(msg)
-                success = True
+                return request['content']['value']['transaction_type'] == 'read'
+            except (KeyError, TypeError):
+                return False
 
-                break
+        return action in self.idempotent_actions
 
-        sg.popup_animated(image_source=None)
-        if not success:
-            raise TimeoutError('failed to reconnect to the server after {} seconds'.format(timeout))
+    def watch(self, window, event: str):
+        """
+        Notify a window of changes to the connection state.
+
+        Arguments:
+            window: PySimpleGUI window to notify.
+
+            event (str): event key written to the window event loop, with the connection state as the event value.
+        """
+        self._watchers.append((window, event))
+        window.write_event_value(event, self.state)
 
     def _read(self):
         try:
@@ -103,21 +181,11 @@ class ServerConnection:
         except BlockingIOError:
             # Resource temporarily unavailable (errno EWOULDBLOCK)
             pass
-        except ConnectionResetError:
-            msg = 'connection to {ADDR} was closed for unknown reason ... attempting to reconnect' \
-                .format(ADDR=self.addr)
-            logger.error(msg)
-            try:
-                self._reset_connection()
-            except (socket.error, TimeoutError) as e:
-                msg = 'connection reset failed - {}'.format(e)
-                logger.exception(msg)
-                popup_error(msg)
         else:
             if data:  # 0 indicates a closed connection
                 self._recv_buffer += data
             else:
-                raise RuntimeError("Peer connection closed")
+                raise ConnectionError("Peer connection closed")
 
     def _write(self):
         if self._send_buffer:
@@ -125,11 +193,6 @@ class ServerConnection:
                 sent = self.sock.send(self._send_buffer)
             except BlockingIOError:  # resource temporarily unavailable (errno EWOULDBLOCK)
                 pass
-            except ConnectionResetError:
-                msg = 'connection to {ADDR} was closed for unknown reason ... attempting to reconnect' \
-                    .format(ADDR=self.addr)
-                logger.error(msg)
-                self._reset_connection()
             else:
                 # Remove the sent portion of the message from the buffer
                 self._send_buffer = self._send_buffer[sent:]
@@ -158,7 +221,27 @@ class ServerConnection:
 
         return message
 
-    def process_request(self, request, timeout: int = 60):
+    def _watch(self, sel, events):
+        """
+        Set the socket events to wait on, registering the socket again if it was replaced by a connection reset.
+        """
+        try:
+            key = sel.get_key(self.sock)
+        except KeyError:
+            for key in list(sel.get_map().values()):
+                sel.unregister(key.fileobj)
+            sel.register(self.sock, events)
+        else:
+            if key.events != events:
+                sel.modify(self.sock, events)
+
+    def _transact(self, request, timeout: int = 60):
+        """
+        Send a request to the server and wait for the response. Only called from the I/O thread.
+        """
+        self._timings = {'serialize': 0, 'decode': 0, 'sent': 0, 'received': 0}
+        self._request_sent = False
+
         try:
             self.action = request['content']['action']
         except KeyError:
@@ -167,26 +250,46 @@ class ServerConnection:
 
         self.request = request
 
+        if self.sock is None:
+            self._connection_lost = True
+
+            return {'success': False, 'value': 'not connected to the server {}'.format(self.addr)}
+
+        # Wait on the socket in bounded slices instead of spinning
+        sel = selectors.DefaultSelector()
+
         start_time = time.time()
         while time.time() - start_time < timeout:
             elapsed_time = time.time() - start_time
-            if elapsed_time > 1:
-                sg.popup_animated(mod_const.PROGRESS_GIF, time_between_frames=50, keep_on_top=True, alpha_channel=0.8,
-                                  message='processing server request')
 
             if self.response is not None:
                 logger.debug('server process completed after {} seconds'.format(elapsed_time))
                 result = self.response
-                sg.popup_animated(image_source=None)
                 break
             else:
+                events = selectors.EVENT_READ if self._ready_to_read else selectors.EVENT_WRITE
+                try:
+                    self._watch(sel, events)
+                    ready = sel.select(timeout=self.poll_interval)
+                except (OSError, ValueError) as e:
+                    msg = 'server request failed after {TIME} seconds - {ERR}'.format(ERR=e, TIME=elapsed_time)
+                    result = {'success': False, 'value': msg}
+                    logger.error(msg)
+                    self._connection_lost = True
+
+                    break
+
+                if not ready:  # socket not ready within the time slice
+                    continue
+
                 if self._ready_to_read:
                     try:
                         self.read()
                     except Exception as err:
                         msg = 'server request failed after {TIME} seconds - {ERR}'.format(ERR=err, TIME=elapsed_time)
                         result = {'success': False, 'value': msg}
-                        sg.popup_animated(image_source=None)
+                        logger.error(msg)
+                        self._connection_lost = isinstance(err, OSError)
 
                         break
                 else:
@@ -195,21 +298,169 @@ class ServerConnection:
                     except Exception as e:
                         msg = 'server request failed after {TIME} seconds - {ERR}'.format(ERR=e, TIME=elapsed_time)
                         result = {'success': False, 'value': msg}
-                        sg.popup_animated(image_source=None)
                         logger.error(msg)
+                        self._connection_lost = isinstance(e, OSError)
 
                         break
         else:
             msg = 'server failed to respond to request after {} seconds'.format(timeout)
-            sg.popup_animated(image_source=None)
-            result = {'success': False, 'value': msg}
+            result = {'success': False, 'value': msg, 'timed_out': True}
             logger.error(msg)
 
+            # A late response would be mistaken for the response to the next request
+            self._connection_lost = True
+
+        sel.close()
+
         # Reset attributes for next event
         self._reset()
 
         return result
 
+    def _transact_with_retry(self, request, timeout: int = 60):
+        """
+        Send a request to the server, reconnecting if the connection was lost. A request is sent again once the
+        connection is restored if it is idempotent or if the connection failed before all of the request was sent.
+        """
+        # The server closes connections that were left idle, which is only seen by the client once it tries to read
+        if self._connection_lost or self.sock is None or self._peer_closed():
+            try:
+                self._reset_connection()
+            except ConnectionError as e:
+                return {'success': False, 'value': 'unable to reconnect to the server - {}'.format(e)}
+
+        result = self._transact(request, timeout=timeout)
+        if not self._connection_lost:
+            return result
+
+        try:
+            self._reset_connection()
+        except ConnectionError as e:
+            logger.error('connection to server {ADDR} lost - {ERR}'.format(ADDR=self.addr, ERR=e))
+
+            return result
+
+        # A request that timed out may still be in progress on the server, and a request that was sent in full may
+        # have been applied by the server before the connection failed, so neither can be safely sent again
+        timed_out = result.get('timed_out', False)
+        if not timed_out and (self._is_idempotent(request) or not self._request_sent):
+            logger.info('sending request "{REQ}" to {ADDR} again after reconnecting'
+                        .format(REQ=request['content']['action'], ADDR=self.addr))
+            result = self._transact(request, timeout=timeout)
+
+        return result
+
+    def _serve_requests(self):
+        """
+        Process queued requests in the order that they were submitted.
+        """
+        while True:
+            request, timeout, future, handler, window, event, trace = self._requests.get()
+            if request is None:  # connection closed
+                break
+
+            if not future.set_running_or_notify_cancel():  # request was cancelled before it was sent
+                continue
+
+            start_time = time.perf_counter()
+            transact_time = handler_time = None
+            try:
+                result = self._transact_with_retry(request, timeout=timeout)
+                transact_time = time.perf_counter()
+                if handler is not None:
+                    result = handler(result)
+                handler_time = time.perf_counter()
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+            if trace is not None:
+                end_time = time.perf_counter()
+                timings = self._timings
+                transact_time = transact_time if transact_time is not None else end_time
+                handler_time = handler_time if handler_time is not None else end_time
+                tracer.record(request, trace['caller'], queue=start_time - trace['submitted'],
+                              serialize=timings.get('serialize', 0), decode=timings.get('decode', 0),
+                              network=(transact_time - start_time) - timings.get('serialize', 0) -
+                              timings.get('decode', 0),
+                              frame=handler_time - transact_time, total=end_time - trace['submitted'],
+                              sent=timings.get('sent', 0), received=timings.get('received', 0),
+                              success=future.exception() is None)
+
+            if window is not None:
+                try:
+                    window.write_event_value(event, future)
+                except Exception as e:
+                    logger.warning('failed to notify the window of the completed request "{EVENT}" - {ERR}'
+                                   .format(EVENT=event, ERR=e))
+
+    def submit(self, request, timeout: int = 60, handler=None, window=None, event: str = None):
+        """
+        Queue a request for sending to the server without waiting for the response.
+
+        Arguments:
+            request (dict): server request.
+
+            timeout (int): seconds to wait for the server to respond [Default: 60].
+
+            handler: optional function applied to the server response, in the I/O thread, to produce the result of the
+                future.
+
+            window: optional PySimpleGUI window to notify when the request completes.
+
+            event (str): event key written to the window event loop, with the completed future as the event value.
+
+        Returns:
+            future (Future): future holding the server response, or the return value of the handler.
+        """
+        future = concurrent.futures.Future()
+
+        # Record the caller and submission time when tracing requests
+        trace = {'caller': tracer.caller(), 'submitted': time.perf_counter()} if tracer.enabled else None
+
+        with self._io_lock:
+            if self._io_thread is None or not self._io_thread.is_alive():
+                self._io_thread = threading.Thread(target=self._serve_requests, name='ServerConnection',
+                                                   daemon=True)
+                self._io_thread.start()
+
+            self._requests.put((request, timeout, future, handler, window, event, trace))
+
+        return future
+
+    def process_request(self, request, timeout: int = 60):
+        """
+        Send a request to the server and wait for the response.
+        """
+        future = self.submit(request, timeout=timeout)
+
+        return self.wait(future)
+
+    def wait(self, future):
+        """
+        Wait for a submitted request to complete and return its result.
+        """
+        # Only the main thread may update the progress animation
+        animate = threading.current_thread() is threading.main_thread()
+
+        start_time = time.time()
+        while True:
+            done, _ = concurrent.futures.wait([future], timeout=self.poll_interval)
+            if done:
+                break
+
+            if animate and time.time() - start_time > 1:
+                message = 'reconnecting to the server' if self.state == 'reconnecting' else \
+                    'processing server request'
+                sg.popup_animated(mod_const.PROGRESS_GIF, time_between_frames=50, keep_on_top=True, alpha_channel=0.8,
+                                  message=message)
+
+        if animate:
+            sg.popup_animated(image_source=None)
+
+        return future.result()
+
     def read(self):
         # Continuously read until no more data is received
         self._read()
@@ -241,10 +492,20 @@ class ServerConnection:
         if self._request_queued:
             if not self._send_buffer:
                 self._ready_to_read = True
+                self._request_sent = True
 
     def close(self):
         logger.info("closing connection to {ADDR}".format(ADDR=self.addr))
 
+        # Stop the I/O thread once any outstanding requests have been sent
+        with self._io_lock:
+            if self._io_thread is not None and self._io_thread.is_alive():
+                self._requests.put((None, None, None, None, None, None, None))
+                self._io_thread.join(timeout=5)
+
+        if self.sock is None:
+            return
+
         try:
             self.sock.close()
         except OSError as e:
@@ -253,8 +514,11 @@ class ServerConnection:
         finally:
             # Delete reference to socket object for garbage collection
             self.sock = None
+            self.state = 'disconnected'
 
     def queue_request(self):
+        start_time = time.perf_counter()
+
         content = self.request["content"]
         content_encoding = self.request["encoding"]
         req = {
@@ -265,6 +529,9 @@ class ServerConnection:
         self._send_buffer += message
         self._request_queued = True
 
+        self._timings['serialize'] = time.perf_counter() - start_time
+        self._timings['sent'] = len(message)
+
     def process_protoheader(self):
         hdrlen = 2
 
@@ -286,11 +553,16 @@ class ServerConnection:
         content_len = self.header["content-length"]
 
         if len(self._recv_buffer) >= content_len:
+            start_time = time.perf_counter()
+
             data = cipher.decrypt(self._recv_buffer[:content_len])
             self._recv_buffer = self._recv_buffer[content_len:]
 
             encoding = self.header["content-encoding"]
             self.response = self._decode(data, encoding)
+
+            self._timings['decode'] = time.perf_counter() - start_time
+            self._timings['received'] = content_len
             logger.info('receiving response to request "{REQ}" from {ADDR}'.format(REQ=self.action, ADDR=self.addr))
 
 
@@ -327,6 +599,7 @@ class SettingsManager:
         self._locales = {'en_US': 'English', 'en_UK': 'English', 'th_TH': 'Thai'}
         self.supported_display_date_formats = ['YYYY-MM-DD', 'YY-MM-DD', 'DD-MM-YYYY', 'DD-MM-YY', 'MM-DD-YY',
                                                'MM-DD-YYYY']
+        self._date_strs = {}  # parsed date formats by format string
 
         # CONFIGURABLE PARAMETERS
         # User parameters
@@ -481,6 +754,14 @@ class SettingsManager:
             logger.warning('unsupported value {} provided to server configuration parameter "port" ... setting to '
                            'default "65432"'.format(cnfg["server"]["port"]))
             self.port = 65432
+        try:
+            self.reconnect_timeout = float(cnfg['server']['reconnect_timeout'])
+        except KeyError:
+            self.reconnect_timeout = 60
+        except ValueError:
+            logger.warning('unsupported value {} provided to server configuration parameter "reconnect_timeout" ... '
+                           'setting to default "60"'.format(cnfg["server"]["reconnect_timeout"]))
+            self.reconnect_timeout = 60
 
         # Keyboard bindings
         self.hotkeys = {'-HK_ESCAPE-': ('Cancel Action', 'Key-Escape', 'Esc', 'General'),
@@ -532,6 +813,92 @@ class SettingsManager:
             self.dbname = cnfg['database']['default']
         except KeyError:
             self.dbname = None
+        try:
+            self.import_page_size = int(cnfg['database']['page_size'])
+        except KeyError:
+            self.import_page_size = 500
+        except ValueError:
+            logger.warning('unsupported value {} provided to database configuration parameter "page_size" ... setting '
+                           'to default "500"'.format(cnfg['database']['page_size']))
+            self.import_page_size = 500
+        try:
+            self.cache_size = float(cnfg['database']['cache_size'])
+        except KeyError:
+            self.cache_size = 64
+        except ValueError:
+            logger.warning('unsupported value {} provided to database configuration parameter "cache_size" ... setting '
+                           'to default "64"'.format(cnfg['database']['cache_size']))
+            self.cache_size = 64
+        try:
+            self.cache_ttl = float(cnfg['database']['cache_ttl'])
+        except KeyError:
+            self.cache_ttl = 300
+        except ValueError:
+            logger.warning('unsupported value {} provided to database configuration parameter "cache_ttl" ... setting '
+                           'to default "300"'.format(cnfg['database']['cache_ttl']))
+            self.cache_ttl = 300
+        try:
+            self.parallel_reads = int(cnfg['database']['parallel_reads'])
+        except KeyError:
+            self.parallel_reads = 4
+        except ValueError:
+            logger.warning('unsupported value {} provided to database configuration parameter "parallel_reads" ... '
+                           'setting to default "4"'.format(cnfg['database']['parallel_reads']))
+            self.parallel_reads = 4
+        try:
+            self.transaction_rows = int(cnfg['database']['transaction_rows'])
+        except KeyError:
+            self.transaction_rows = 10000
+        except ValueError:
+            logger.warning('unsupported value {} provided to database configuration parameter "transaction_rows" ... '
+                           'setting to default "10000"'.format(cnfg['database']['transaction_rows']))
+            self.transaction_rows = 10000
+        try:
+            self.transaction_size = float(cnfg['database']['transaction_size'])
+        except KeyError:
+            self.transaction_size = 4
+        except ValueError:
+            logger.warning('unsupported value {} provided to database configuration parameter "transaction_size" ... '
+                           'setting to default "4"'.format(cnfg['database']['transaction_size']))
+            self.transaction_size = 4
+        try:
+            self.constants_cache = cnfg['database']['constants_cache']
+        except KeyError:
+            self.constants_cache = os.path.join(os.path.expanduser('~'), '.rem', 'constants.json')
+        self.constants_version = None
+        try:
+            self.trace_enabled = bool(cnfg['trace']['enabled'])
+        except KeyError:
+            self.trace_enabled = False
+        try:
+            self.trace_file = cnfg['trace']['trace_file']
+        except KeyError:
+            self.trace_file = os.path.join(os.path.expanduser('~'), '.rem', 'requests.trace')
+        try:
+            self.trace_size = float(cnfg['trace']['max_size'])
+        except KeyError:
+            self.trace_size = 1
+        except ValueError:
+            logger.warning('unsupported value {} provided to trace configuration parameter "max_size" ... setting '
+                           'to default "1"'.format(cnfg['trace']['max_size']))
+            self.trace_size = 1
+        try:
+            self.worker_threads = int(cnfg['workers']['threads'])
+        except KeyError:
+            self.worker_threads = 4
+        except ValueError:
+            logger.warning('unsupported value {} provided to workers configuration parameter "threads" ... setting '
+                           'to default "4"'.format(cnfg['workers']['threads']))
+            self.worker_threads = 4
+        default_procs = max((os.cpu_count() or 2) - 1, 1)
+        try:
+            self.worker_processes = int(cnfg['workers']['processes'])
+        except KeyError:
+            self.worker_processes = default_procs
+        except ValueError:
+            logger.warning('unsupported value {VAL} provided to workers configuration parameter "processes" ... '
+                           'setting to default "{DEF}"'.format(VAL=cnfg['workers']['processes'], DEF=default_procs))
+            self.worker_processes = default_procs
         self.prog_db = None
         self.alt_dbs = None
         self.date_format = None
@@ -628,10 +995,114 @@ class SettingsManager:
 
         return param_aliases
 
+    def _constants_cache_file(self, addr):
+        """
+        Path of the cached configuration constants of a server.
+
+        Arguments:
+            addr (tuple): host and port of the server.
+
+        Returns:
+            cache_file (str): path to the cache file, or None if constants caching is disabled.
+        """
+        if not self.constants_cache:
+            return None
+
+        host, port = addr
+        root, ext = os.path.splitext(self.constants_cache)
+        server_id = re.sub(r'[^\w.-]', '_', '{}_{}'.format(host, port))
+
+        return '{ROOT}_{SERVER}{EXT}'.format(ROOT=root, SERVER=server_id, EXT=ext)
+
+    def _read_constants_cache(self, cache_file):
+        """
+        Read the cached copy of the configuration constants from the last connection to a server.
+        """
+        if not cache_file or not os.path.isfile(cache_file):
+            return None
+
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as cache_h:
+                cached = json_util.loads(cache_h.read())
+            version = cached['version']
+            configuration = cached['constants']
+        except Exception as e:
+            logger.warning('unable to read cached configuration constants from {FILE} - {ERR}'
+                           .format(FILE=cache_file, ERR=e))
+
+            return None
+
+        if not version or not isinstance(configuration, dict):
+            return None
+
+        return cached
+
+    def _write_constants_cache(self, cache_file, version, configuration):
+        """
+        Save the configuration constants of a server for use on the next start.
+        """
+        if not cache_file or not version:
+            return False
+
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+
+            tmp_file = '{}.tmp'.format(cache_file)
+            with open(tmp_file, 'w', encoding='utf-8') as cache_h:
+                cache_h.write(json_util.dumps({'version': version, 'constants': configuration}))
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            logger.warning('unable to save configuration constants to {FILE} - {ERR}'.format(FILE=cache_file, ERR=e))
+
+            return False
+
+        return True
+
+    def _revalidate_constants(self, cache_file, response):
+        """
+        Save the configuration constants returned by the server if they differ from the cached version.
+
+        The response is handled on the connection thread while the program is running on the cached constants, so
+        changed constants are only saved to the cache and take effect on the next start.
+        """
+        if response['success'] is False:
+            logger.warning('failed to revalidate the cached configuration constants - {}'.format(response['value']))
+
+            return False
+
+        configuration = response['value']
+        if configuration.get('modified', True) is False:
+            logger.info('cached configuration constants are current')
+
+            return False
+
+        logger.info('configuration constants have changed on the server ... saving the new configuration for the '
+                    'next start')
+        self._write_constants_cache(cache_file, configuration.get('version', None), configuration)
+
+        return True
+
     def load_constants(self, connection):
         """
         Load configuration constants.
+
+        The constants are loaded from the local cache of the server, if available, and then revalidated against the
+        server in the background. Otherwise the constants are requested from the server.
         """
+        cache_file = self._constants_cache_file(connection.addr)
+
+        cached = self._read_constants_cache(cache_file)
+        if cached is not None:
+            logger.info('loading configuration constants from the cache (version {})'.format(cached['version']))
+            self.apply_constants(cached['constants'])
+            self.constants_version = cached['version']
+
+            content = {'action': 'constants', 'value': {'version': cached['version']}}
+            request = {'content': content, 'encoding': "utf-8"}
+            connection.submit(request, handler=lambda response: self._revalidate_constants(cache_file, response))
+
+            return True
+
         # Prepare the request to the server
         content = {'action': 'constants', 'value': None}
         request = {'content': content, 'encoding': "utf-8"}
@@ -647,6 +1118,20 @@ class SettingsManager:
             configuration = {}
         else:
             configuration = response['value']
+            self._write_constants_cache(cache_file, configuration.get('version', None), configuration)
+
+        self.apply_constants(configuration)
+
+        return success
+
+    def apply_constants(self, configuration):
+        """
+        Set the configuration constants.
+
+        Arguments:
+            configuration (dict): configuration constants provided by the server.
+        """
+        self.constants_version = configuration.get('version', None)
 
         self.audit_rules = configuration.get('audit_rules', None)
         self.cash_rules = configuration.get('cash_rules', None)
@@ -686,8 +1171,6 @@ class SettingsManager:
         self.reference_lookup = table_field_attrs.get('reference_table', 'RecordReferences')
         self.bank_lookup = table_field_attrs.get('bank_table', 'Bank')
 
-        return success
-
     def layout(self, win_size: tuple = None):
         """
         Generate GUI layout for the settings window.
@@ -918,33 +1401,164 @@ class SettingsManager:
 
         return display_date
 
-    def format_date_str(self, date_str: str = None):
+    def format_display_money_values(self, values):
         """
-        Format a date string for use as input to datetime method.
+        Format a column of money data type values for displaying.
+
+        Equivalent to applying format_display_money to each value, but operates on the whole column at once.
 
         Arguments:
-            date_str (str): date string.
+            values (Series): money values.
+
+        Returns:
+            display_values (Series): formatted values with the index of the input values.
         """
-        separators = set(':/- ')
-        date_fmts = {'YYYY': '%Y', 'YY': '%y',
-                     'MMMM': '%B', 'MMM': '%b', 'MM': '%m', 'M': '%-m',
-                     'DD': '%d', 'D': '%-d',
-                     'HH': '%H', 'MI': '%M', 'SS': '%S'}
+        values = pd.Series(values)
+        display_values = pd.Series('0.00', index=values.index, dtype='object')
 
-        date_str = date_str if date_str else self.date_format
+        is_set = values.notna().to_numpy()
+        if not is_set.any():
+            return display_values
 
-        strfmt = []
+        # Truncate to whole cents as the per-value formatter does, rounding first to absorb floating point error
+        amounts = values.to_numpy(dtype=float)[is_set]
+        cents = np.floor(np.round(np.abs(amounts) * 100, 6)).astype(np.int64)
+        integers, decimals = np.divmod(cents, 100)
+        signs = np.where(np.signbit(amounts), '-', '')
 
-        last_char = date_str[0]
-        buff = [last_char]
-        for char in date_str[1:]:
-            if char not in separators:
-                if last_char != char:
-                    # Check if char is first in a potential series
-                    if last_char in separators:
-                        buff.append(char)
-                        last_char = char
-                        continue
+        dec_sep = self.decimal_sep
+        group_sep = self.thousands_sep
+        formatted = ['{}{:,}{}{:02d}'.format(sign, integer, dec_sep, decimal) for sign, integer, decimal in
+                     zip(signs.tolist(), integers.tolist(), decimals.tolist())]
+        if group_sep != ',':
+            formatted = [i.replace(',', group_sep) for i in formatted]
+
+        display_values[is_set] = formatted
+
+        return display_values
+
+    def format_display_date_values(self, values, offset: bool = True):
+        """
+        Format a column of datetime values for displaying based on configured date format.
+
+        Equivalent to applying format_display_date to each value, but operates on the whole column at once.
+
+        Arguments:
+            values (Series): datetime values.
+
+            offset (bool): add a localization-dependant offset to the display dates [default: True].
+
+        Returns:
+            display_values (Series): formatted values with the index of the input values.
+        """
+        values = pd.Series(values)
+        if not pd.api.types.is_datetime64_any_dtype(values.dtype):
+            return values.apply(self.format_display_date, offset=offset)
+
+        try:
+            display_values = self.format_date_values(values, date_format=self.display_date_format, offset=offset)
+        except Exception as e:
+            logger.debug('unable to format the date values as a column - {ERR}'.format(ERR=e))
+            display_values = values.apply(self.format_display_date, offset=offset).fillna('')
+
+        return display_values
+
+    def format_date_values(self, values, date_format: str = None, offset: bool = False):
+        """
+        Format datetime values as date strings.
+
+        Arguments:
+            values (Series): datetime values. A single value can also be provided.
+
+            date_format (str): date format, either as a date string (e.g. YYYY-MM-DD) or a strftime pattern [default:
+                the database date format].
+
+            offset (bool): add a localization-dependant offset to the dates [default: False].
+
+        Returns:
+            date_values (Series): date strings with the index of the input values, or a single date string if a single
+                value was provided. Missing values are formatted as empty strings.
+        """
+        is_scalar = pd.api.types.is_scalar(values)
+        values = pd.Series([values]) if is_scalar else pd.Series(values)
+        if not pd.api.types.is_datetime64_any_dtype(values.dtype):
+            values = pd.to_datetime(values, errors='coerce')
+
+        years = self.get_date_offset() if offset else 0
+        if years:
+            # Second resolution keeps offset dates (e.g. the Buddhist calendar) within the datetime bounds
+            values = values.astype('datetime64[s]') + pd.DateOffset(years=years)
+
+        date_values = values.dt.strftime(self._date_pattern(date_format)).astype('object').fillna('')
+
+        return date_values.iloc[0] if is_scalar else date_values
+
+    def parse_date_values(self, values, date_format: str = None):
+        """
+        Parse date strings into datetime values.
+
+        Arguments:
+            values (Series): date strings. A single value can also be provided.
+
+            date_format (str): date format, either as a date string (e.g. YYYY-MM-DD) or a strftime pattern [default:
+                the database date format].
+
+        Returns:
+            date_values (Series): datetime values with the index of the input values, or a single timestamp if a single
+                value was provided. Values that cannot be parsed are set to NaT.
+        """
+        is_scalar = pd.api.types.is_scalar(values)
+        values = pd.Series([values]) if is_scalar else pd.Series(values)
+        if pd.api.types.is_datetime64_any_dtype(values.dtype):
+            date_values = values
+        else:
+            date_values = pd.to_datetime(values, errors='coerce', format=self._date_pattern(date_format))
+
+        return date_values.iloc[0] if is_scalar else date_values
+
+    def _date_pattern(self, date_format: str = None):
+        """
+        Return the strftime pattern of a date format.
+        """
+        if date_format is None:
+            return self.date_format
+
+        if '%' in date_format:  # already a strftime pattern
+            return date_format
+
+        return self.format_date_str(date_str=date_format)
+
+    def format_date_str(self, date_str: str = None):
+        """
+        Format a date string for use as input to datetime method.
+
+        Arguments:
+            date_str (str): date string.
+        """
+        separators = set(':/- ')
+        date_fmts = {'YYYY': '%Y', 'YY': '%y',
+                     'MMMM': '%B', 'MMM': '%b', 'MM': '%m', 'M': '%-m',
+                     'DD': '%d', 'D': '%-d',
+                     'HH': '%H', 'MI': '%M', 'SS': '%S'}
+
+        date_str = date_str if date_str else self.date_format
+        try:
+            return self._date_strs[date_str]
+        except KeyError:
+            pass
+
+        strfmt = []
+
+        last_char = date_str[0]
+        buff = [last_char]
+        for char in date_str[1:]:
+            if char not in separators:
+                if last_char != char:
+                    # Check if char is first in a potential series
+                    if last_char in separators:
+                        buff.append(char)
+                        last_char = char
+                        continue
 
                     # Check if component is minute
                     if ''.join(buff + [char]) == 'MI':
@@ -977,7 +1591,10 @@ class SettingsManager:
         except KeyError:
             raise TypeError('unsupported characters {} found in date string {}'.format(''.join(buff), date_str))
 
-        return ''.join(strfmt)
+        strfmt = ''.join(strfmt)
+        self._date_strs[date_str] = strfmt
+
+        return strfmt
 
     def get_date_offset(self):
         """
@@ -1266,6 +1883,120 @@ class SettingsManager:
         return elements
 
 
+class ReadCache:
+    """
+    In-process cache of database query results.
+
+    Attributes:
+        max_size (int): maximum combined size of the cached results, in bytes.
+
+        ttl (float): seconds that a cached result remains valid.
+    """
+    table_pattern = re.compile(r'\b(?:FROM|JOIN|INTO|UPDATE|MERGE)\s+([\w.\[\]]+)', re.IGNORECASE)
+
+    def __init__(self, max_size: float = 64, ttl: float = 300):
+        """
+        Arguments:
+            max_size (float): memory budget of the cache, in megabytes [Default: 64].
+
+            ttl (float): seconds that a cached result remains valid [Default: 300].
+        """
+        self.max_size = int(max_size * 1024 * 1024)
+        self.ttl = ttl
+
+        self._entries = OrderedDict()  # key: (dataframe, size, expiration time, tables)
+        self._size = 0
+        self.generation = 0  # incremented on every invalidation
+        self._lock = threading.Lock()
+
+    def _key(self, statement, params, database):
+        return database, statement, json_util.dumps(params)
+
+    def _remove(self, key):
+        df, size, expires, tables = self._entries.pop(key)
+        self._size -= size
+
+    def tables(self, statement):
+        """
+        Find the names of the database tables referenced by a statement or list of statements.
+        """
+        statements = [statement] if isinstance(statement, str) else statement
+
+        tables = set()
+        for statement_i in statements:
+            for table in self.table_pattern.findall(statement_i):
+                tables.add(table.replace('[', '').replace(']', '').split('.')[-1].lower())
+
+        return tables
+
+    def get(self, statement, params, database):
+        """
+        Return a copy of the cached result of a query, or None if the query result is not cached.
+        """
+        key = self._key(statement, params, database)
+        with self._lock:
+            try:
+                df, size, expires, tables = self._entries[key]
+            except KeyError:
+                return None
+
+            if time.monotonic() > expires:
+                self._remove(key)
+
+                return None
+
+            self._entries.move_to_end(key)
+
+        return df.copy()
+
+    def put(self, statement, params, database, df, generation: int = None):
+        """
+        Cache the result of a query, evicting the least recently used results when the memory budget is exceeded.
+
+        Arguments:
+            generation (int): cache generation at the time the query was sent. The result is discarded if the cache
+                has since been invalidated [Default: always cache the result].
+        """
+        size = int(df.memory_usage(index=True, deep=True).sum())
+        if self.ttl <= 0 or size > self.max_size:
+            return
+
+        key = self._key(statement, params, database)
+        entry = (df.copy(), size, time.monotonic() + self.ttl, self.tables(statement))
+        with self._lock:
+            if generation is not None and generation != self.generation:  # query may have read outdated data
+                return
+
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = entry
+            self._size += size
+
+            while self._size > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, statement=None):
+        """
+        Remove the cached results of queries on any table modified by a statement.
+
+        Arguments:
+            statement: statement or list of statements [Default: remove all cached results].
+        """
+        with self._lock:
+            self.generation += 1
+
+            if statement is None:
+                self._entries.clear()
+                self._size = 0
+
+                return
+
+            modified = self.tables(statement)
+            for key in [i for i in self._entries if self._entries[i][3] & modified]:
+                self._remove(key)
+
+
 class AccountManager:
     """
     User account manager.
@@ -1284,6 +2015,17 @@ class AccountManager:
         self.logged_in = False
         self.roles = None
 
+        self.cache = ReadCache(max_size=settings.cache_size, ttl=settings.cache_ttl)
+        self._schemas = {}
+
+        # Identical reads that are waiting on the server share a single request
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+
+        # Additional server connections used to send reads in parallel
+        self._read_conns = []
+        self._read_conns_lock = threading.Lock()
+
     def _prepare_conn_str(self, database: str = None):
         """
         Prepare the connection string.
@@ -1341,6 +2083,9 @@ class AccountManager:
         self.logged_in = False
         self.roles = None
 
+        self.cache.invalidate()
+        self._schemas = {}
+
         return True
 
     def check_permission(self, access_group):
@@ -1382,6 +2127,11 @@ class AccountManager:
         """
         Get table schema information.
         """
+        try:
+            return self._schemas[(database, table)]
+        except KeyError:
+            pass
+
         # Prepare the server request
         value = {'connection_string': self._prepare_conn_str(database=database), 'table': table, 'database': database}
         content = {'action': 'db_schema', 'value': value}
@@ -1396,16 +2146,16 @@ class AccountManager:
             results = []
         else:
             results = response['value']
+            self._schemas[(database, table)] = results
 
         return results
 
-    def read_db(self, statement, params, prog_db: bool = False, database: str = None):
+    def _select_database(self, prog_db: bool = False, database: str = None):
         """
-        Read from an ODBC database.
+        Select the database to read from.
         """
         program_db = settings.prog_db
 
-        # Prepare the server request
         if database:
             if program_db is True or database == program_db:
                 db = program_db
@@ -1416,13 +2166,27 @@ class AccountManager:
         else:
             db = program_db if prog_db is True else settings.dbname
 
+        return db
+
+    def _prepare_read_request(self, statement, params, prog_db: bool = False, database: str = None, page=None):
+        """
+        Prepare a server request for reading from an ODBC database.
+        """
+        db = self._select_database(prog_db=prog_db, database=database)
+
         value = {'connection_string': self._prepare_conn_str(database=db), 'transaction_type': 'read',
                  'statement': statement, 'parameters': params}
+        if page is not None:
+            value['page'] = page
         content = {'action': 'db_transact', 'value': value}
         request = {'content': content, 'encoding': "utf-8"}
 
-        # Send the request for data to the server
-        response = server_conn.process_request(request)
+        return request
+
+    def _read_response(self, response):
+        """
+        Convert the server response to a read request into a dataframe.
+        """
         if response['success'] is False:
             msg = response['value']
             logger.error(msg)
@@ -1439,162 +2203,993 @@ class AccountManager:
 
         return df
 
-    def write_db(self, statement, params):
+    def _read_page_response(self, response):
         """
-        Write to an ODBC database.
+        Convert the server response to a paged read request into a dataframe and the cursor of the next page.
         """
-        # Prepare the server request
-        db = settings.prog_db
-        value = {'connection_string': self._prepare_conn_str(database=db), 'transaction_type': 'write',
-                 'statement': statement, 'parameters': params}
-        content = {'action': 'db_transact', 'value': value}
-        request = {'content': content, 'encoding': "utf-8"}
-
-        # Send the request for data to the server
-        response = server_conn.process_request(request)
         if response['success'] is False:
             msg = response['value']
             logger.error(msg)
 
-            status = False
+            raise ConnectionError(msg)
         else:
-            status = True
+            try:
+                df = pd.DataFrame(response['value']['rows'])
+                cursor = response['value']['cursor']
+            except Exception as e:
+                msg = 'failed to read the results of the database query - {ERR}'.format(ERR=e)
+                logger.error(msg)
 
-        return status
+                raise
 
+        return df, cursor
 
-# Functions
-def thread_operation(func, args, timeout: int = 600, message: str = None):
-    """
-    Run an operation in a separate thread.
+    def _read_handler(self, statement, params, db, use_cache: bool = False):
+        """
+        Return a response handler for a read request that stores the results in the read cache, if requested.
+        """
+        if not use_cache:
+            return self._read_response
 
-    Arguments:
-        func: function to pass to the thread pool executor.
+        generation = self.cache.generation
 
-        args (dict): function arguments.
+        def read_response(response):
+            results = self._read_response(response)
+            self.cache.put(statement, params, db, results, generation=generation)
 
-        timeout (int): timeout in seconds [default: 600].
+            return results
 
-        message (str): optional message to add to the operation-in-progress popup.
-    """
-    with concurrent.futures.ThreadPoolExecutor(1) as executor:
-        future = executor.submit(func, **args)
+        return read_response
 
-        start_time = time.time()
-        logger.info('running a threaded operation at {}'.format(start_time))
-        while time.time() - start_time < timeout:
-            elapsed_time = time.time() - start_time
-            sg.popup_animated(mod_const.PROGRESS_GIF, time_between_frames=50, message=message, keep_on_top=True,
-                              alpha_channel=0.8)
+    def _shared_read(self, statement, params, prog_db: bool = False, database: str = None, conn=None,
+                     use_cache: bool = False):
+        """
+        Submit a read request to the server, or join an identical read request that is already waiting on the server.
 
-            if future.done():
-                sg.popup_animated(image_source=None)
-                msg = 'threaded operation completed after {} seconds'.format(elapsed_time)
-                logger.info(msg)
+        Arguments:
+            conn (ServerConnection): send the request over this connection [Default: the main server connection].
 
-                try:
-                    return_value = future.result()
-                except Exception as e:
-                    msg = 'threaded operation failed after {TIME} seconds - {ERR}'.format(ERR=e, TIME=elapsed_time)
-                    logger.exception(msg)
+            use_cache (bool): store the results of a new request in the read cache [Default: False].
 
-                    result = {'success': False, 'value': msg}
-                else:
-                    result = {'success': True, 'value': return_value}
+        Returns:
+            future (Future): future holding the dataframe of results, shared by all callers of the same read.
+        """
+        db = self._select_database(prog_db=prog_db, database=database)
+        key = self.cache._key(statement, params, db)
 
-                break
+        with self._inflight_lock:
+            future = self._inflight.get(key, None)
+            if future is not None:
+                logger.debug('joining the pending read request for query "{STR}"'.format(STR=statement))
 
-        else:
-            sg.popup_animated(image_source=None)
-            msg = 'threaded operation failed to complete before the {} second timeout'.format(timeout)
-            logger.error(msg)
+                return future
 
-            try:
-                return_value = future.result(1)
-            except concurrent.futures.TimeoutError:
-                result = {'success': False, 'value': msg}
-            else:
-                result = {'success': True, 'value': return_value}
+            request = self._prepare_read_request(statement, params, prog_db=prog_db, database=database)
+            conn = conn if conn is not None else server_conn
+            future = conn.submit(request, handler=self._read_handler(statement, params, db, use_cache=use_cache))
+            self._inflight[key] = future
 
-    return result
+        def release(completed):
+            with self._inflight_lock:
+                if self._inflight.get(key, None) is completed:
+                    del self._inflight[key]
 
+        future.add_done_callback(release)
 
-def hash_password(password):
-    """
-    Obtain a password's hash-code.
-    """
-    password_utf = password.encode('utf-8')
+        return future
 
-    md5hash = hashlib.md5()
-    md5hash.update(password_utf)
+    def read_db(self, statement, params, prog_db: bool = False, database: str = None, use_cache: bool = False,
+                share: bool = True):
+        """
+        Read from an ODBC database.
 
-    password_hash = md5hash.hexdigest()
+        Arguments:
+            statement (str): query statement.
 
-    return password_hash
+            params (tuple): query parameters.
 
+            prog_db (bool): read from the program database [Default: False].
 
-def popup_error(msg):
-    """
-    Display popup notifying user that there is a fatal program error.
-    """
-    font = mod_const.LARGE_FONT
-    return sg.popup_error(textwrap.fill(msg, width=40), font=font, title='')
+            database (str): read from the provided database.
 
+            use_cache (bool): return cached results of an identical query, if available, and cache the results
+                otherwise. Only use for data that rarely changes [Default: False].
 
-def load_config(cnfg_file):
-    """
-    Load the contents of the configuration file into a python dictionary.
-    """
-    try:
-        fh = open(cnfg_file, 'r', encoding='utf-8')
-    except FileNotFoundError:
-        msg = 'Unable to load user settings file at {PATH}. Please verify that the file path is correct.' \
-            .format(PATH=CNF_FILE)
-        popup_error(msg)
-        sys.exit(1)
-    else:
-        cnfg = yaml.safe_load(fh)
-        fh.close()
+            share (bool): share the results of an identical read that is already waiting on the server [Default: True].
+        """
+        db = self._select_database(prog_db=prog_db, database=database)
+        if use_cache:
+            df = self.cache.get(statement, params, db)
+            if df is not None:
+                logger.debug('using cached results of query "{STR}"'.format(STR=statement))
 
-    return cnfg
+                return df
 
+        if share:
+            # Send the request for data to the server, sharing the results of an identical pending request
+            future = self._shared_read(statement, params, prog_db=prog_db, database=database, use_cache=use_cache)
 
-def configure_handler(cnfg, stream=sys.stdout, log_level: str = None):
-    """
-    Configure the rotating file handler for logging.
-    """
-    try:
-        log_file = cnfg['log']['log_file']
-    except (KeyError, ValueError):
-        log_file = None
+            return server_conn.wait(future).copy()
 
-    if log_level:
-        level = log_level
-    else:
-        try:
-            level = cnfg['log']['log_level'].upper()
-        except (KeyError, AttributeError):
-            level = 'WARNING'
+        # Send the request for data to the server
+        request = self._prepare_read_request(statement, params, prog_db=prog_db, database=database)
+        handler = self._read_handler(statement, params, db, use_cache=use_cache)
 
-    if level == 'WARNING':
-        log_level = logging.WARNING
-    elif level == 'ERROR':
-        log_level = logging.ERROR
-    elif level == 'INFO':
-        log_level = logging.INFO
-    elif level == 'DEBUG':
-        log_level = logging.DEBUG
-    elif level == 'CRITICAL':
-        log_level = logging.CRITICAL
-    else:
-        log_level = logging.WARNING
+        return server_conn.wait(server_conn.submit(request, handler=handler))
 
-    try:
-        nbytes = int(cnfg['log']['log_size'])
-    except (KeyError, ValueError):  # default 1 MB
-        nbytes = 1000000
+    def _read_connections(self, nconn):
+        """
+        Return up to the given number of server connections for sending reads in parallel, opening additional
+        connections to the server as needed.
+        """
+        conn = server_conn.load()
 
-    try:
+        with self._read_conns_lock:
+            while len(self._read_conns) < nconn - 1:
+                try:
+                    sock = connect_socket(conn.addr, timeout=5)
+                except ConnectionError as e:
+                    logger.warning('unable to open an additional connection to the server - {}'.format(e))
+
+                    break
+
+                self._read_conns.append(ServerConnection(sock, conn.addr))
+
+            return [conn] + self._read_conns[:nconn - 1]
+
+    def close_connections(self):
+        """
+        Close the additional server connections used to send reads in parallel.
+        """
+        with self._read_conns_lock:
+            for conn in self._read_conns:
+                conn.close()
+
+            self._read_conns = []
+
+    def read_db_many(self, queries, prog_db: bool = False, database: str = None, parallel: int = None,
+                     use_cache: bool = False, share: bool = True):
+        """
+        Read the results of multiple queries from an ODBC database, sending the queries to the server in parallel.
+
+        Arguments:
+            queries (list): list of (statement, params) tuples.
+
+            prog_db (bool): read from the program database [Default: False].
+
+            database (str): read from the provided database.
+
+            parallel (int): maximum number of queries waiting on the server at a time [Default: configured parallel
+                reads].
+
+            use_cache (bool): use cached results of identical queries, if available, and cache the results otherwise.
+                Only use for data that rarely changes [Default: False].
+
+            share (bool): share the results of identical reads that are already waiting on the server [Default: True].
+
+        Returns:
+            results (list): dataframes of results in the order of the queries.
+        """
+        if not queries:
+            return []
+
+        parallel = parallel if parallel else settings.parallel_reads
+        conns = self._read_connections(max(1, min(parallel, len(queries))))
+        db = self._select_database(prog_db=prog_db, database=database)
+
+        # Each connection sends its queries in turn, so the connections are assigned queries in rotation
+        futures = []
+        for index, (statement, params) in enumerate(queries):
+            conn = conns[index % len(conns)]
+
+            df = self.cache.get(statement, params, db) if use_cache else None
+            if df is not None:
+                future = concurrent.futures.Future()
+                future.set_result(df)
+            elif share:
+                future = self._shared_read(statement, params, prog_db=prog_db, database=database, conn=conn,
+                                           use_cache=use_cache)
+            else:
+                request = self._prepare_read_request(statement, params, prog_db=prog_db, database=database)
+                future = conn.submit(request, handler=self._read_handler(statement, params, db, use_cache=use_cache))
+
+            futures.append(future)
+
+        return [conns[0].wait(future).copy() for future in futures]
+
+    def read_db_async(self, statement, params, prog_db: bool = False, database: str = None, window=None,
+                      event: str = None, use_cache: bool = False, share: bool = True):
+        """
+        Read from an ODBC database without waiting for the results.
+
+        Arguments:
+            statement (str): query statement.
+
+            params (tuple): query parameters.
+
+            prog_db (bool): read from the program database [Default: False].
+
+            database (str): read from the provided database.
+
+            window: optional PySimpleGUI window to notify when the results are ready.
+
+            event (str): event key written to the window event loop, with the completed future as the event value.
+
+            use_cache (bool): use cached results of an identical query, if available, and cache the results
+                otherwise. Only use for data that rarely changes [Default: False].
+
+            share (bool): share the results of an identical read that is already waiting on the server [Default: True].
+
+        Returns:
+            future (Future): future holding the dataframe of results.
+        """
+        db = self._select_database(prog_db=prog_db, database=database)
+        df = self.cache.get(statement, params, db) if use_cache else None
+        if df is not None:
+            future = concurrent.futures.Future()
+            future.set_result(df)
+            if window is not None:
+                window.write_event_value(event, future)
+
+            return future
+
+        if not share:
+            request = self._prepare_read_request(statement, params, prog_db=prog_db, database=database)
+            handler = self._read_handler(statement, params, db, use_cache=use_cache)
+
+            return server_conn.submit(request, handler=handler, window=window, event=event)
+
+        # Give each caller of a shared read its own copy of the results
+        shared = self._shared_read(statement, params, prog_db=prog_db, database=database, use_cache=use_cache)
+        future = concurrent.futures.Future()
+
+        def copy_results(completed):
+            try:
+                future.set_result(completed.result().copy())
+            except Exception as e:
+                future.set_exception(e)
+
+            if window is not None:
+                try:
+                    window.write_event_value(event, future)
+                except Exception as e:
+                    logger.warning('failed to notify the window of the completed request "{EVENT}" - {ERR}'
+                                   .format(EVENT=event, ERR=e))
+
+        shared.add_done_callback(copy_results)
+
+        return future
+
+    def read_db_page(self, statement, params, key, page_size: int = None, after=None, prog_db: bool = False,
+                     database: str = None):
+        """
+        Read a single page of results from an ODBC database using keyset pagination.
+
+        Arguments:
+            statement (str): query statement. The statement must not contain an ORDER BY clause.
+
+            params (tuple): query parameters.
+
+            key (str): name of the result column used to order the pages. Values of the column must be unique.
+
+            page_size (int): maximum number of rows to return [Default: configured import page size].
+
+            after: return the page following this cursor value [Default: return the first page].
+
+            prog_db (bool): read from the program database [Default: False].
+
+            database (str): read from the provided database.
+
+        Returns:
+            tuple: dataframe of the page of results and the cursor of the next page, which is None when no more pages
+                remain.
+        """
+        page_size = page_size if page_size else settings.import_page_size
+
+        # Prepare the server request
+        page = {'key': key, 'size': page_size, 'after': after}
+        request = self._prepare_read_request(statement, params, prog_db=prog_db, database=database, page=page)
+
+        # Send the request for data to the server
+        return server_conn.wait(server_conn.submit(request, handler=self._read_page_response))
+
+    def read_db_page_async(self, statement, params, key, page_size: int = None, after=None, prog_db: bool = False,
+                           database: str = None, window=None, event: str = None):
+        """
+        Read a single page of results from an ODBC database without waiting for the results.
+
+        Arguments:
+            statement (str): query statement. The statement must not contain an ORDER BY clause.
+
+            params (tuple): query parameters.
+
+            key (str): name of the result column used to order the pages. Values of the column must be unique.
+
+            page_size (int): maximum number of rows to return [Default: configured import page size].
+
+            after: return the page following this cursor value [Default: return the first page].
+
+            prog_db (bool): read from the program database [Default: False].
+
+            database (str): read from the provided database.
+
+            window: optional PySimpleGUI window to notify when the page is ready.
+
+            event (str): event key written to the window event loop, with the completed future as the event value.
+
+        Returns:
+            future (Future): future holding the dataframe of the page of results and the cursor of the next page.
+        """
+        page_size = page_size if page_size else settings.import_page_size
+
+        page = {'key': key, 'size': page_size, 'after': after}
+        request = self._prepare_read_request(statement, params, prog_db=prog_db, database=database, page=page)
+
+        return server_conn.submit(request, handler=self._read_page_response, window=window, event=event)
+
+    def aggregate_db(self, tables, aggregates, group_by: dict = None, where: str = None, params=None,
+                     prog_db: bool = False, database: str = None):
+        """
+        Summarize records in an ODBC database by aggregating column values on the database server.
+
+        Arguments:
+            tables (str): table component of the query statement, including any joins.
+
+            aggregates (dict): aggregate column aliases mapped to a tuple of aggregate function (sum, count, min, or
+                max) and the column to aggregate.
+
+            group_by (dict): group column aliases mapped to the column to group the records on [Default: aggregate
+                over all records].
+
+            where (str): where clause of the query statement [Default: no filtering].
+
+            params (tuple): where clause parameters.
+
+            prog_db (bool): read from the program database [Default: False].
+
+            database (str): read from the provided database.
+
+        Returns:
+            df (DataFrame): aggregated rows.
+        """
+        # Prepare the server request
+        db = self._select_database(prog_db=prog_db, database=database)
+
+        value = {'connection_string': self._prepare_conn_str(database=db), 'tables': tables,
+                 'aggregates': {i: list(aggregates[i]) for i in aggregates}, 'group_by': group_by, 'where': where,
+                 'parameters': params}
+        content = {'action': 'db_aggregate', 'value': value}
+        request = {'content': content, 'encoding': "utf-8"}
+
+        # Send the request for data to the server
+        response = server_conn.process_request(request)
+        if response['success'] is False:
+            msg = response['value']
+            logger.error(msg)
+
+            raise ConnectionError(msg)
+        else:
+            try:
+                df = pd.DataFrame(response['value'])
+            except Exception as e:
+                msg = 'failed to read the results of the database aggregation - {ERR}'.format(ERR=e)
+                logger.error(msg)
+
+                raise
+
+        return df
+
+    def _invalidate(self, statement):
+        """
+        Discard cached results of queries on the tables modified by a statement. Reads that are still waiting on the
+        server are no longer shared with new callers.
+        """
+        self.cache.invalidate(statement)
+
+        with self._inflight_lock:
+            self._inflight.clear()
+
+    def _prepare_write_request(self, statement, params):
+        """
+        Prepare a server request for writing to an ODBC database.
+        """
+        db = settings.prog_db
+        value = {'connection_string': self._prepare_conn_str(database=db), 'transaction_type': 'write',
+                 'statement': statement, 'parameters': params}
+        content = {'action': 'db_transact', 'value': value}
+        request = {'content': content, 'encoding': "utf-8"}
+
+        return request
+
+    def _write_response(self, response):
+        """
+        Convert the server response to a write request into a success status.
+        """
+        if response['success'] is False:
+            msg = response['value']
+            logger.error(msg)
+
+            status = False
+        else:
+            status = True
+
+        return status
+
+    def write_db(self, statement, params):
+        """
+        Write to an ODBC database.
+        """
+        # Prepare the server request
+        request = self._prepare_write_request(statement, params)
+
+        # Send the request for data to the server
+        status = server_conn.wait(server_conn.submit(request, handler=self._write_response))
+
+        # Cached results of queries on the modified tables are no longer current
+        self._invalidate(statement)
+
+        return status
+
+    def write_db_async(self, statement, params, window=None, event: str = None):
+        """
+        Write to an ODBC database without waiting for the transaction to complete.
+
+        Arguments:
+            statement: transaction statement or list of statements.
+
+            params: transaction parameters or list of parameters for each statement.
+
+            window: optional PySimpleGUI window to notify when the transaction completes.
+
+            event (str): event key written to the window event loop, with the completed future as the event value.
+
+        Returns:
+            future (Future): future holding the success status of the transaction.
+        """
+        def write_response(response):
+            # Cached results of queries on the modified tables are no longer current
+            self._invalidate(statement)
+
+            return self._write_response(response)
+
+        request = self._prepare_write_request(statement, params)
+
+        return server_conn.submit(request, handler=write_response, window=window, event=event)
+
+
+class LazyObject:
+    """
+    Proxy for a manager object that is created on first use.
+
+    Attributes:
+        factory: function called with no arguments to create the object.
+    """
+
+    def __init__(self, factory):
+        object.__setattr__(self, 'factory', factory)
+        object.__setattr__(self, '_obj', None)
+        object.__setattr__(self, '_lock', threading.RLock())
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self.load(), attr, value)
+
+    def __delattr__(self, attr):
+        delattr(self.load(), attr)
+
+    def __repr__(self):
+        return repr(self._obj) if self._obj is not None else '<LazyObject of {}>'.format(self.factory.__name__)
+
+    def load(self):
+        """
+        Return the proxied object, creating it first if it does not yet exist.
+        """
+        obj = self._obj
+        if obj is None:
+            with self._lock:
+                if self._obj is None:
+                    object.__setattr__(self, '_obj', self.factory())
+
+                obj = self._obj
+
+        return obj
+
+    def is_loaded(self):
+        """
+        Check whether the proxied object has been created.
+        """
+        return self._obj is not None
+
+
+class RequestTracer:
+    """
+    Opt-in tracer recording where time is spent on each server request.
+
+    Attributes:
+        enabled (bool): record traces of server requests [Default: False].
+
+        recent (deque): most recent trace entries, for display in the debug window.
+    """
+
+    def __init__(self, max_recent: int = 200):
+        self.enabled = False
+        self.recent = deque(maxlen=max_recent)
+
+        self._logger = logging.getLogger('{}.trace'.format(__name__))
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+        self._lock = threading.Lock()
+
+    def configure(self, trace_file: str = None, max_size: float = 1, backups: int = 2):
+        """
+        Write traces to a rotating trace file.
+
+        Arguments:
+            trace_file (str): path to the trace file.
+
+            max_size (float): maximum size of the trace file, in megabytes, before it is rotated [Default: 1].
+
+            backups (int): number of rotated trace files to keep [Default: 2].
+        """
+        for handler in self._logger.handlers[:]:
+            self._logger.removeHandler(handler)
+            handler.close()
+
+        if not trace_file:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(trace_file), exist_ok=True)
+            handler = handlers.RotatingFileHandler(trace_file, maxBytes=int(max_size * 1024 * 1024),
+                                                   backupCount=backups, encoding='utf-8', delay=True)
+        except OSError as e:
+            logger.warning('unable to write request traces to {FILE} - {ERR}'.format(FILE=trace_file, ERR=e))
+        else:
+            handler.setFormatter(logging.Formatter('%(asctime)s: %(message)s'))
+            self._logger.addHandler(handler)
+
+    def caller(self):
+        """
+        Find the first function outside of this module in the call stack.
+        """
+        frame = sys._getframe(1)
+        while frame is not None and frame.f_code.co_filename == __file__:
+            frame = frame.f_back
+
+        if frame is None:
+            return 'client'
+
+        module = os.path.splitext(os.path.basename(frame.f_code.co_filename))[0]
+
+        return '{MOD}.{FUNC}:{LINE}'.format(MOD=module, FUNC=frame.f_code.co_name, LINE=frame.f_lineno)
+
+    def record(self, request, caller, **timings):
+        """
+        Record the trace of a completed server request.
+        """
+        try:
+            action = request['content']['action']
+            transaction_type = request['content']['value']['transaction_type']
+        except (KeyError, TypeError):
+            pass
+        else:
+            action = '{ACTION}:{TYPE}'.format(ACTION=action, TYPE=transaction_type)
+
+        entry = 'action={ACTION} caller={CALLER} success={SUCCESS} sent={SENT}B received={RECV}B queue={QUEUE:.4f}s ' \
+                'serialize={SER:.4f}s network={NET:.4f}s decode={DEC:.4f}s frame={FRAME:.4f}s total={TOTAL:.4f}s' \
+            .format(ACTION=action, CALLER=caller, SUCCESS=timings.get('success'), SENT=timings.get('sent', 0),
+                    RECV=timings.get('received', 0), QUEUE=timings.get('queue', 0), SER=timings.get('serialize', 0),
+                    NET=timings.get('network', 0), DEC=timings.get('decode', 0), FRAME=timings.get('frame', 0),
+                    TOTAL=timings.get('total', 0))
+
+        with self._lock:
+            self.recent.append(entry)
+        self._logger.info(entry)
+
+    def dump(self):
+        """
+        Return the most recent trace entries as a string.
+        """
+        with self._lock:
+            return '\n'.join(self.recent)
+
+
+class TaskProgress:
+    """
+    Progress of a task running in the worker pool, shared by the task and the caller waiting on the task.
+
+    The task reports progress by calling the object and should stop early when cancelled() returns True.
+
+    Attributes:
+        fraction (float): fraction of the task completed, if reported.
+
+        message (str): latest progress message reported by the task.
+    """
+
+    def __init__(self):
+        self.fraction = None
+        self.message = None
+        self._cancel_event = threading.Event()
+
+    def __call__(self, fraction: float = None, message: str = None):
+        """
+        Report the progress of the task.
+        """
+        if fraction is not None:
+            self.fraction = fraction
+        if message is not None:
+            self.message = message
+
+    def cancel(self):
+        """
+        Request that the task stop.
+        """
+        self._cancel_event.set()
+
+    def cancelled(self):
+        """
+        Check whether the task has been asked to stop.
+        """
+        return self._cancel_event.is_set()
+
+
+class WorkerPool:
+    """
+    Process-wide pool for running long operations outside of the GUI thread.
+
+    Functions run in a thread pool by default. CPU-bound functions can instead be run in a process pool, in which case
+    the function and its arguments must be picklable.
+    """
+
+    def __init__(self):
+        self._threads = None
+        self._processes = None
+        self._lock = threading.Lock()
+
+    def _executor(self, use_process: bool = False):
+        with self._lock:
+            if use_process:
+                if self._processes is None:
+                    logger.debug('starting the worker process pool with {} processes'
+                                 .format(settings.worker_processes))
+                    self._processes = concurrent.futures.ProcessPoolExecutor(max_workers=settings.worker_processes)
+
+                return self._processes
+            else:
+                if self._threads is None:
+                    logger.debug('starting the worker thread pool with {} threads'.format(settings.worker_threads))
+                    self._threads = concurrent.futures.ThreadPoolExecutor(max_workers=settings.worker_threads,
+                                                                          thread_name_prefix='Worker')
+
+                return self._threads
+
+    def submit(self, func, args: dict = None, use_process: bool = False, progress: TaskProgress = None):
+        """
+        Submit a function to the pool.
+
+        Arguments:
+            func: function to run.
+
+            args (dict): function arguments.
+
+            use_process (bool): run the function in the process pool [Default: run in the thread pool].
+
+            progress (TaskProgress): passed to the function as the "progress" argument. Only supported for functions
+                run in the thread pool.
+
+        Returns:
+            future (Future): future holding the return value of the function.
+        """
+        args = {} if args is None else dict(args)
+        if progress is not None:
+            if use_process:
+                raise ValueError('progress reporting is not supported for functions run in the process pool')
+
+            args['progress'] = progress
+
+        return self._executor(use_process).submit(func, **args)
+
+    def shutdown(self, wait: bool = False):
+        """
+        Stop the pools, cancelling any operations that have not yet started.
+        """
+        with self._lock:
+            for executor in (self._threads, self._processes):
+                if executor is not None:
+                    executor.shutdown(wait=wait, cancel_futures=True)
+
+            self._threads = None
+            self._processes = None
+
+
+# Functions
+def load_cipher():
+    """
+    Load the encryption key and create the cipher.
+    """
+    if os.path.isfile(ENCRYPT_PATH) and os.access(ENCRYPT_PATH, os.R_OK):  # encryption key file exists and is readable
+        with open(ENCRYPT_PATH, 'rb') as encrypt_h:
+            encrypt_key = encrypt_h.read()
+    else:  # encryption key file has not yet been added to the client
+        msg = 'Unable to start the program. Please download the encryption key file from the server to the program ' \
+              'base directory before using.'
+        popup_error(msg)
+        sys.exit(1)
+
+    return Fernet(encrypt_key)
+
+
+def load_settings():
+    """
+    Load the user-defined configuration settings and configure the logger.
+    """
+    global CNF_FILE, CNFG
+
+    cnf_file = os.path.join(os.getcwd(), 'settings.yaml')
+    if os.path.exists(cnf_file):  # first attempt to find configuration from the current working directory
+        CNF_FILE = cnf_file
+    else:  # fallback to default config in the program directory
+        CNF_FILE = os.path.join(DIRNAME, 'settings.yaml')
+
+    CNFG = load_config(CNF_FILE)
+
+    logger.addHandler(configure_handler(CNFG))
+
+    manager = SettingsManager(CNFG, DIRNAME)
+
+    # Configure request tracing
+    tracer.configure(trace_file=manager.trace_file, max_size=manager.trace_size)
+    tracer.enabled = manager.trace_enabled
+
+    return manager
+
+
+def connect_socket(addr, timeout: float = 20, max_delay: float = 30):
+    """
+    Open a socket connected to the server, retrying with jittered exponential backoff until the timeout is reached.
+
+    Arguments:
+        addr (tuple): server host and port.
+
+        timeout (float): seconds to keep trying to connect [Default: 20].
+
+        max_delay (float): maximum seconds to wait between connection attempts [Default: 30].
+
+    Returns:
+        sock (socket): non-blocking socket connected to the server.
+    """
+    delay = 0.5
+    attempt = 0
+    start_time = time.time()
+    while True:
+        attempt += 1
+        remaining = timeout - (time.time() - start_time)
+
+        try:
+            sock = socket.create_connection(addr, timeout=max(min(remaining, 5), 0.1))
+        except OSError as e:
+            remaining = timeout - (time.time() - start_time)
+            if remaining <= 0:
+                msg = 'connection to server "{ADDR}" failed after {N} attempts - {ERR}' \
+                    .format(ADDR=addr[0], N=attempt, ERR=e)
+                logger.error(msg)
+
+                raise ConnectionError(msg)
+
+            # Spread out reconnection attempts so that clients do not all retry at the same moment
+            wait_time = min(uniform(0, delay), remaining)
+            logger.warning('connection attempt {N} to server "{ADDR}" failed - {ERR} ... retrying in {TIME:.1f} '
+                           'seconds'.format(N=attempt, ADDR=addr[0], ERR=e, TIME=wait_time))
+            time.sleep(wait_time)
+            delay = min(delay * 2, max_delay)
+        else:
+            logger.info('connection accepted from server "{ADDR}"'.format(ADDR=addr[0]))
+            sock.setblocking(False)
+
+            return sock
+
+
+def open_connection(timeout: int = 20):
+    """
+    Open a connection to the server and load the program configuration constants.
+
+    Arguments:
+        timeout (int): seconds to keep trying to connect to the server [Default: 20].
+
+    Returns:
+        conn (ServerConnection): connection to the server.
+    """
+    addr = (settings.host, settings.port)
+
+    logger.info('initializing connection to server "{ADDR}" on port {PORT}'
+                .format(ADDR=settings.host, PORT=settings.port))
+    sock = connect_socket(addr, timeout=timeout)
+
+    conn = ServerConnection(sock, addr)
+
+    # Load the configuration constants
+    logger.info('loading program configuration from the server')
+    if not settings.load_constants(conn):
+        conn.close()
+
+        raise ConnectionError('failed to load configuration from the server')
+
+    return conn
+
+
+def connect():
+    """
+    Connect to the server and load the program configuration, if not already connected.
+
+    Returns:
+        conn (ServerConnection): connection to the server.
+    """
+    return server_conn.load()
+
+
+def is_connected():
+    """
+    Check whether the connection to the server has been established.
+    """
+    return server_conn.is_loaded()
+
+
+def thread_operation(func, args, timeout: int = 600, message: str = None, use_process: bool = False,
+                     progress: bool = False):
+    """
+    Run an operation in the worker pool and wait for the result.
+
+    Arguments:
+        func: function to pass to the worker pool.
+
+        args (dict): function arguments.
+
+        timeout (int): timeout in seconds [default: 600].
+
+        message (str): optional message to add to the operation-in-progress popup.
+
+        use_process (bool): run the operation in a separate process. Use for CPU-bound operations [Default: False].
+
+        progress (bool): pass a TaskProgress object to the function as the "progress" argument. Progress messages are
+            shown in the operation-in-progress popup, and the operation is asked to stop on timeout [Default: False].
+    """
+    task_progress = TaskProgress() if progress else None
+    future = worker_pool.submit(func, args, use_process=use_process, progress=task_progress)
+
+    # Only the main thread may update the progress animation
+    animate = threading.current_thread() is threading.main_thread()
+
+    start_time = time.time()
+    logger.info('running a threaded operation at {}'.format(start_time))
+    while time.time() - start_time < timeout:
+        remaining = timeout - (time.time() - start_time)
+        done, _ = concurrent.futures.wait([future], timeout=min(ServerConnection.poll_interval, remaining))
+        elapsed_time = time.time() - start_time
+
+        if done:
+            if animate:
+                sg.popup_animated(image_source=None)
+            msg = 'threaded operation completed after {} seconds'.format(elapsed_time)
+            logger.info(msg)
+
+            try:
+                return_value = future.result()
+            except Exception as e:
+                msg = 'threaded operation failed after {TIME} seconds - {ERR}'.format(ERR=e, TIME=elapsed_time)
+                logger.exception(msg)
+
+                result = {'success': False, 'value': msg}
+            else:
+                result = {'success': True, 'value': return_value}
+
+            break
+
+        if animate:
+            popup_msg = task_progress.message if task_progress is not None and task_progress.message else message
+            sg.popup_animated(mod_const.PROGRESS_GIF, time_between_frames=50, message=popup_msg, keep_on_top=True,
+                              alpha_channel=0.8)
+
+    else:
+        if animate:
+            sg.popup_animated(image_source=None)
+        msg = 'threaded operation failed to complete before the {} second timeout'.format(timeout)
+        logger.error(msg)
+
+        try:
+            return_value = future.result(1)
+        except concurrent.futures.TimeoutError:
+            # Stop the operation if it has not started or if it checks for cancellation
+            future.cancel()
+            if task_progress is not None:
+                task_progress.cancel()
+
+            result = {'success': False, 'value': msg}
+        except Exception as e:
+            result = {'success': False, 'value': '{MSG} - {ERR}'.format(MSG=msg, ERR=e)}
+        else:
+            result = {'success': True, 'value': return_value}
+
+    return result
+
+
+def hash_password(password):
+    """
+    Obtain a password's hash-code.
+    """
+    password_utf = password.encode('utf-8')
+
+    md5hash = hashlib.md5()
+    md5hash.update(password_utf)
+
+    password_hash = md5hash.hexdigest()
+
+    return password_hash
+
+
+def popup_error(msg):
+    """
+    Display popup notifying user that there is a fatal program error.
+    """
+    font = mod_const.LARGE_FONT
+    return sg.popup_error(textwrap.fill(msg, width=40), font=font, title='')
+
+
+def load_config(cnfg_file):
+    """
+    Load the contents of the configuration file into a python dictionary.
+    """
+    try:
+        fh = open(cnfg_file, 'r', encoding='utf-8')
+    except FileNotFoundError:
+        msg = 'Unable to load user settings file at {PATH}. Please verify that the file path is correct.' \
+            .format(PATH=CNF_FILE)
+        popup_error(msg)
+        sys.exit(1)
+    else:
+        cnfg = yaml.safe_load(fh)
+        fh.close()
+
+    return cnfg
+
+
+def configure_handler(cnfg, stream=sys.stdout, log_level: str = None):
+    """
+    Configure the rotating file handler for logging.
+    """
+    try:
+        log_file = cnfg['log']['log_file']
+    except (KeyError, ValueError):
+        log_file = None
+
+    if log_level:
+        level = log_level
+    else:
+        try:
+            level = cnfg['log']['log_level'].upper()
+        except (KeyError, AttributeError):
+            level = 'WARNING'
+
+    if level == 'WARNING':
+        log_level = logging.WARNING
+    elif level == 'ERROR':
+        log_level = logging.ERROR
+    elif level == 'INFO':
+        log_level = logging.INFO
+    elif level == 'DEBUG':
+        log_level = logging.DEBUG
+    elif level == 'CRITICAL':
+        log_level = logging.CRITICAL
+    else:
+        log_level = logging.WARNING
+
+    try:
+        nbytes = int(cnfg['log']['log_size'])
+    except (KeyError, ValueError):  # default 1 MB
+        nbytes = 1000000
+
+    try:
         backups = int(cnfg['log']['log_backups'])
     except (KeyError, ValueError):  # default 5 backup files
         backups = 5
@@ -1626,75 +3221,21 @@ else:
     popup_error(msg)
     sys.exit(1)
 
-# Load the encryption key and create the cipher
 ENCRYPT_FILE = 'REM.aes'
 ENCRYPT_PATH = os.path.join(DIRNAME, ENCRYPT_FILE)
-if os.path.isfile(ENCRYPT_PATH) and os.access(ENCRYPT_PATH, os.R_OK):  # encryption key file exists and is readable
-    with open(ENCRYPT_PATH, 'rb') as encrypt_h:
-        encrypt_key = encrypt_h.read()
-else:  # encryption key file has not yet been added to the client
-    msg = 'Unable to start the program. Please download the encryption key file from the server to the program base ' \
-          'directory before using.'
-    popup_error(msg)
-    sys.exit(1)
-
-cipher = Fernet(encrypt_key)
-del encrypt_key
 
-# Load user-defined configuration settings
-cnf_file = os.path.join(os.getcwd(), 'settings.yaml')
-if os.path.exists(cnf_file):  # first attempt to find configuration from the current working directory
-    CNF_FILE = cnf_file
-else:  # fallback to default config in the program directory
-    CNF_FILE = os.path.join(DIRNAME, 'settings.yaml')
+# Configuration loaded from settings.yaml when the settings are first used
+CNF_FILE = None
+CNFG = None
 
-CNFG = load_config(CNF_FILE)
-
-# Create the logger
+# Create the logger. The log handler is added once the configuration settings are loaded.
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
-logger.addHandler(configure_handler(CNFG))
-
-# Initialize manager objects
-settings = SettingsManager(CNFG, DIRNAME)
-user = AccountManager()
-
-# Open a connection to the odbc_server
-logger.info('opening a socket to connect to the server')
-try:
-    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    logger.info('socket successfully created')
-except socket.error as e:
-    msg = 'socket creation failed - {ERR}'.format(ERR=e)
-    logger.error('{MSG}'.format(MSG=msg))
-    popup_error(msg)
-    sys.exit(1)
-else:
-    addr = (settings.host, settings.port)
-
-logger.info('initializing connection to server "{ADDR}" on port {PORT}'.format(ADDR=settings.host, PORT=settings.port))
-while True:
-    try:
-        sock.connect(addr)
-    except BlockingIOError:
-        logger.warning('encountered blocking error')
-    except socket.error as e:
-        msg = 'connection to server "{ADDR}" failed - {ERR}'.format(ADDR=settings.host, ERR=e)
-        popup_error(msg)
-        logger.error('{MSG}'.format(MSG=msg))
-
-        sys.exit(1)
-    else:
-        logger.info('connection accepted from server "{ADDR}"'.format(ADDR=settings.host))
-        sock.setblocking(False)
-
-        break
-
-server_conn = ServerConnection(sock, addr)
-
-# Load the configuration constants
-logger.info('loading program configuration from the server')
-if not settings.load_constants(server_conn):
-    logger.error('failed to load configuration from the server')
-    sys.exit(1)
+# Manager objects are created on first use and the server connection is established by connect()
+cipher = LazyObject(load_cipher)
+settings = LazyObject(load_settings)
+user = LazyObject(AccountManager)
+server_conn = LazyObject(open_connection)
+worker_pool = WorkerPool()
+tracer = RequestTracer()
@@ -914,9 +914,9 @@ class DataCollection:
 
         dtype = display_col.dtype
         if is_float_dtype(dtype) and self.dtypes[field] == 'money':
-            display_col = display_col.apply(settings.format_display_money)
+            display_col = settings.format_display_money_values(display_col)
         elif is_datetime_dtype(dtype):
-            display_col = display_col.apply(settings.format_display_date)
+            display_col = settings.format_display_date_values(display_col)
         elif is_bool_dtype(dtype):
             display_col = display_col.apply(lambda x: '✓' if x is True else '')
         elif is_integer_dtype(dtype) or is_string_dtype(dtype):
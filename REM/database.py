@@ -3,10 +3,20 @@ REM database import and export functions.
 """
 
 import datetime
+from itertools import chain
+
+import numpy as np
 import pandas as pd
 
 from REM.client import logger, settings, user
 
+# SQL Server limits on the parameters and VALUES rows of a single statement
+MAX_STATEMENT_PARAMS = 2100
+MAX_INSERT_ROWS = 1000
+
+# Sizes that variable-length IN lists are padded to, so that a few statement texts cover all list lengths
+IN_LIST_SIZES = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1000)
+
 
 class SQLStatementError(Exception):
     """A simple exception that is raised when an SQL statement is formatted incorrectly.
@@ -16,6 +26,219 @@ class SQLStatementError(Exception):
         Exception.__init__(self, *args)
 
 
+class StatementBatch:
+    """
+    Ordered collection of transaction statements and their parameter sets.
+
+    Parameter sets are kept unique per statement in the order they were first added. The batch can be used in place of
+    the statements dictionary of {statement: [parameter tuples]} accepted by the statement preparation functions.
+
+    Statements can be associated with the database table they modify, and tables can be required to be written after
+    other tables (e.g. reference entries after the records they reference). Statements are returned in the order they
+    were added, except where a dependency requires a statement to be moved after the statements it depends on.
+
+    Arguments:
+        statements (dict): optional dictionary of transaction statements to initialize the batch with.
+    """
+
+    def __init__(self, statements: dict = None):
+        self._statements = {}  # parameter set: number of rows it writes, kept as keys for constant-time membership
+        self._tables = {}  # statement: table modified by the statement
+        self._depends = {}  # table: tables that must be written first, or None for all independent tables
+        self._order = None  # cached execution order of the statements, reset when statements or tables change
+
+        if statements:
+            for statement, params in statements.items():
+                self.add(statement, params)
+
+    def __len__(self):
+        return len(self._statements)
+
+    def __contains__(self, statement):
+        return statement in self._statements
+
+    def __iter__(self):
+        return iter(self.ordered())
+
+    def __getitem__(self, statement):
+        return list(self._statements[statement])
+
+    def items(self):
+        """
+        Iterate over the statements and their parameter sets.
+        """
+        for statement in self.ordered():
+            yield statement, list(self._statements[statement])
+
+    def add(self, statement, params, table: str = None, rows: int = 1):
+        """
+        Add parameter sets to a transaction statement, ignoring parameter sets that were already added.
+
+        Arguments:
+            statement (str): transaction statement.
+
+            params (list): list of parameter tuples.
+
+            table (str): database table modified by the statement.
+
+            rows (int): number of table rows written by each parameter set, such as the rows of a multi-row VALUES
+                clause [Default: 1].
+        """
+        try:
+            param_sets = self._statements[statement]
+        except KeyError:  # new transaction statement
+            param_sets = self._statements[statement] = {}
+            self._order = None
+
+        for param_set in params:
+            param_sets.setdefault(param_set, rows)
+
+        if table and self._tables.get(statement) != table:
+            self._tables[statement] = table
+            self._order = None
+
+    def require(self, table, parents: list = None):
+        """
+        Require the statements modifying a table to follow the statements modifying other tables.
+
+        Arguments:
+            table (str): dependent database table.
+
+            parents (list): tables that must be written before the dependent table [Default: all tables that are not
+                themselves dependent on other tables].
+        """
+        if parents is None:
+            self._depends[table] = None
+        elif self._depends.get(table, ()) is not None:
+            self._depends[table] = self._depends.get(table, set()).union(parents)
+
+        self._order = None
+
+    def _follows(self, table, other):
+        """
+        Test whether the statements modifying a table must follow the statements modifying another table.
+        """
+        if table is None or other is None or table == other or table not in self._depends:
+            return False
+
+        parents = self._depends[table]
+        if parents is None:  # dependent on all independent tables
+            return other not in self._depends
+        else:
+            return other in parents
+
+    def ordered(self):
+        """
+        Return the transaction statements in the order they should be executed.
+
+        Returns:
+            statements (list): transaction statements ordered by dependency and then by the order they were added.
+        """
+        if self._order is not None:
+            return list(self._order)
+
+        statements = list(self._statements)
+        if not self._depends:
+            self._order = statements
+
+            return list(statements)
+
+        tables = [self._tables.get(i) for i in statements]
+        nstate = len(statements)
+        parents = [[j for j in range(nstate) if self._follows(tables[i], tables[j])] for i in range(nstate)]
+
+        # Place each statement after its parents, keeping the order the statements were added otherwise
+        ordered = []
+        placed = set()
+        while len(ordered) < nstate:
+            for index in range(nstate):
+                if index not in placed and all([j in placed for j in parents[index]]):
+                    break
+            else:  # circular dependency between tables
+                msg = 'circular dependency between the tables {}'.format(sorted(self._depends))
+                logger.error(msg)
+
+                raise SQLStatementError(msg)
+
+            ordered.append(statements[index])
+            placed.add(index)
+
+        self._order = ordered
+
+        return list(ordered)
+
+    def nrows(self):
+        """
+        Return the number of table rows written by the batch.
+        """
+        return sum([sum(i.values()) for i in self._statements.values()])
+
+    def nbytes(self):
+        """
+        Return the estimated size of the batch when sent to the server.
+        """
+        return sum([_estimate_size(statement, params) for statement in self._statements for params in
+                    self._statements[statement]])
+
+    def split(self, max_rows: int = None, max_bytes: int = None):
+        """
+        Split the batch into consecutive sub-batches of bounded size. Sub-batches are generated as they are filled, in
+        the order the statements should be executed.
+
+        Arguments:
+            max_rows (int): maximum number of table rows written by a sub-batch. A parameter set that writes more rows
+                than the maximum is placed in a sub-batch of its own [Default: no limit].
+
+            max_bytes (int): maximum estimated size of a sub-batch, in bytes [Default: no limit].
+
+        Returns:
+            batches (generator): generator of StatementBatch sub-batches.
+        """
+        batch = StatementBatch()
+        nrow = 0
+        nbyte = 0
+        for statement in self.ordered():
+            table = self._tables.get(statement)
+            param_sets = self._statements[statement]
+            for params in param_sets:
+                rows = param_sets[params]
+                size = _estimate_size(statement, params)
+                if nrow > 0 and ((max_rows and nrow + rows > max_rows) or (max_bytes and nbyte + size > max_bytes)):
+                    yield batch
+
+                    batch = StatementBatch()
+                    nrow = 0
+                    nbyte = 0
+
+                batch.add(statement, [params], table=table, rows=rows)
+                nrow += rows
+                nbyte += size
+
+        if nrow > 0:
+            yield batch
+
+    def flatten(self):
+        """
+        Return the transaction statements and their parameter sets as the lists expected by AccountManager.write_db.
+
+        Returns:
+            statements (list): list of transaction statements.
+
+            params (list): list of the parameter sets of each statement.
+        """
+        statements = self.ordered()
+        params = [list(self._statements[i]) for i in statements]
+
+        return statements, params
+
+
+def _estimate_size(statement, params):
+    """
+    Estimate the encoded size of a statement and one of its parameter sets.
+    """
+    return len(statement) + sum([len(i) if isinstance(i, str) else 8 for i in params])
+
+
 # Database transaction functions
 def construct_where_clause(filter_rules):
     """
@@ -68,6 +291,49 @@ def construct_where_clause(filter_rules):
     return (where, params)
 
 
+def pad_in_list(values):
+    """
+    Pad a list of IN values to the nearest of the bucketed list sizes by repeating the last value.
+
+    Repeated values do not change the result of an IN or NOT IN condition. Lists longer than the largest bucket are
+    returned unchanged.
+
+    Arguments:
+        values (list): list of values.
+
+    Returns:
+        values (list): padded list of values.
+    """
+    values = list(values)
+    nvalue = len(values)
+    if nvalue < 1:
+        return values
+
+    size = next((i for i in IN_LIST_SIZES if i >= nvalue), nvalue)
+
+    return values + [values[-1]] * (size - nvalue)
+
+
+def format_in_clause(column, values, operator: str = 'IN'):
+    """
+    Prepare an IN condition on a column with a bucketed number of parameter markers.
+
+    Arguments:
+        column (str): name of the column.
+
+        values (list): list of values to match.
+
+        operator (str): one of IN or NOT IN [Default: IN].
+
+    Returns:
+        rule (tuple): where clause and parameter tuple of the condition.
+    """
+    params = tuple(pad_in_list(values))
+    statement = '{COL} {OPER} ({VALS})'.format(COL=column, OPER=operator, VALS=','.join(['?' for _ in params]))
+
+    return (statement, params)
+
+
 def convert_datatypes(value):
     """
     Convert values with numpy data-types to native data-types.
@@ -99,6 +365,76 @@ def convert_datatypes(value):
     return converted_value
 
 
+def convert_frame_datatypes(df):
+    """
+    Convert the columns of a DataFrame to native data-types and return the rows as parameter tuples.
+
+    Each column is converted as a whole, giving the same values as applying convert_datatypes to every cell. Missing
+    values are converted to None.
+
+    Arguments:
+        df (DataFrame): table of parameter values with one parameter set per row.
+
+    Returns:
+        params (list): list of parameter tuples.
+    """
+    columns = [_convert_column_datatypes(df.iloc[:, index]) for index in range(df.shape[1])]
+    if not columns:
+        return [() for _ in range(df.shape[0])]
+
+    return list(zip(*columns))
+
+
+def _convert_column_datatypes(values):
+    """
+    Convert the values of a column to native data-types.
+    """
+    is_float_dtype = pd.api.types.is_float_dtype
+    is_integer_dtype = pd.api.types.is_integer_dtype
+    is_bool_dtype = pd.api.types.is_bool_dtype
+    is_datetime_dtype = pd.api.types.is_datetime64_any_dtype
+    is_string_dtype = pd.api.types.is_string_dtype
+
+    dtype = values.dtype
+    is_set = values.notna().to_numpy()
+
+    if is_datetime_dtype(dtype):
+        if getattr(dtype, 'tz', None) is not None:
+            values = values.dt.tz_localize(None)
+
+        # Truncate to the precision of the database date format, as the strftime - strptime round trip does
+        precision = _date_format_precision(settings.date_format)
+        if precision:
+            values = values.dt.floor(precision)
+        converted = np.array(values.dt.to_pydatetime(), dtype=object)
+    elif is_bool_dtype(dtype) or is_float_dtype(dtype) or is_integer_dtype(dtype) or \
+            (is_string_dtype(dtype) and pd.api.types.infer_dtype(values, skipna=True) in ('string', 'empty')):
+        converted = values.to_numpy(dtype=object, copy=True)  # numpy scalars become native scalars
+    else:  # mixed or unsupported column data-type
+        converted = np.empty(len(values), dtype=object)
+        converted[:] = [convert_datatypes(i) for i in values]
+
+    converted[~is_set] = None
+
+    return converted
+
+
+def _date_format_precision(date_fmt):
+    """
+    Find the precision of datetime values formatted with a date format.
+    """
+    if not date_fmt or '%f' in date_fmt:
+        return None
+    elif '%S' in date_fmt:
+        return 's'
+    elif '%M' in date_fmt:
+        return 'min'
+    elif '%H' in date_fmt or '%I' in date_fmt:
+        return 'h'
+    else:
+        return 'D'
+
+
 def prepare_sql_query(tables, columns='*', filter_rules=None, order=None, distinct: bool = False):
     """
     Prepare a statement and parameters for querying an ODBC database.
@@ -151,18 +487,39 @@ def prepare_sql_query(tables, columns='*', filter_rules=None, order=None, distin
     return (query_str, params)
 
 
-def prepare_sql_insert(table, columns, values, statements: dict = None):
+def prepare_sql_insert(table, columns, values, statements: StatementBatch = None, multirow: bool = False):
     """
     Prepare a statement and parameters for inserting a new entry into an ODBC database.
+
+    Arguments:
+        table (str): name of the database table to insert into.
+
+        columns (list): list of database table columns that will be inserted.
+
+        values (tuple): tuple, list of tuples, or DataFrame containing column values for the table entry / entries.
+
+        statements (StatementBatch): batch of current transaction statements to add to.
+
+        multirow (bool): insert multiple entries per statement using a multi-row VALUES clause, within the limits on
+            the number of parameters and rows per statement [default: False].
     """
-    if not statements:
-        statements = {}
+    statements = statements if isinstance(statements, StatementBatch) else StatementBatch(statements)
 
     if isinstance(columns, str):
         columns = [columns]
 
     # Format parameters
-    if isinstance(values, list):  # multiple insertions requested
+    if isinstance(values, pd.DataFrame):  # one insertion per row
+        if len(columns) != values.shape[1]:
+            msg = 'failed to generate insertion statement - the number of columns is not equal to the number ' \
+                  'of columns in the provided data'
+            logger.error(msg)
+
+            raise SQLStatementError(msg)
+
+        params = convert_frame_datatypes(values)
+
+    elif isinstance(values, list):  # multiple insertions requested
         if not all([isinstance(i, tuple) for i in values]):
             msg = 'failed to generate insertion statement - individual transactions must be formatted as tuple'
             logger.error(msg)
@@ -207,29 +564,68 @@ def prepare_sql_insert(table, columns, values, statements: dict = None):
 
     # Prepare the database transaction statement
     markers = '({})'.format(','.join(['?' for _ in columns]))
-    insert_str = 'INSERT INTO {TABLE} {COLS} VALUES {VALS};' \
-        .format(TABLE=table, COLS='({})'.format(','.join(columns)), VALS=markers)
-    logger.debug('insertion string is "{STR}" with parameters "{PARAMS}"'.format(STR=insert_str, PARAMS=params))
+    if not multirow:
+        insert_str = 'INSERT INTO {TABLE} {COLS} VALUES {VALS};' \
+            .format(TABLE=table, COLS='({})'.format(','.join(columns)), VALS=markers)
+        logger.debug('insertion string is "{STR}" with parameters "{PARAMS}"'.format(STR=insert_str, PARAMS=params))
+
+        statements.add(insert_str, params, table=table)  # only unique parameter sets are added
+
+        return statements
 
-    if insert_str not in statements:  # new transaction statement
-        statements[insert_str] = []
+    # Group the unique entries into statements of as many rows as the database allows
+    params = list(dict.fromkeys(params))
+    nrow = max(1, min(MAX_INSERT_ROWS, (MAX_STATEMENT_PARAMS - 1) // len(columns)))
 
-    for param_tuple in params:  # only append unique parameter sets
-        if param_tuple not in statements[insert_str]:
-            statements[insert_str].append(param_tuple)
+    for start in range(0, len(params), nrow):
+        batch_params = params[start: start + nrow]
+        insert_str = 'INSERT INTO {TABLE} {COLS} VALUES {VALS};' \
+            .format(TABLE=table, COLS='({})'.format(','.join(columns)), VALS=','.join([markers] * len(batch_params)))
+
+        statements.add(insert_str, [tuple(chain.from_iterable(batch_params))], table=table, rows=len(batch_params))
+
+    logger.debug('prepared multi-row insertion statements for {N} entries into table {TABLE} with up to {ROWS} '
+                 'entries per statement'.format(N=len(params), TABLE=table, ROWS=nrow))
 
     return statements
 
 
-def prepare_sql_update(table, columns, values, where_clause, filter_values, statements: dict = None):
+def prepare_sql_update(table, columns, values, where_clause, filter_values, statements: StatementBatch = None):
     """
     Prepare a statement and parameters for updating an existing entry in an ODBC database.
     """
-    if not statements:
-        statements = {}
+    statements = statements if isinstance(statements, StatementBatch) else StatementBatch(statements)
 
     # Format parameters
-    if isinstance(values, list):  # multiple updates requested
+    if isinstance(values, pd.DataFrame):  # one update per row
+        if len(columns) != values.shape[1]:
+            msg = 'failed to generate update statement - the number of columns is not equal to the number ' \
+                  'of columns in the provided data'
+            logger.error(msg)
+
+            raise SQLStatementError(msg)
+
+        if isinstance(filter_values, pd.DataFrame):
+            filter_params = convert_frame_datatypes(filter_values)
+        elif isinstance(filter_values, list):
+            filter_params = [tuple([convert_datatypes(i) for i in filter_tup]) for filter_tup in filter_values]
+        else:
+            filter_params = None
+
+        if filter_params is None or len(filter_params) != values.shape[0]:
+            msg = 'failed to generate update statement - the number of transactions requested do not match the ' \
+                  'number of filters provided'
+            logger.error(msg)
+
+            raise SQLStatementError(msg)
+
+        # Add filter parameters to the end of the parameter list
+        params = [i + j for i, j in zip(convert_frame_datatypes(values), filter_params)]
+
+    elif isinstance(values, list):  # multiple updates requested
+        if isinstance(filter_values, pd.DataFrame):
+            filter_values = convert_frame_datatypes(filter_values)
+
         if not all([isinstance(i, tuple) for i in values]):
             msg = 'failed to generate update statement - individual transactions must be formatted as tuple'
             logger.error(msg)
@@ -301,17 +697,12 @@ def prepare_sql_update(table, columns, values, where_clause, filter_values, stat
         .format(TABLE=table, PAIRS=','.join(pair_list), WHERE=where_clause)
     logger.debug('update string is "{STR}" with parameters "{PARAMS}"'.format(STR=update_str, PARAMS=params))
 
-    if update_str not in statements:  # new transaction statement
-        statements[update_str] = []
-
-    for param_tuple in params:  # only append unique parameter sets
-        if param_tuple not in statements[update_str]:
-            statements[update_str].append(param_tuple)
+    statements.add(update_str, params, table=table)  # only unique parameter sets are added
 
     return statements
 
 
-def prepare_sql_upsert(table, columns, values, on, statements: dict = None):
+def prepare_sql_upsert(table, columns, values, on, statements: StatementBatch = None, multirow: bool = False):
     """
     Prepare a statement and parameters for inserting or updating an existing entry in an ODBC database, depending
     on whether it currently exists in the database or not.
@@ -321,20 +712,32 @@ def prepare_sql_upsert(table, columns, values, on, statements: dict = None):
 
         columns (list): list of database table columns that will be modified.
 
-        values (tuple): tuple or list of tuples containing column values for the table entry / entries.
+        values (tuple): tuple, list of tuples, or DataFrame containing column values for the table entry / entries.
 
         on (list): table column(s) used to match the existing table entries and the upsert entries.
 
-        statements (dict): dictionary of current transaction statements to add to.
+        statements (StatementBatch): batch of current transaction statements to add to.
+
+        multirow (bool): merge multiple entries per statement using a multi-row source, within the limits on the number
+            of parameters and rows per statement [default: False].
     """
-    if not statements:
-        statements = {}
+    statements = statements if isinstance(statements, StatementBatch) else StatementBatch(statements)
 
     if isinstance(on, str):
         on = [on]
 
     # Format parameters
-    if isinstance(values, list):  # multiple updates requested
+    if isinstance(values, pd.DataFrame):  # one upsert per row
+        if len(columns) != values.shape[1]:
+            msg = 'failed to generate upsert statement - the number of columns is not equal to the number ' \
+                  'of columns in the provided data'
+            logger.error(msg)
+
+            raise SQLStatementError(msg)
+
+        params = convert_frame_datatypes(values)
+
+    elif isinstance(values, list):  # multiple updates requested
         if not all([isinstance(i, tuple) for i in values]):
             msg = 'failed to generate upsert statement - individual transactions must be formatted as tuple'
             logger.error(msg)
@@ -396,39 +799,94 @@ def prepare_sql_upsert(table, columns, values, on, statements: dict = None):
     up_cols_list_query = ','.join(up_cols_list)
 
     # Prepare the database transaction statement
-    upsert_str = f'''
-                  MERGE {table} AS Target 
-                  USING (SELECT * FROM (VALUES {markers}) AS s ({insert_cols})) AS Source
-                  ON {where_clause}
-                  WHEN NOT MATCHED THEN
-                  INSERT ({insert_cols}) VALUES ({sr_cols_list_query})
-                  WHEN MATCHED THEN
-                  UPDATE SET {up_cols_list_query};
-                  '''
-    logger.debug('update string is "{STR}" with parameters "{PARAMS}"'.format(STR=upsert_str, PARAMS=params))
-
-    if upsert_str not in statements:  # new transaction statement
-        statements[upsert_str] = []
-
-    for param_tuple in params:  # only append unique parameter sets
-        if param_tuple not in statements[upsert_str]:
-            statements[upsert_str].append(param_tuple)
+    if not multirow:
+        upsert_str = f'''
+                      MERGE {table} AS Target 
+                      USING (SELECT * FROM (VALUES {markers}) AS s ({insert_cols})) AS Source
+                      ON {where_clause}
+                      WHEN NOT MATCHED THEN
+                      INSERT ({insert_cols}) VALUES ({sr_cols_list_query})
+                      WHEN MATCHED THEN
+                      UPDATE SET {up_cols_list_query};
+                      '''
+        logger.debug('update string is "{STR}" with parameters "{PARAMS}"'.format(STR=upsert_str, PARAMS=params))
+
+        statements.add(upsert_str, params, table=table)  # only unique parameter sets are added
+
+        return statements
+
+    # A merge source can match each target entry only once, so keep the last values provided for each entry
+    try:
+        on_indices = [list(columns).index(i) for i in on]
+    except ValueError:
+        msg = 'failed to generate upsert statement - the match columns {ON} must be included in the upsert columns' \
+            .format(ON=on)
+        logger.error(msg)
+
+        raise SQLStatementError(msg)
+
+    entries = {}
+    for param_tuple in params:
+        entries[tuple([param_tuple[i] for i in on_indices])] = param_tuple
+    params = list(entries.values())
+
+    # Group the entries into statements of as many source rows as the database allows
+    nrow = max(1, min(MAX_INSERT_ROWS, (MAX_STATEMENT_PARAMS - 1) // len(columns)))
+
+    for start in range(0, len(params), nrow):
+        batch_params = params[start: start + nrow]
+        source_markers = ','.join([markers] * len(batch_params))
+        upsert_str = f'''
+                      MERGE {table} AS Target 
+                      USING (SELECT * FROM (VALUES {source_markers}) AS s ({insert_cols})) AS Source
+                      ON {where_clause}
+                      WHEN NOT MATCHED THEN
+                      INSERT ({insert_cols}) VALUES ({sr_cols_list_query})
+                      WHEN MATCHED THEN
+                      UPDATE SET {up_cols_list_query};
+                      '''
+
+        statements.add(upsert_str, [tuple(chain.from_iterable(batch_params))], table=table, rows=len(batch_params))
+
+    logger.debug('prepared multi-row upsert statements for {N} entries into table {TABLE} with up to {ROWS} entries '
+                 'per statement'.format(N=len(params), TABLE=table, ROWS=nrow))
 
     return statements
 
 
-def prepare_sql_delete(table, columns, values, statements: dict = None):
+def prepare_sql_delete(table, columns, values, statements: StatementBatch = None, multirow: bool = False):
     """
     Prepare a statement and parameters for deleting an existing entry from an ODBC database.
+
+    Arguments:
+        table (str): name of the database table to delete from.
+
+        columns (list): list of database table columns used to match the entries to delete.
+
+        values (tuple): tuple, list of tuples, or DataFrame containing the column values of the entry / entries.
+
+        statements (StatementBatch): batch of current transaction statements to add to.
+
+        multirow (bool): delete multiple entries per statement, matching the entries on a list of values for a single
+            column or on a joined set of values for multiple columns [default: False].
     """
-    if not statements:
-        statements = {}
+    statements = statements if isinstance(statements, StatementBatch) else StatementBatch(statements)
 
     if isinstance(columns, str):
         columns = [columns]
 
     # Format parameters
-    if isinstance(values, list):
+    if isinstance(values, pd.DataFrame):  # one deletion per row
+        if len(columns) != values.shape[1]:
+            msg = 'failed to generate deletion statement - the number of columns is not equal to the number ' \
+                  'of columns in the provided data'
+            logger.error(msg)
+
+            raise SQLStatementError(msg)
+
+        params = convert_frame_datatypes(values)
+
+    elif isinstance(values, list):
         if not all([isinstance(i, tuple) for i in values]):
             msg = 'failed to generate insertion statement - individual transactions must be formatted as tuple'
             logger.error(msg)
@@ -472,6 +930,26 @@ def prepare_sql_delete(table, columns, values, statements: dict = None):
 
         raise SQLStatementError(msg)
 
+    if multirow:
+        if len(set(columns)) != len(columns):
+            msg = 'failed to generate deletion statement - multi-row deletions require unique columns'
+            logger.error(msg)
+
+            raise SQLStatementError(msg)
+
+        for key_clause, key_params in _prepare_key_sets(table, columns, params):
+            if len(columns) == 1:
+                delete_str = 'DELETE FROM {TABLE} WHERE {KEYS};'.format(TABLE=table, KEYS=key_clause)
+            else:
+                delete_str = 'DELETE Target {KEYS};'.format(KEYS=key_clause)
+
+            statements.add(delete_str, [key_params], table=table, rows=_count_keys(key_params, len(columns)))
+
+        logger.debug('prepared multi-row deletion statements for {N} entries from table {TABLE}'
+                     .format(N=len(params), TABLE=table))
+
+        return statements
+
     pairs = {}
     for colname in columns:
         if colname in pairs:
@@ -495,16 +973,178 @@ def prepare_sql_delete(table, columns, values, statements: dict = None):
     delete_str = 'DELETE FROM {TABLE} WHERE {PAIRS}'.format(TABLE=table, PAIRS=' AND '.join(pair_list))
     logger.debug('deletion string is "{STR}" with parameters "{PARAMS}"'.format(STR=delete_str, PARAMS=params))
 
-    if delete_str not in statements:  # new transaction statement
-        statements[delete_str] = []
+    statements.add(delete_str, params, table=table)  # only unique parameter sets are added
+
+    return statements
+
+
+def prepare_sql_keyed_update(table, columns, values, key_columns, keys, statements: StatementBatch = None):
+    """
+    Prepare statements and parameters for setting the same column values on many existing entries in an ODBC
+    database, such as when flagging entries as deleted.
+
+    Entries are matched on a list of values for a single key column or on a joined set of values for multiple key
+    columns, with as many keys per statement as the database allows.
+
+    Arguments:
+        table (str): name of the database table to modify.
+
+        columns (list): list of database table columns that will be modified.
+
+        values (tuple): column values to set on every matching entry.
+
+        key_columns (list): table column(s) used to match the entries to modify.
+
+        keys (list): list of key values, list of key tuples, or DataFrame containing the keys of the entries to modify.
+
+        statements (StatementBatch): batch of current transaction statements to add to.
+    """
+    statements = statements if isinstance(statements, StatementBatch) else StatementBatch(statements)
+
+    if isinstance(columns, str):
+        columns = [columns]
+    if isinstance(key_columns, str):
+        key_columns = [key_columns]
+    if not isinstance(values, tuple):
+        values = (values,)
+
+    if len(columns) != len(values):
+        msg = 'failed to generate update statement - the number of columns is not equal to the number of provided ' \
+              'parameters for the transaction'
+        logger.error(msg)
+
+        raise SQLStatementError(msg)
 
-    for param_tuple in params:  # only append unique parameter sets
-        if param_tuple not in statements[delete_str]:
-            statements[delete_str].append(param_tuple)
+    # Format parameters
+    if isinstance(keys, pd.DataFrame):
+        key_params = convert_frame_datatypes(keys)
+    else:
+        key_params = [tuple([convert_datatypes(j) for j in i]) if isinstance(i, tuple) else (convert_datatypes(i),)
+                      for i in keys]
+
+    if not all([len(key_columns) == len(i) for i in key_params]):
+        msg = 'failed to generate update statement - the number of key columns is not equal to the number of ' \
+              'provided key values'
+        logger.error(msg)
+
+        raise SQLStatementError(msg)
+
+    value_params = tuple([convert_datatypes(i) for i in values])
+    pair_list = ','.join(['{}=?'.format(colname) for colname in columns])
+
+    for key_clause, key_set_params in _prepare_key_sets(table, key_columns, key_params, nfixed=len(value_params)):
+        if len(key_columns) == 1:
+            update_str = 'UPDATE {TABLE} SET {PAIRS} WHERE {KEYS};' \
+                .format(TABLE=table, PAIRS=pair_list, KEYS=key_clause)
+        else:
+            update_str = 'UPDATE Target SET {PAIRS} {KEYS};'.format(PAIRS=pair_list, KEYS=key_clause)
+
+        statements.add(update_str, [value_params + key_set_params], table=table,
+                       rows=_count_keys(key_set_params, len(key_columns)))
+
+    logger.debug('prepared keyed update statements for {N} entries of table {TABLE}'
+                 .format(N=len(key_params), TABLE=table))
 
     return statements
 
 
+def _prepare_key_sets(table, key_columns, keys, nfixed: int = 0):
+    """
+    Group unique keys into sets that fit within the parameter and row limits of a statement.
+
+    Arguments:
+        table (str): name of the database table.
+
+        key_columns (list): table column(s) that the keys are matched on.
+
+        keys (list): list of key tuples.
+
+        nfixed (int): number of statement parameters used by other parts of the statement.
+
+    Returns:
+        key_sets (list): list of (clause, parameters) tuples. For a single key column, the clause is an IN condition on
+            the column. For multiple key columns, the clause joins the table, aliased as Target, to the set of keys.
+            Key sets are padded to the bucketed IN list sizes.
+    """
+    keys = list(dict.fromkeys(keys))
+    nkey = max(1, min(MAX_INSERT_ROWS, (MAX_STATEMENT_PARAMS - 1 - nfixed) // len(key_columns)))
+    nkey = max([i for i in IN_LIST_SIZES if i <= nkey])  # full key sets share the statement text of a bucketed size
+
+    markers = '({})'.format(','.join(['?' for _ in key_columns]))
+    on_clause = ' AND '.join(['Target.{COL}=Source.{COL}'.format(COL=i) for i in key_columns])
+
+    key_sets = []
+    for start in range(0, len(keys), nkey):
+        set_keys = pad_in_list(keys[start: start + nkey])
+        if len(key_columns) == 1:
+            clause = '{COL} IN ({VALS})'.format(COL=key_columns[0], VALS=','.join(['?' for _ in set_keys]))
+        else:
+            clause = 'FROM {TABLE} AS Target INNER JOIN (VALUES {VALS}) AS Source ({COLS}) ON {ON}' \
+                .format(TABLE=table, VALS=','.join([markers] * len(set_keys)), COLS=','.join(key_columns),
+                        ON=on_clause)
+
+        key_sets.append((clause, tuple(chain.from_iterable(set_keys))))
+
+    return key_sets
+
+
+def _count_keys(key_params, nkey_columns):
+    """
+    Count the unique keys in the flattened parameters of a key set, ignoring the keys repeated to pad the set.
+    """
+    return len(set(zip(*[iter(key_params)] * nkey_columns)))
+
+
+def write_statements(statements, atomic: bool = True, max_rows: int = None, max_bytes: int = None):
+    """
+    Write a batch of transaction statements to the database.
+
+    Arguments:
+        statements (StatementBatch): batch of transaction statements.
+
+        atomic (bool): write all statements in a single transaction, so that either all statements are committed or
+            none are [Default: True]. Otherwise, the batch is split into sub-batches of bounded size that are each
+            written and committed in turn, in dependency order, stopping at the first sub-batch that fails.
+
+        max_rows (int): maximum number of table rows written by a sub-batch [Default: configured transaction rows].
+
+        max_bytes (int): maximum estimated size of a sub-batch, in bytes [Default: configured transaction size].
+
+    Returns:
+        success (bool): all statements were written successfully.
+    """
+    statements = statements if isinstance(statements, StatementBatch) else StatementBatch(statements)
+    max_rows = max_rows if max_rows else settings.transaction_rows
+    max_bytes = max_bytes if max_bytes else int(settings.transaction_size * 1024 * 1024)
+
+    if len(statements) < 1:
+        return True
+
+    if atomic:
+        nrow = statements.nrows()
+        if nrow > max_rows:
+            logger.warning('writing {N} rows in a single transaction'.format(N=nrow))
+
+        sstrings, psets = statements.flatten()
+
+        return user.write_db(sstrings, psets)
+
+    nbatch = 0
+    for batch in statements.split(max_rows=max_rows, max_bytes=max_bytes):
+        sstrings, psets = batch.flatten()
+        if not user.write_db(sstrings, psets):
+            logger.error('failed to write transaction sub-batch {N} - {NC} preceding sub-batches were committed'
+                         .format(N=nbatch + 1, NC=nbatch))
+
+            return False
+
+        nbatch += 1
+
+    logger.debug('wrote transaction statements in {N} sub-batches'.format(N=nbatch))
+
+    return True
+
+
 # DB formatting functions
 def format_import_filters(import_rules):
     """
@@ -592,8 +1232,14 @@ def get_import_column(import_rules, column):
     """
     Format a table column for querying.
     """
-    query_column = None
+    return format_import_column_map(import_rules).get(column, None)
 
+
+def format_import_column_map(import_rules):
+    """
+    Map record columns to the table columns used for querying.
+    """
+    column_map = {}
     for import_table in import_rules:
         import_rule = import_rules[import_table]
 
@@ -602,14 +1248,30 @@ def get_import_column(import_rules, column):
 
             column_alias = import_columns[import_column]
             if isinstance(column_alias, list):
-                if import_column == column:
-                    column_alias = ['{TBL}.{COL}'.format(TBL=import_table, COL=i) for i in column_alias]
-                    query_column = 'COALESCE({})'.format(','.join(column_alias), import_column)
+                column_alias = ['{TBL}.{COL}'.format(TBL=import_table, COL=i) for i in column_alias]
+                column_map[import_column] = 'COALESCE({})'.format(','.join(column_alias))
             else:
-                if column_alias == column:
-                    query_column = '{TBL}.{COL}'.format(TBL=import_table, COL=import_column)
+                column_map[column_alias] = '{TBL}.{COL}'.format(TBL=import_table, COL=import_column)
+
+    return column_map
+
+
+def compile_import_rules(import_rules):
+    """
+    Resolve the components of the import queries that depend only on the import rules.
+
+    Arguments:
+        import_rules (dict): record import rules.
+
+    Returns:
+        compiled (dict): table statement ("Tables"), configured import filters ("Filters"), and the mapping of record
+            columns to table columns ("ColumnMap").
+    """
+    compiled = {'Tables': format_tables(import_rules),
+                'Filters': format_import_filters(import_rules),
+                'ColumnMap': format_import_column_map(import_rules)}
 
-    return query_column
+    return compiled
 
 
 def format_tables(import_rules):
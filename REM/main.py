@@ -19,7 +19,7 @@ import REM.elements as mod_elem
 import REM.layouts as mod_lo
 import REM.records as mod_records
 import REM.secondary as mod_win2
-from REM.client import logger, server_conn, settings, user
+from REM.client import connect, is_connected, logger, server_conn, settings, tracer, user, worker_pool
 
 
 # Classes
@@ -611,7 +611,15 @@ def main():
     else:
         current_h = screen_h
 
-    # Load the program configuration
+    # Connect to the server and load the program configuration
+    try:
+        connect()
+    except ConnectionError as e:
+        logger.error('failed to connect to the server - {ERR}'.format(ERR=e))
+        mod_win2.popup_error('failed to connect to the server - {ERR}'.format(ERR=e))
+
+        sys.exit(1)
+
     record_rules = ConfigurationManager(settings.record_rules)
     settings.records = record_rules
 
@@ -650,12 +658,16 @@ def main():
     debug_win = None
 
     # Initialize main window and login window
-    window = sg.Window('REM Tila (v{VER})'.format(VER=__version__), layout, icon=settings.icon,
+    win_title = 'REM Tila (v{VER})'.format(VER=__version__)
+    window = sg.Window(win_title, layout, icon=settings.icon,
                        font=mod_const.MAIN_FONT, size=(current_w, current_h), resizable=True, margins=(0, 0),
                        return_keyboard_events=True)
     window.finalize()
     window.maximize()
 
+    # Show the state of the server connection in the window title
+    server_conn.watch(window, '-CONNECTION-')
+
     window.set_min_size((min_w, min_h))
 
     screen_w, screen_h = window.get_screen_dimensions()
@@ -693,6 +705,16 @@ def main():
 
             break
 
+        # Server connection state changed
+        if event == '-CONNECTION-':
+            conn_state = values['-CONNECTION-']
+            if conn_state == 'connected':
+                window.set_title(win_title)
+            else:
+                window.set_title('{TITLE} - {STATE}'.format(TITLE=win_title, STATE=conn_state))
+
+            continue
+
         # Resize screen
         if resized and current_panel != home_panel:
             if current_rule is not None:
@@ -825,6 +847,11 @@ def main():
                 log_level = debug_value['-LEVEL-']
                 logger.info('resetting logging level to {}'.format(log_level))
                 settings.reload_logger(debug_win['-OUTPUT-'].TKOut, log_level=log_level)
+            elif debug_event == '-TRACE-':
+                tracer.enabled = debug_value['-TRACE-']
+                logger.info('request tracing is {}'.format('on' if tracer.enabled else 'off'))
+            elif debug_event == '-TRACES-':
+                print(tracer.dump())
             else:
                 debug_win['-OUTPUT-'].expand(expand_x=True, expand_y=True, expand_row=True)
 
@@ -997,20 +1024,30 @@ if __name__ == "__main__":
         logger.exception('fatal program error')
         mod_win2.popup_error('fatal program error - {}'.format(e))
 
-        # Remove all unsaved record IDs associated with the program instance
-        settings.remove_unsaved_ids()
+        if is_connected():
+            # Remove all unsaved record IDs associated with the program instance
+            settings.remove_unsaved_ids()
 
-        # Close the connection to the server
-        server_conn.close()
+            # Close the connections to the server
+            user.close_connections()
+            server_conn.close()
+
+        # Stop any background operations
+        worker_pool.shutdown()
 
         # Exit gracefully
         sys.exit(1)
     else:
-        # Remove all unsaved record IDs associated with the program instance
-        settings.remove_unsaved_ids()
+        if is_connected():
+            # Remove all unsaved record IDs associated with the program instance
+            settings.remove_unsaved_ids()
+
+            # Close the connections to the server
+            user.close_connections()
+            server_conn.close()
 
-        # Close the connection to the server
-        server_conn.close()
+        # Stop any background operations
+        worker_pool.shutdown()
 
         # Exit gracefully
         sys.exit(0)
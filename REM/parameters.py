@@ -10,6 +10,7 @@ import PySimpleGUI as sg
 import pandas as pd
 
 import REM.constants as mod_const
+import REM.database as mod_db
 import REM.layouts as mod_lo
 import REM.secondary as mod_win2
 from REM.client import logger, settings
@@ -982,24 +983,19 @@ class InputParameterDate(InputParameterStandard):
         if value == '' or pd.isna(value):
             return None
 
-        input_date_format = settings.input_date_format
-
-        try:
-            new_value = pd.to_datetime(value, format=input_date_format, utc=False).to_pydatetime()
-        except ValueError:
+        new_value = settings.parse_date_values(value, date_format=settings.input_date_format)
+        if pd.isna(new_value):
             logger.warning('InputParameter {NAME}: failed to format input value {VAL} as a datetime object'
                            .format(NAME=self.name, VAL=value))
 
-            new_value = None
+            return None
 
-        return new_value
+        return new_value.to_pydatetime()
 
     def _enforce_formatting(self, value):
         """
         Enforce the correct formatting of user input into the parameter element.
         """
-        strptime = datetime.datetime.strptime
-
         logger.debug('InputParameter {PARAM}: enforcing correct formatting of input value {VAL}'
                      .format(PARAM=self.name, VAL=value))
 
@@ -1012,9 +1008,8 @@ class InputParameterDate(InputParameterStandard):
 
         input_len = len(new_value)
         if input_len == 8:
-            try:
-                new_date = strptime(''.join(new_value), '%Y%m%d')
-            except ValueError:  # date is incorrectly formatted
+            new_date = settings.parse_date_values(''.join(new_value), date_format='%Y%m%d')
+            if pd.isna(new_date):  # date is incorrectly formatted
                 msg = '{} is not a valid date format'.format(''.join(new_value))
                 mod_win2.popup_notice(msg)
                 logger.warning('InputParameter {NAME}: {MSG}'.format(NAME=self.name, MSG=msg))
@@ -1022,7 +1017,7 @@ class InputParameterDate(InputParameterStandard):
                 display_value = format_display_date(raw_value, sep='/')
             else:
                 raw_value = new_value
-                display_value = new_date.strftime(settings.input_date_format)
+                display_value = settings.format_date_values(new_date, date_format=settings.input_date_format)
         elif input_len < 8:
             current_len = len(raw_value)
             if current_len > input_len:  # user deleted a character
@@ -1079,7 +1074,8 @@ class InputParameterDate(InputParameterStandard):
 
         # Parameter settings
         default_value = self.default
-        default_display = '' if pd.isna(default_value) else self.value.strftime(input_date_format)
+        default_display = '' if pd.isna(default_value) else \
+            settings.format_date_values(self.value, date_format=input_date_format)
         display_value = self._enforce_formatting(default_display)
         if display_value == '':
             display_value = self.placeholder
@@ -1116,7 +1112,7 @@ class InputParameterDate(InputParameterStandard):
         if not self.has_value():
             return ''
 
-        display_value = self.value.strftime(settings.input_date_format)
+        display_value = settings.format_date_values(self.value, date_format=settings.input_date_format)
 
         return display_value
 
@@ -1146,7 +1142,7 @@ class InputParameterDate(InputParameterStandard):
         column = self.name
 
         try:
-            col_values = pd.to_datetime(df[column], errors='coerce', format=settings.date_format)
+            col_values = settings.parse_date_values(df[column])
         except Exception as e:
             logger.exception('InputParameter {NAME}: unable to set column {COL} to parameter data type {DTYPE} - {ERR}'
                              .format(NAME=self.name, COL=column, DTYPE=dtype, ERR=e))
@@ -1798,7 +1794,7 @@ class InputParameterRange(InputParameterComp):
 
         try:
             if dtype in settings.supported_date_dtypes:
-                col_values = pd.to_datetime(df[column], errors='coerce', format=settings.date_format)
+                col_values = settings.parse_date_values(df[column])
             elif dtype in settings.supported_int_dtypes:
                 col_values = pd.to_numeric(df[column].fillna(0), errors='coerce', downcast='integer')
             elif dtype in settings.supported_float_dtypes:
@@ -2256,10 +2252,7 @@ class InputParamterMultiple(InputParameter):
         Generate the filter clause for SQL querying.
         """
         if self.has_value():
-            values = self.value
-
-            param_list = ','.join(['?' for _ in values])
-            statement = ('{COL} IN ({VALS})'.format(COL=column, VALS=param_list), values)
+            statement = mod_db.format_in_clause(column, self.value)
         else:
             statement = None
 
@@ -2281,7 +2274,7 @@ class InputParamterMultiple(InputParameter):
 
         try:
             if dtype in settings.supported_date_dtypes:
-                col_values = pd.to_datetime(df[column], errors='coerce', format=settings.date_format)
+                col_values = settings.parse_date_values(df[column])
             elif dtype in settings.supported_int_dtypes:
                 col_values = pd.to_numeric(df[column].fillna(0), errors='coerce', downcast='integer')
             elif dtype in settings.supported_float_dtypes:
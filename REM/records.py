@@ -113,6 +113,10 @@ class RecordGroup:
 
         self.import_rules = import_rules
 
+        # Resolve the import query components once, as the import rules are static
+        self._import_query = mod_db.compile_import_rules(import_rules)
+        self._import_columns = {}  # formatted import columns by database
+
         # Database export rules
         if self.program_record:
             try:
@@ -280,13 +284,19 @@ class RecordGroup:
         converter_funcs = {'CAST', 'CONVERT'}
         merge_funcs = {'COALESCE', 'CONCAT'}
 
+        use_cache = import_rules is None or import_rules is self.import_rules
         import_rules = self.import_rules if import_rules is None else import_rules
         database = settings.prog_db if self.program_record else settings.dbname
 
+        if use_cache and database in self._import_columns:
+            return list(self._import_columns[database])
+
         columns = []
         for import_table in import_rules:
             import_rule = import_rules[import_table]
             table_columns = user.table_schema(database, import_table)
+            if not table_columns:  # don't cache columns formatted without the table schema
+                use_cache = False
 
             try:
                 modifiers = import_rule['Modifiers']
@@ -346,8 +356,23 @@ class RecordGroup:
                 column = '{OPER} AS {ALIAS}'.format(OPER=oper, ALIAS=column_alias)
                 columns.append(column)
 
+        if use_cache:
+            self._import_columns[database] = list(columns)
+
         return columns
 
+    def _compile_import_rules(self, import_rules: dict = None):
+        """
+        Return the resolved import query components of the import rules.
+
+        Arguments:
+            import_rules (dict): custom import rules [Default: use the record group import rules].
+        """
+        if not import_rules or import_rules is self.import_rules:
+            return self._import_query
+
+        return mod_db.compile_import_rules(import_rules)
+
     def _set_database(self, database: str = None):
         """
         Set the import database.
@@ -375,8 +400,7 @@ class RecordGroup:
         """
         Convert from record column to database column.
         """
-        import_rules = self.import_rules
-        db_col = mod_db.get_import_column(import_rules, column)
+        db_col = self._import_query['ColumnMap'].get(column, None)
 
         return db_col
 
@@ -391,12 +415,12 @@ class RecordGroup:
 
             database (str): load unique values from the provided database.
         """
-        import_rules = self.import_rules
+        compiled = self._import_query
         db = self._set_database(database)
 
-        tables = mod_db.format_tables(import_rules)
-        filters = mod_db.format_import_filters(import_rules)
-        db_col = mod_db.get_import_column(import_rules, field)
+        tables = compiled['Tables']
+        filters = list(compiled['Filters'])
+        db_col = compiled['ColumnMap'].get(field, None)
         if sort:
             order_by = db_col
         else:
@@ -404,13 +428,13 @@ class RecordGroup:
 
         # Find the date of the most recent transaction prior to current date
         query = mod_db.prepare_sql_query(tables, columns=db_col, filter_rules=filters, order=order_by, distinct=True)
-        unique_df = user.read_db(*query, database=db)
+        unique_df = user.read_db(*query, database=db, use_cache=True)
         unique_values = unique_df.iloc[:, 0].tolist()
 
         return unique_values
 
     def load_records(self, id_list, use_import_rules: bool = True, filters: dict = None, import_rules: dict = None,
-                     database: str = None):
+                     database: str = None, parallel: int = None):
         """
         Load database records from a list of provided record IDs.
 
@@ -425,6 +449,8 @@ class RecordGroup:
 
             database (str): load records from the provided database.
 
+            parallel (int): maximum number of record ID sets to query at a time [Default: configured parallel reads].
+
         Returns:
             import_df (DataFrame): dataframe of imported records.
         """
@@ -443,38 +469,40 @@ class RecordGroup:
         custom_filters = self._format_filter_set(filters) if filters else []
 
         # Add configured import filters
-        table_statement = mod_db.format_tables(import_rules)
+        compiled = self._compile_import_rules(import_rules)
+        table_statement = compiled['Tables']
         columns = self._format_import_columns(import_rules)
-        id_col = mod_db.get_import_column(import_rules, self.id_column)
+        id_col = compiled['ColumnMap'].get(self.id_column, None)
 
         # Query existing database entries
-        import_df = pd.DataFrame()
+        queries = []
         for i in range(0, len(record_ids), 1000):  # split into sets of 1000 to prevent max parameter errors in SQL
             sub_ids = record_ids[i: i + 1000]
             if use_import_rules:
-                filter_rules = custom_filters + mod_db.format_import_filters(import_rules)
+                filter_rules = custom_filters + compiled['Filters']
             else:
-                filter_rules = custom_filters
+                filter_rules = list(custom_filters)
 
-            filter_clause = '{COL} IN ({VALS})'.format(COL=id_col, VALS=','.join(['?' for _ in sub_ids]))
-            filter_rules.append((filter_clause, tuple(sub_ids)))
+            filter_rules.append(mod_db.format_in_clause(id_col, sub_ids))
 
-            query = mod_db.prepare_sql_query(table_statement, columns=columns, filter_rules=filter_rules, order=id_col)
-            loaded_df = user.read_db(*query, database=db)
+            queries.append(mod_db.prepare_sql_query(table_statement, columns=columns, filter_rules=filter_rules,
+                                                    order=id_col))
 
-            if import_df.empty:
-                import_df = loaded_df
-            else:
-                import_df = import_df.append(loaded_df, ignore_index=True)
+        loaded = user.read_db_many(queries, database=db, parallel=parallel)
+        if loaded:
+            import_df = pd.concat(loaded, ignore_index=True)
+        else:
+            import_df = pd.DataFrame()
 
         logger.debug('{NLOADED} records passed the query filters out of {NTOTAL} requested records'
                      .format(NLOADED=import_df.shape[0], NTOTAL=len(record_ids)))
 
         return import_df
 
-    def import_records(self, filter_params=None, filter_rules=None, import_rules: dict = None, database: str = None):
+    def _prepare_import_query(self, filter_params=None, filter_rules=None, import_rules: dict = None,
+                              ordered: bool = True):
         """
-        Import entry records from the database.
+        Prepare the query statement and parameters for importing entry records from the database.
 
         Arguments:
             filter_params (list): list of parameter objects that will be used to filter the database when importing
@@ -485,7 +513,34 @@ class RecordGroup:
 
             import_rules (dict): use custom import rules to import the records from the database.
 
-            database (str): load records from the provided database.
+            ordered (bool): order the records by record ID [Default: True].
+        """
+        import_rules = self.import_rules if not import_rules else import_rules
+
+        filters = self._prepare_import_filters(filter_params=filter_params, filter_rules=filter_rules,
+                                               import_rules=import_rules)
+        compiled = self._compile_import_rules(import_rules)
+        table_statement = compiled['Tables']
+        columns = self._format_import_columns(import_rules)
+        id_col = compiled['ColumnMap'].get(self.id_column, None)
+
+        order = id_col if ordered else None
+        query = mod_db.prepare_sql_query(table_statement, columns=columns, filter_rules=filters, order=order)
+
+        return query
+
+    def _prepare_import_filters(self, filter_params=None, filter_rules=None, import_rules: dict = None):
+        """
+        Prepare the list of filter rules used when importing entry records from the database.
+
+        Arguments:
+            filter_params (list): list of parameter objects that will be used to filter the database when importing
+                records.
+
+            filter_rules (tuple): tuple or list of tuples containing where clause and value tuple for a given filter
+                rule.
+
+            import_rules (dict): use custom import rules to import the records from the database.
         """
         if isinstance(filter_params, list) or isinstance(filter_params, tuple):
             params = filter_params
@@ -494,19 +549,14 @@ class RecordGroup:
         else:
             params = [filter_params]
 
-        import_rules = self.import_rules if not import_rules else import_rules
-        db = self._set_database(database)
+        compiled = self._compile_import_rules(import_rules)
 
         # Add configured import filters
-        filters = mod_db.format_import_filters(import_rules)
-        table_statement = mod_db.format_tables(import_rules)
-        columns = self._format_import_columns(import_rules)
-        #columns = mod_db.format_import_columns(import_rules)
-        id_col = mod_db.get_import_column(import_rules, self.id_column)
+        filters = list(compiled['Filters'])
 
         # Add optional parameter-based filters
         for param in params:
-            dbcol = mod_db.get_import_column(import_rules, param.name)
+            dbcol = compiled['ColumnMap'].get(param.name, None)
             if dbcol:
                 param_filter = param.query_statement(dbcol)
                 if param_filter is not None:
@@ -518,12 +568,195 @@ class RecordGroup:
         elif isinstance(filter_rules, tuple):
             filters.append(filter_rules)
 
+        return filters
+
+    def import_records(self, filter_params=None, filter_rules=None, import_rules: dict = None, database: str = None):
+        """
+        Import entry records from the database.
+
+        Arguments:
+            filter_params (list): list of parameter objects that will be used to filter the database when importing
+                records.
+
+            filter_rules (tuple): tuple or list of tuples containing where clause and value tuple for a given filter
+                rule.
+
+            import_rules (dict): use custom import rules to import the records from the database.
+
+            database (str): load records from the provided database.
+        """
+        db = self._set_database(database)
+
         # Query existing database entries
-        query = mod_db.prepare_sql_query(table_statement, columns=columns, filter_rules=filters, order=id_col)
+        query = self._prepare_import_query(filter_params=filter_params, filter_rules=filter_rules,
+                                           import_rules=import_rules)
         import_df = user.read_db(*query, database=db)
 
         return import_df
 
+    def import_record_page(self, filter_params=None, filter_rules=None, import_rules: dict = None,
+                           database: str = None, page_size: int = None, after=None):
+        """
+        Import a single page of entry records from the database, ordered by record ID.
+
+        Arguments:
+            filter_params (list): list of parameter objects that will be used to filter the database when importing
+                records.
+
+            filter_rules (tuple): tuple or list of tuples containing where clause and value tuple for a given filter
+                rule.
+
+            import_rules (dict): use custom import rules to import the records from the database.
+
+            database (str): load records from the provided database.
+
+            page_size (int): maximum number of records in the page [Default: configured import page size].
+
+            after (str): import the page of records following this cursor [Default: import the first page].
+
+        Returns:
+            tuple: dataframe of imported records and the cursor of the next page, which is None when no more pages
+                remain.
+        """
+        db = self._set_database(database)
+
+        # Keyset pagination orders the records on the server, so the query itself must remain unordered
+        query = self._prepare_import_query(filter_params=filter_params, filter_rules=filter_rules,
+                                           import_rules=import_rules, ordered=False)
+        import_df, cursor = user.read_db_page(*query, key=self.id_column, page_size=page_size, after=after,
+                                              database=db)
+
+        return import_df, cursor
+
+    def import_record_page_async(self, window, event: str, filter_params=None, filter_rules=None,
+                                 import_rules: dict = None, database: str = None, page_size: int = None, after=None):
+        """
+        Import a single page of entry records from the database without waiting for the results.
+
+        Arguments:
+            window: PySimpleGUI window to notify when the page of records has been imported.
+
+            event (str): event key written to the window event loop, with the completed future as the event value.
+
+            filter_params (list): list of parameter objects that will be used to filter the database when importing
+                records.
+
+            filter_rules (tuple): tuple or list of tuples containing where clause and value tuple for a given filter
+                rule.
+
+            import_rules (dict): use custom import rules to import the records from the database.
+
+            database (str): load records from the provided database.
+
+            page_size (int): maximum number of records in the page [Default: configured import page size].
+
+            after (str): import the page of records following this cursor [Default: import the first page].
+
+        Returns:
+            future (Future): future holding the dataframe of imported records and the cursor of the next page.
+        """
+        db = self._set_database(database)
+
+        query = self._prepare_import_query(filter_params=filter_params, filter_rules=filter_rules,
+                                           import_rules=import_rules, ordered=False)
+        future = user.read_db_page_async(*query, key=self.id_column, page_size=page_size, after=after, database=db,
+                                         window=window, event=event)
+
+        return future
+
+    def aggregate_records(self, aggregates: dict, group_by: list = None, filter_params=None, filter_rules=None,
+                          import_rules: dict = None, database: str = None):
+        """
+        Summarize entry records in the database without importing the records.
+
+        Arguments:
+            aggregates (dict): aggregate column names mapped to a tuple of aggregate function (sum, count, min, or
+                max) and the record column to aggregate.
+
+            group_by (list): list of record columns to group the records on [Default: aggregate over all records].
+
+            filter_params (list): list of parameter objects that will be used to filter the database records.
+
+            filter_rules (tuple): tuple or list of tuples containing where clause and value tuple for a given filter
+                rule.
+
+            import_rules (dict): use custom import rules to find the records in the database.
+
+            database (str): summarize records in the provided database.
+
+        Returns:
+            df (DataFrame): aggregated values, with one row for each group.
+        """
+        db = self._set_database(database)
+        compiled = self._compile_import_rules(import_rules)
+        group_by = group_by if group_by else []
+
+        table_statement = compiled['Tables']
+        filters = self._prepare_import_filters(filter_params=filter_params, filter_rules=filter_rules,
+                                               import_rules=import_rules)
+        try:
+            where_clause, params = mod_db.construct_where_clause(filters)
+        except mod_db.SQLStatementError as e:
+            msg = 'failed to generate the aggregation statement - {}'.format(e)
+            logger.error('RecordGroup {NAME}: {MSG}'.format(NAME=self.name, MSG=msg))
+
+            raise
+
+        group_columns = {}
+        for column in group_by:
+            dbcol = compiled['ColumnMap'].get(column, None)
+            if not dbcol:
+                msg = 'group column {COL} is not an import column'.format(COL=column)
+                logger.error('RecordGroup {NAME}: {MSG}'.format(NAME=self.name, MSG=msg))
+
+                raise KeyError(msg)
+
+            group_columns[column] = dbcol
+
+        agg_columns = {}
+        for alias in aggregates:
+            func, column = aggregates[alias]
+            dbcol = compiled['ColumnMap'].get(column, None)
+            if not dbcol:
+                msg = 'aggregate column {COL} is not an import column'.format(COL=column)
+                logger.error('RecordGroup {NAME}: {MSG}'.format(NAME=self.name, MSG=msg))
+
+                raise KeyError(msg)
+
+            agg_columns[alias] = (func, dbcol)
+
+        summary_df = user.aggregate_db(table_statement, agg_columns, group_by=group_columns, where=where_clause,
+                                       params=params, database=db)
+
+        return summary_df
+
+    def count_records(self, filter_params=None, filter_rules=None, import_rules: dict = None, database: str = None):
+        """
+        Count the entry records in the database that match the import filters, without importing the records.
+
+        Arguments:
+            filter_params (list): list of parameter objects that will be used to filter the database records.
+
+            filter_rules (tuple): tuple or list of tuples containing where clause and value tuple for a given filter
+                rule.
+
+            import_rules (dict): use custom import rules to find the records in the database.
+
+            database (str): count records in the provided database.
+
+        Returns:
+            nrecord (int): number of matching records.
+        """
+        summary_df = self.aggregate_records({'NRecords': ('count', self.id_column)}, filter_params=filter_params,
+                                            filter_rules=filter_rules, import_rules=import_rules, database=database)
+
+        try:
+            nrecord = int(summary_df['NRecords'].iloc[0])
+        except (KeyError, IndexError, TypeError, ValueError):
+            nrecord = 0
+
+        return nrecord
+
     def import_references(self, ids, rule: str = None, filter_rules: list = None, is_reference: bool = False,
                           include_deleted: bool = False):
         """
@@ -587,12 +820,12 @@ class RecordGroup:
                            'DocType AS RecordType',
                            'RefType AS ReferenceType', 'Notes AS ReferenceNotes', 'Warnings AS ReferenceWarnings',
                            'IsChild', 'IsHardLink', 'IsApproved']
-                filter_str = 'DocNo IN ({VALS})' if is_reference is False else 'RefNo IN ({VALS})'
+                filter_col = 'DocNo' if is_reference is False else 'RefNo'
             else:  # input records are the reference record ID
                 columns = ['DocNo AS ReferenceID', 'RefNo AS RecordID', 'RefDate AS ReferenceDate',
                            'DocType AS ReferenceType', 'RefType AS RecordType', 'Notes AS ReferenceNotes',
                            'Warnings AS ReferenceWarnings', 'IsChild', 'IsHardLink', 'IsApproved']
-                filter_str = 'RefNo IN ({VALS})' if is_reference is False else 'DocNo IN ({VALS})'
+                filter_col = 'RefNo' if is_reference is False else 'DocNo'
 
             # Import reference entries related to record_id
             df = pd.DataFrame(columns=['RecordID', 'ReferenceID', 'ReferenceDate', 'RecordType', 'ReferenceType',
@@ -600,14 +833,12 @@ class RecordGroup:
                                        'IsDeleted'])
             for i in range(0, len(id_list), 1000):  # split into sets of 1000 to prevent max parameter errors in SQL
                 sub_ids = id_list[i: i + 1000]
-                sub_vals = ','.join(['?' for _ in sub_ids])
-
-                filters = [i for i in filter_set] + [(filter_str.format(VALS=sub_vals), tuple(sub_ids))]
+                filters = [i for i in filter_set] + [mod_db.format_in_clause(filter_col, sub_ids)]
                 if not include_deleted:
                     filters.append(('IsDeleted = ?', 0))
 
                 import_df = user.read_db(*mod_db.prepare_sql_query(reference_table, columns=columns,
-                                                                   filter_rules=filters), prog_db=True)
+                                                                   filter_rules=filters), prog_db=True, use_cache=True)
                 df = df.append(import_df, ignore_index=True)
 
             # Set column data types
@@ -627,7 +858,8 @@ class RecordGroup:
         Load entry records that do not have a record reference for the given association rule.
         """
         association_rules = self.association_rules
-        import_rules = self.import_rules
+        import_rules = dict(self.import_rules)  # the reference table join only applies to this query
+        compiled = self._import_query
         db = self._set_database(database)
 
         try:
@@ -647,10 +879,9 @@ class RecordGroup:
             import_col_map = {'RecordID': 'RefNo', 'ReferenceID': 'DocNo', 'Deleted': 'IsDeleted'}
 
         # Import reference entries related to record_id
-        db_id_col = mod_db.get_import_column(import_rules, 'RecordID')
-        #columns = mod_db.format_import_columns(import_rules)
-        columns = self._format_import_columns(import_rules)
-        filters = mod_db.format_import_filters(import_rules)
+        db_id_col = compiled['ColumnMap'].get('RecordID', None)
+        columns = self._format_import_columns()
+        filters = list(compiled['Filters'])
         # filters.append(('{TBL}.{COL} = ?'.format(TBL=reference_table, COL=import_col_map['Deleted']), 0))
         filters_clause = '{TBL}.{COL} IS NULL'.format(TBL=reference_table, COL=import_col_map['ReferenceID'])
         filters.append(filters_clause)
@@ -700,8 +931,8 @@ class RecordGroup:
         # Add configured import filters
         if table is None:
             db = settings.prog_db
-            table_statement = mod_db.format_tables(self.import_rules)
-            id_col = mod_db.get_import_column(self.import_rules, id_field)
+            table_statement = self._import_query['Tables']
+            id_col = self._import_query['ColumnMap'].get(id_field, None)
             if not id_col:
                 id_col = id_field
         else:
@@ -709,37 +940,27 @@ class RecordGroup:
             table_statement = table
             id_col = id_field
 
-        # Query existing database entries
-        import_df = pd.DataFrame()
-        for i in range(0, len(record_ids), 1000):  # split into sets of 1000 to prevent max parameter errors in SQL
+        # Query the database for the record IDs that exist, in sets of 1000 to prevent max parameter errors in SQL
+        queries = []
+        for i in range(0, len(record_ids), 1000):
             sub_ids = record_ids[i: i + 1000]
-            filter_clause = '{COL} IN ({VALS})'.format(COL=id_col, VALS=','.join(['?' for _ in sub_ids]))
-            filters = (filter_clause, tuple(sub_ids))
+            filters = mod_db.format_in_clause(id_col, sub_ids)
+            queries.append(mod_db.prepare_sql_query(table_statement, columns=id_col, filter_rules=filters,
+                                                    distinct=True))
 
-            if import_df.empty:
-                import_df = user.read_db(*mod_db.prepare_sql_query(table_statement, columns=id_col,
-                                                                   filter_rules=filters),
-                                         database=db)
-            else:
-                import_df = import_df.append(user.read_db(*mod_db.prepare_sql_query(table_statement, columns=id_col,
-                                                                                    filter_rules=filters),
-                                                          database=db),
-                                             ignore_index=True)
+        loaded = user.read_db_many(queries, database=db)
 
+        import_ids = set()
         try:
-            import_ids = import_df.iloc[:, 0].values.tolist()
+            for loaded_df in loaded:
+                import_ids.update(loaded_df.iloc[:, 0])
         except IndexError as e:
             msg = 'failed to verify whether records {IDS} of type "{TYPE}" have been previously saved to the ' \
                   'database - {ERR}'.format(IDS=record_ids, TYPE=self.name, ERR=e)
             logger.error(msg)
             raise
 
-        records_saved = pd.Series(index=record_ids, dtype='bool')
-        for record_id in record_ids:
-            if record_id in import_ids:
-                records_saved[record_id] = True
-            else:
-                records_saved[record_id] = False
+        records_saved = pd.Series(pd.Index(record_ids).isin(import_ids), index=record_ids, dtype='bool')
 
         if isinstance(id_list, str):
             return records_saved[id_list]
@@ -756,13 +977,13 @@ class RecordGroup:
             rule_name (str): name of the association rule that indicates which database table to save the reference
                 entries to.
 
-            statements (dict): optional dictionary of transactions statements to append to.
+            statements (StatementBatch): optional batch of transactions statements to append to.
 
         Returns:
-            statements (dict): dictionary of transactions statements.
+            statements (StatementBatch): batch of transactions statements.
         """
         if statements is None:
-            statements = {}
+            statements = mod_db.StatementBatch()
 
         if isinstance(ref_data, pd.DataFrame):
             df = ref_data
@@ -809,10 +1030,9 @@ class RecordGroup:
 
         # Prepare the upsert statement
         export_columns = export_df.columns.tolist()
-        export_values = [tuple(i) for i in export_df.values.tolist()]
-
-        statements = mod_db.prepare_sql_upsert(reference_table, export_columns, export_values, ['DocNo', 'RefNo'],
-                                               statements=statements)
+        statements = mod_db.prepare_sql_upsert(reference_table, export_columns, export_df, ['DocNo', 'RefNo'],
+                                               statements=statements, multirow=True)
+        statements.require(reference_table)  # reference entries are written after the records they reference
 
         return statements
 
@@ -825,13 +1045,13 @@ class RecordGroup:
 
             rule_name (str): name of the association rule linking the relevant records.
 
-            statements (dict): optional dictionary of transactions statements to append to.
+            statements (StatementBatch): optional batch of transactions statements to append to.
 
         Returns:
-            statements (dict): dictionary of transactions statements.
+            statements (StatementBatch): batch of transactions statements.
         """
         if statements is None:
-            statements = {}
+            statements = mod_db.StatementBatch()
 
         if isinstance(ref_data, pd.DataFrame):
             df = ref_data
@@ -867,17 +1087,10 @@ class RecordGroup:
         df = df[(~df['RecordID'].isna()) & (~df['ReferenceID'].isna())]
         export_df = df[[i for i in export_col_map if i in df.columns]].rename(columns=export_col_map)
 
-        # Prepare the update statement
-        export_columns = [export_col_map['IsDeleted']]
-        export_values = [(1,) for _ in range(export_df.shape[0])]
-
-        filter_clause = '{COL} = ? AND {REFCOL} = ?'.format(COL=export_col_map['RecordID'],
-                                                            REFCOL=export_col_map['ReferenceID'])
-        filter_params = [(row[export_col_map['RecordID']], row[export_col_map['ReferenceID']]) for _, row in
-                         export_df.iterrows()]
-
-        statements = mod_db.prepare_sql_update(reference_table, export_columns, export_values, filter_clause,
-                                               filter_params, statements=statements)
+        # Prepare the update statements flagging the reference entries as deleted
+        key_columns = [export_col_map['RecordID'], export_col_map['ReferenceID']]
+        statements = mod_db.prepare_sql_keyed_update(reference_table, [export_col_map['IsDeleted']], (1,), key_columns,
+                                                     export_df[key_columns], statements=statements)
 
         return statements
 
@@ -891,7 +1104,7 @@ class RecordGroup:
 
             id_field (str): name of the column containing the record IDs.
 
-            statements (dict): optional dictionary of database transaction statements to append to.
+            statements (StatementBatch): optional batch of database transaction statements to append to.
 
             export_columns (bool): use import column mapping to transform column names to database names before
                 exporting [Default: True].
@@ -900,14 +1113,14 @@ class RecordGroup:
                 Required to prevent endless recursion.
 
         Returns:
-            statements (dict): dictionary of transactions statements.
+            statements (StatementBatch): batch of transactions statements.
         """
         # pd.set_option('display.max_columns', None)
         export_rules = self.export_rules
         association_rules = self.association_rules
 
         if not statements:
-            statements = {}
+            statements = mod_db.StatementBatch()
 
         if not self.program_record:
             msg = 'unable to modify database records for record group {NAME} - {NAME} is an external record group'\
@@ -970,7 +1183,6 @@ class RecordGroup:
                 current_df.loc[:, settings.edit_date] = save_time
 
                 export_columns = current_df.rename(columns=export_col_map).columns.tolist()
-                export_values = [tuple(i) for i in current_df.values.tolist()]
 
                 record_ids = current_df[id_field]
                 if not isinstance(record_ids, pd.Series):
@@ -979,7 +1191,7 @@ class RecordGroup:
                     record_ids = record_ids.values.tolist()
                 filter_params = [(i,) for i in record_ids]
                 filter_clause = '{COL} = ?'.format(COL=id_col)
-                statements = mod_db.prepare_sql_update(table, export_columns, export_values, filter_clause,
+                statements = mod_db.prepare_sql_update(table, export_columns, current_df, filter_clause,
                                                        filter_params, statements=statements)
 
             # Extract all new records from the table
@@ -996,8 +1208,8 @@ class RecordGroup:
                     new_df.loc[:, settings.creation_date] = save_time
 
                 export_columns = new_df.rename(columns=export_col_map).columns.tolist()
-                export_values = [tuple(i) for i in new_df.values.tolist()]
-                statements = mod_db.prepare_sql_insert(table, export_columns, export_values, statements=statements)
+                statements = mod_db.prepare_sql_insert(table, export_columns, new_df, statements=statements,
+                                                       multirow=True)
 
         # If relevant, create or edit hard-linked reference records for new database records
         new_df = df[df[id_field].isin(new_ids)].rename(columns={id_field: 'RecordID'})
@@ -1129,7 +1341,7 @@ class RecordGroup:
         Arguments:
             records (list): delete records with these record IDs from the database.
 
-            statements (dict): optional dictionary of database transaction statements to add to.
+            statements (StatementBatch): optional batch of database transaction statements to add to.
 
             id_field (str): name of the column containing the record IDs [Default: RecordID].
 
@@ -1137,12 +1349,12 @@ class RecordGroup:
                 Required to prevent endless recursion.
 
         Returns:
-            statements (dict): dictionary of transaction statements.
+            statements (StatementBatch): batch of transaction statements.
         """
         # pd.set_option('display.max_columns', None)
 
         if not statements:
-            statements = {}
+            statements = mod_db.StatementBatch()
 
         if not self.program_record:
             msg = 'unable to modify database records for record group {NAME} - {NAME} is an external record group'\
@@ -1167,11 +1379,9 @@ class RecordGroup:
         # Check existence of the records in the database
         exists = self.confirm_saved(records, id_field=id_field)
 
-        record_ids = []
-        for record_id in records:
-            record_exists = exists[record_id]
-            if record_exists:  # only attempt to delete records that already exist in the database
-                record_ids.append(record_id)
+        # Only attempt to delete records that already exist in the database
+        existing_ids = set(exists[exists].index)
+        record_ids = [i for i in records if i in existing_ids]
 
         if len(record_ids) < 1:  # no currently existing records to delete
             return statements
@@ -1189,14 +1399,11 @@ class RecordGroup:
             delete_col = export_col_map['Deleted']
 
             export_columns = [delete_col, settings.editor_code, settings.edit_date]
-            export_values = [(1, user.uid, datetime.datetime.now().strftime(settings.date_format)) for _ in record_ids]
-
-            filter_params = [(i,) for i in record_ids]
-            filter_clause = '{COL} = ?'.format(COL=id_col)
+            export_values = (1, user.uid, datetime.datetime.now().strftime(settings.date_format))
 
             # Remove records from the export table
-            statements = mod_db.prepare_sql_update(export_table, export_columns, export_values, filter_clause,
-                                                   filter_params, statements=statements)
+            statements = mod_db.prepare_sql_keyed_update(export_table, export_columns, export_values, id_col,
+                                                         record_ids, statements=statements)
 
         # Remove record associations and potentially delete associated records if associated records are child records
         # or hard-linked to the deleted records
@@ -1257,8 +1464,8 @@ class RecordGroup:
         Get a list of saved record IDs for records with record date within the provided range of dates.
         """
         # Prepare query parameters
-        table_statement = mod_db.format_tables(self.import_rules)
-        id_col = mod_db.get_import_column(self.import_rules, id_field)
+        table_statement = self._import_query['Tables']
+        id_col = self._import_query['ColumnMap'].get(id_field, None)
 
         # Prepare the date range
         sorted_dates = sorted(record_dates)
@@ -2540,17 +2747,17 @@ class DatabaseRecord:
         Prepare statements for deleting the record and child records from the database.
 
         Arguments:
-            statements (dict): optional dictionary of transaction statements to add the delete statements to.
+            statements (StatementBatch): optional batch of transaction statements to add the delete statements to.
 
         Returns:
-            statements (dict): dictionary of transaction statements.
+            statements (StatementBatch): batch of transaction statements.
         """
         record_id = self.record_id()
         record_entry = settings.records.fetch_rule(self.name)
         association_rules = record_entry.association_rules
 
         if not statements:
-            statements = {}
+            statements = mod_db.StatementBatch()
 
         nchild = 0
         nlink = 0
@@ -2601,7 +2808,7 @@ class DatabaseRecord:
         Delete the record and child records from the database.
 
         Arguments:
-            statements (dict): optional dictionary of transaction statement dictionary to add to.
+            statements (StatementBatch): optional batch of transaction statements to add to.
 
         Returns:
             success (bool): record delete was successful.
@@ -2626,13 +2833,7 @@ class DatabaseRecord:
 
         # Write record to the database
         logger.info('preparing to delete record {ID} and any child records'.format(ID=record_id))
-        sstrings = []
-        psets = []
-        for i, j in statements.items():
-            sstrings.append(i)
-            psets.append(j)
-
-        success = user.write_db(sstrings, psets)
+        success = mod_db.write_statements(statements)
         # success = True
         print(statements)
 
@@ -2643,16 +2844,16 @@ class DatabaseRecord:
         Prepare to the statements for saving the record to the database.
 
         Arguments:
-            statements (dict): optional dictionary of transaction statement dictionary to add to.
+            statements (StatementBatch): optional batch of transaction statements to add to.
 
             save_all (bool): save all record element values, regardless of whether they were edited or not
                 [Default: False]
 
         Returns:
-            statements (dict): dictionary of transaction statements.
+            statements (StatementBatch): batch of transaction statements.
         """
         if not statements:
-            statements = {}
+            statements = mod_db.StatementBatch()
 
         record_id = self.record_id()
         record_entry = settings.records.fetch_rule(self.name)
@@ -2778,7 +2979,7 @@ class DatabaseRecord:
         Save the record and child records to the database.
 
         Arguments:
-            statements (dict): optional dictionary of transaction statement dictionary to add to.
+            statements (StatementBatch): optional batch of transaction statements to add to.
 
             save_all (bool): save all record element values, regardless of whether they were edited or not
                 [Default: False]
@@ -2804,13 +3005,7 @@ class DatabaseRecord:
 
         logger.info('RecordType {NAME}: Record {ID}: preparing to save record and record components'
                     ''.format(NAME=self.name, ID=record_id))
-        sstrings = []
-        psets = []
-        for i, j in statements.items():
-            sstrings.append(i)
-            psets.append(j)
-
-        success = user.write_db(sstrings, psets)
+        success = mod_db.write_statements(statements)
         #success = True
         print('final save statements:')
         print(statements)
@@ -15,10 +15,11 @@ import pandas as pd
 import REM.constants as mod_const
 import REM.data_manipulation as mod_dm
 import REM.data_collections as mod_col
+import REM.database as mod_db
 import REM.layouts as mod_lo
 import REM.parameters as mod_param
 import REM.records as mod_records
-from REM.client import logger, settings, user
+from REM.client import logger, settings, tracer, user
 from REM.main import __version__
 
 
@@ -243,7 +244,11 @@ def debug_window():
     debug_layout = [[sg.Text('Log level:', pad=((pad_frame, pad_el), (pad_frame, pad_v)), font=bold_font,
                              background_color=bg_col),
                      sg.Combo(log_levels, key='-LEVEL-', default_value=settings.log_level, enable_events=True,
-                              background_color=bg_col, pad=((0, pad_frame), (pad_frame, pad_v)), font=font)],
+                              background_color=bg_col, pad=((0, pad_el), (pad_frame, pad_v)), font=font),
+                     sg.Checkbox('Trace requests', key='-TRACE-', default=tracer.enabled, enable_events=True,
+                                 pad=((0, pad_el), (pad_frame, pad_v)), font=font, background_color=bg_col),
+                     sg.Button('Show Traces', key='-TRACES-', pad=((0, pad_frame), (pad_frame, pad_v)), font=font,
+                               tooltip='Display the most recent server request traces')],
                     [sg.Output(size=(40, 10), key='-OUTPUT-', pad=(pad_frame, 0), background_color=bg_col,
                                echo_stdout_stderr=True)]]
 
@@ -1026,19 +1031,15 @@ def database_importer_window(win_size: tuple = None):
 
                 return False
 
-            sstrings = []
-            psets = []
-            for i, j in statements.items():
-                sstrings.append(i)
-                psets.append(j)
-
-            success = user.write_db(sstrings, psets)
+            # Commit the import in a single transaction, so that a failure leaves none of the records or their
+            # references saved
+            success = mod_db.write_statements(statements)
 
             nrecord = export_df.shape[0]
             if success:
                 msg = 'successfully saved {NROW} rows to the database'.format(NROW=nrecord)
             else:
-                msg = 'failed to save {NROW} rows to the database'.format(NROW=nrecord)
+                msg = 'failed to save the {NROW} rows to the database - no rows were saved'.format(NROW=nrecord)
 
             popup_notice(msg)
             logger.info(msg)
@@ -1795,6 +1796,7 @@ def record_import_window(table, enable_new: bool = False):
     header_col = mod_const.HEADER_COLOR
 
     header_font = mod_const.HEADING_FONT
+    main_font = mod_const.MAIN_FONT
 
     pad_el = mod_const.ELEM_PAD
     pad_frame = mod_const.FRAME_PAD
@@ -1808,7 +1810,9 @@ def record_import_window(table, enable_new: bool = False):
     title_h = mod_const.TITLE_HEIGHT
     title = 'Import {TYPE} records'.format(TYPE=table.description)
     title_layout = [[sg.Canvas(size=(0, title_h), background_color=header_col),
-                     sg.Text(title, pad=(pad_frame, 0), background_color=header_col, font=header_font)]]
+                     sg.Text(title, pad=(pad_frame, 0), background_color=header_col, font=header_font),
+                     sg.Text('', key='-COUNT-', pad=(pad_frame, 0), background_color=header_col, font=main_font,
+                             tooltip='Number of records matching the import parameters')]]
 
     # Control buttons
     bttn_h = mod_const.BTTN_ROW_HEIGHT
@@ -1872,6 +1876,9 @@ def record_import_window(table, enable_new: bool = False):
 
     # Main loop
     elem_key = table.key_lookup('Element')
+    import_cursor = None  # cursor of the next page of records to import, if any remain
+    page_event = '-IMPORT_PAGE-'
+    page_future = None  # page of records currently being imported in the background
     while True:
         event, values = window.read(timeout=500)
 
@@ -1888,6 +1895,31 @@ def record_import_window(table, enable_new: bool = False):
             table.resize(window, size=(tbl_w, tbl_h))
             current_w, current_h = (win_w, win_h)
 
+        # Load the remaining pages of import records in the background while the window is idle
+        if event == sg.TIMEOUT_KEY and import_cursor is not None and page_future is None:
+            page_future = record_entry.import_record_page_async(window, page_event, filter_params=table.parameters,
+                                                                import_rules=import_rules, after=import_cursor)
+
+            continue
+
+        if event == page_event:
+            future = values[page_event]
+            if future is not page_future:  # page belongs to a previous import that has since been reloaded
+                continue
+
+            page_future = None
+            try:
+                import_df, import_cursor = future.result()
+            except Exception as e:
+                msg = 'failed to import the remaining records - {ERR}'.format(ERR=e)
+                logger.error(msg)
+                import_cursor = None
+            else:
+                table.append(import_df)
+                table.update_display(window)
+
+            continue
+
         if enable_new and event == '-NEW-':  # selected to create a new record
             if table.record_type is None:
                 msg = 'failed to create a new record - missing required configuration parameter "RecordType"'
@@ -1924,7 +1956,10 @@ def record_import_window(table, enable_new: bool = False):
 
                 # Reload the display records
                 if record:
-                    import_df = record_entry.import_records(filter_params=table.parameters, import_rules=import_rules)
+                    import_df, import_cursor = record_entry.import_record_page(filter_params=table.parameters,
+                                                                              import_rules=import_rules)
+                    page_future = None
+                    update_import_count(window, record_entry, table.parameters, import_rules)
 
                     table.reset(window, reset_filters=False, collapse=False)
                     table.append(import_df)
@@ -1975,9 +2010,12 @@ def record_import_window(table, enable_new: bool = False):
             if reload:  # should reload the import records
                 table.reset(window, reset_filters=False, collapse=False)
 
-                import_df = record_entry.import_records(filter_params=table.parameters, import_rules=import_rules)
+                import_df, import_cursor = record_entry.import_record_page(filter_params=table.parameters,
+                                                                          import_rules=import_rules)
+                page_future = None
                 table.append(import_df)
                 table.update_display(window)
+                update_import_count(window, record_entry, table.parameters, import_rules)
 
     window.close()
     layout = None
@@ -1985,6 +2023,23 @@ def record_import_window(table, enable_new: bool = False):
     gc.collect()
 
 
+def update_import_count(window, record_entry, params, import_rules: dict = None):
+    """
+    Display the number of database records matching the import parameters. Records are imported a page at a time, so
+    the count is taken on the database server instead of from the imported records.
+    """
+    try:
+        nrecord = record_entry.count_records(filter_params=params, import_rules=import_rules)
+    except Exception as e:
+        logger.warning('failed to count the {TYPE} records matching the import parameters - {ERR}'
+                       .format(TYPE=record_entry.name, ERR=e))
+        count = ''
+    else:
+        count = '({N:,} matching records)'.format(N=nrecord)
+
+    window['-COUNT-'].update(value=count)
+
+
 def import_window(table, params: list = None):
     """
     Display the importer window.
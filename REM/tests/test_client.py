@@ -0,0 +1,146 @@
+"""
+Tests of the server connection and the account manager requests.
+"""
+import concurrent.futures
+import threading
+import time
+import types
+
+import pandas as pd
+import pytest
+
+import REM.client as mod_client
+
+WRITE_REQUEST = {'content': {'action': 'db_transact', 'value': {'transaction_type': 'write'}}, 'encoding': 'utf-8'}
+READ_REQUEST = {'content': {'action': 'db_transact', 'value': {'transaction_type': 'read'}}, 'encoding': 'utf-8'}
+
+
+def lost_connection_conn(monkeypatch, sent, failure):
+    """
+    Server connection whose first request fails with a lost connection after all or part of the request was sent.
+    """
+    conn = mod_client.ServerConnection(object(), ('localhost', 0))
+    conn.sent_requests = []
+
+    def transact(request, timeout: int = 60):
+        conn.sent_requests.append(request)
+        if len(conn.sent_requests) > 1:
+            return {'success': True, 'value': None}
+
+        conn._connection_lost = True
+        conn._request_sent = sent
+
+        return dict(failure)
+
+    def reset_connection(timeout: int = None):
+        conn._connection_lost = False
+
+    monkeypatch.setattr(conn, '_transact', transact)
+    monkeypatch.setattr(conn, '_reset_connection', reset_connection)
+    monkeypatch.setattr(conn, '_peer_closed', lambda: False)
+
+    return conn
+
+
+@pytest.mark.parametrize('request_, sent, nsent', [(WRITE_REQUEST, False, 2), (WRITE_REQUEST, True, 1),
+                                                   (READ_REQUEST, True, 2)])
+def test_replay_after_lost_connection(monkeypatch, request_, sent, nsent):
+    failure = {'success': False, 'value': 'server request failed after 0.1 seconds - connection reset'}
+    conn = lost_connection_conn(monkeypatch, sent, failure)
+
+    result = conn._transact_with_retry(request_)
+
+    assert len(conn.sent_requests) == nsent
+    assert result['success'] is (nsent == 2)
+
+
+def test_no_replay_after_timeout(monkeypatch):
+    failure = {'success': False, 'value': 'server failed to respond to request after 60 seconds', 'timed_out': True}
+    conn = lost_connection_conn(monkeypatch, True, failure)
+
+    result = conn._transact_with_retry(READ_REQUEST)
+
+    assert len(conn.sent_requests) == 1
+    assert result['timed_out'] is True
+
+
+class FakeConnection:
+    """
+    Server connection stand-in that holds read requests until they are answered by the test.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.nwaiting = 0
+        self._lock = threading.Lock()
+
+    def submit(self, request, timeout: int = 60, handler=None, window=None, event: str = None):
+        future = concurrent.futures.Future()
+        self.requests.append((future, handler))
+
+        return future
+
+    def wait(self, future):
+        with self._lock:
+            self.nwaiting += 1
+
+        return future.result(timeout=5)
+
+    def answer(self, df):
+        for future, handler in self.requests:
+            future.set_result(handler({'success': True, 'value': df.to_dict()}))
+
+
+class FakeAccountManager(mod_client.AccountManager):
+    """
+    Account manager with a fixed login.
+    """
+
+    def _prepare_conn_str(self, database: str = None):
+        return {'UID': 'test', 'PWD': None, 'Database': database}
+
+
+@pytest.fixture
+def fake_conn(monkeypatch):
+    test_settings = types.SimpleNamespace(prog_db='REM', dbname='REM', alt_dbs=['REM'], cache_size=1, cache_ttl=300)
+    monkeypatch.setattr(mod_client, 'settings', test_settings)
+
+    conn = FakeConnection()
+    monkeypatch.setattr(mod_client, 'server_conn', conn)
+
+    return conn
+
+
+def test_concurrent_identical_reads_share_a_request(fake_conn):
+    user = FakeAccountManager()
+    statement, params = 'SELECT * FROM Records WHERE RecordID IN (?,?)', ('R1', 'R2')
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(user.read_db, statement, params) for _ in range(2)]
+
+        # Answer the request once both readers are waiting on it
+        start = time.time()
+        while fake_conn.nwaiting < 2 and time.time() - start < 5:
+            time.sleep(0.01)
+        fake_conn.answer(pd.DataFrame({'RecordID': ['R1', 'R2']}))
+
+        results = [i.result(timeout=5) for i in futures]
+
+    assert len(fake_conn.requests) == 1
+    assert all([i['RecordID'].tolist() == ['R1', 'R2'] for i in results])
+    assert results[0] is not results[1]
+
+    # Results are not cached without use_cache
+    assert user.cache.get(statement, params, 'REM') is None
+
+
+def test_unshared_reads_send_separate_requests(fake_conn):
+    user = FakeAccountManager()
+    statement, params = 'SELECT * FROM Records WHERE RecordID = ?', ('R1',)
+
+    for _ in range(2):
+        user.read_db_async(statement, params, share=False)
+    user.read_db_async(statement, params)
+    user.read_db_async(statement, params)
+
+    assert len(fake_conn.requests) == 3
@@ -0,0 +1,162 @@
+"""
+Tests of the database statement preparation functions.
+"""
+import pytest
+
+import REM.database as mod_db
+
+
+def test_statement_batch_order_follows_added_statements():
+    batch = mod_db.StatementBatch()
+    batch.add('UPDATE Refs', [(1,)], table='Refs')
+    batch.add('INSERT Records', [(2,)], table='Records')
+
+    assert batch.ordered() == ['UPDATE Refs', 'INSERT Records']
+
+    # Requiring the table changes the cached order
+    batch.require('Refs')
+    assert batch.ordered() == ['INSERT Records', 'UPDATE Refs']
+
+    # New statements and tables change the cached order
+    batch.add('UPDATE Notes', [(3,)])
+    assert batch.ordered() == ['INSERT Records', 'UPDATE Refs', 'UPDATE Notes']
+
+    batch.add('INSERT Records', [(4,)], table='Refs')
+    assert batch.ordered() == ['UPDATE Refs', 'INSERT Records', 'UPDATE Notes']
+
+    # Callers can't change the cached order
+    batch.ordered().reverse()
+    assert list(batch) == ['UPDATE Refs', 'INSERT Records', 'UPDATE Notes']
+
+
+def test_statement_batch_circular_dependency():
+    batch = mod_db.StatementBatch()
+    batch.add('INSERT A', [(1,)], table='A')
+    batch.add('INSERT B', [(2,)], table='B')
+    batch.require('A', ['B'])
+    batch.require('B', ['A'])
+
+    with pytest.raises(mod_db.SQLStatementError):
+        batch.ordered()
+
+
+def test_statement_batch_split():
+    batch = mod_db.StatementBatch()
+    batch.add('INSERT Refs', [(i,) for i in range(3)], table='Refs')
+    batch.add('INSERT Records', [(i,) for i in range(4)], table='Records')
+    batch.require('Refs', ['Records'])
+
+    batches = list(batch.split(max_rows=3))
+
+    assert [i.nrows() for i in batches] == [3, 3, 1]
+    assert [i.flatten() for i in batches] == [(['INSERT Records'], [[(0,), (1,), (2,)]]),
+                                              (['INSERT Records', 'INSERT Refs'], [[(3,)], [(0,), (1,)]]),
+                                              (['INSERT Refs'], [[(2,)]])]
+
+    # A single parameter set larger than the size limit gets a sub-batch of its own
+    batches = list(batch.split(max_bytes=1))
+    assert len(batches) == batch.nrows() == 7
+
+
+def test_statement_batch_counts_rows_of_multirow_statements():
+    batch = mod_db.prepare_sql_insert('Records', ['ID'], [(i,) for i in range(2500)], multirow=True)
+    mod_db.prepare_sql_delete('Refs', ['ID'], [(i,) for i in range(600)], statements=batch, multirow=True)
+
+    assert batch.nrows() == 3100
+
+    # Each sub-batch is bounded by the rows written, and a statement over the limit gets a sub-batch of its own
+    assert [i.nrows() for i in batch.split(max_rows=1200)] == [1000, 1000, 1100]
+    assert [i.nrows() for i in batch.split(max_rows=700)] == [1000, 1000, 500, 600]
+    assert [i.nrows() for i in batch.split(max_rows=2000)] == [2000, 1100]
+
+
+def test_statement_batch_ignores_repeated_parameters():
+    batch = mod_db.StatementBatch({'DELETE Records': [(1,), (2,)]})
+    batch.add('DELETE Records', [(2,), (3,), (1,)])
+
+    assert batch['DELETE Records'] == [(1,), (2,), (3,)]
+    assert batch.nrows() == 3
+
+
+@pytest.mark.parametrize('nvalue, size', [(1, 1), (3, 4), (8, 8), (9, 16), (600, 1000), (1000, 1000), (1200, 1200)])
+def test_pad_in_list(nvalue, size):
+    values = list(range(nvalue))
+    padded = mod_db.pad_in_list(values)
+
+    assert len(padded) == size
+    assert padded[:nvalue] == values
+    assert set(padded[nvalue:]).issubset({nvalue - 1})
+
+
+def test_pad_in_list_empty():
+    assert mod_db.pad_in_list([]) == []
+
+
+def test_format_in_clause_shares_statements_of_a_bucket():
+    statement, params = mod_db.format_in_clause('RecordID', ['A', 'B', 'C'], operator='NOT IN')
+
+    assert statement == 'RecordID NOT IN (?,?,?,?)'
+    assert params == ('A', 'B', 'C', 'C')
+    assert mod_db.format_in_clause('RecordID', ['D', 'E', 'F', 'G'])[0] == 'RecordID IN (?,?,?,?)'
+
+
+def test_multirow_insert_chunking():
+    # Three columns fit 699 rows within the 2100 parameter limit
+    values = [(i, 'R{}'.format(i), i * 2) for i in range(1500)] + [(0, 'R0', 0)]
+    batch = mod_db.prepare_sql_insert('Records', ['ID', 'Name', 'Amount'], values, multirow=True)
+
+    # Full statements share the statement text
+    statements, params = batch.flatten()
+    nrows = [statement.count('(?,?,?)') for statement in statements]
+
+    assert nrows == [699, 102]
+    assert [len(i) for i in params] == [2, 1]
+    assert all([len(j) == 3 * nrow < mod_db.MAX_STATEMENT_PARAMS for i, nrow in zip(params, nrows) for j in i])
+    assert list(params[0][0][:6]) == [0, 'R0', 0, 1, 'R1', 2]
+
+
+def test_multirow_insert_row_limit():
+    batch = mod_db.prepare_sql_insert('Records', ['ID'], [(i,) for i in range(2500)], multirow=True)
+
+    statements, params = batch.flatten()
+
+    assert [i.count('(?)') for i in statements] == [1000, 500]
+    assert [len(i) for i in params] == [2, 1]
+
+
+def test_multirow_upsert_keeps_last_entry_values():
+    values = [(i, 'R{}'.format(i)) for i in range(1500)] + [(5, 'updated')]
+    batch = mod_db.prepare_sql_upsert('Records', ['ID', 'Name'], values, on='ID', multirow=True)
+
+    statements, params = batch.flatten()
+    entries = [j for i in params for j in i[0]]
+
+    assert [i.count('(?,?)') for i in statements] == [1000, 500]
+    assert len(entries) == 3000
+    assert entries[10:12] == [5, 'updated']
+
+
+def test_multirow_upsert_requires_match_columns():
+    with pytest.raises(mod_db.SQLStatementError):
+        mod_db.prepare_sql_upsert('Records', ['Name'], [('A',)], on='ID', multirow=True)
+
+
+def test_prepare_key_sets_single_column():
+    keys = [(i,) for i in range(1500)] + [(0,)]
+    key_sets = mod_db._prepare_key_sets('Records', ['ID'], keys)
+
+    assert [len(params) for clause, params in key_sets] == [1000, 512]
+    assert key_sets[0][0] == 'ID IN ({})'.format(','.join(['?'] * 1000))
+    assert key_sets[1][1][:500] == tuple(range(1000, 1500))
+    assert set(key_sets[1][1][500:]) == {1499}
+
+
+def test_prepare_key_sets_multiple_columns():
+    keys = [(i, 'R{}'.format(i)) for i in range(300)]
+    key_sets = mod_db._prepare_key_sets('Records', ['ID', 'Name'], keys, nfixed=1200)
+
+    # (2100 - 1 - 1200) // 2 = 449 keys fit in a statement, rounded down to the bucket of 256
+    assert [len(params) for clause, params in key_sets] == [512, 128]
+    assert key_sets[0][0] == 'FROM Records AS Target INNER JOIN (VALUES {}) AS Source (ID,Name) ON ' \
+                             'Target.ID=Source.ID AND Target.Name=Source.Name'.format(','.join(['(?,?)'] * 256))
+    assert key_sets[1][1][-2:] == (299, 'R299')
@@ -0,0 +1,190 @@
+"""
+Tests of record group database imports.
+"""
+import concurrent.futures
+import time
+import types
+
+import pandas as pd
+import pytest
+
+import REM.client as mod_client
+import REM.records as mod_records
+
+TABLE = 'TestRecords'
+COLUMNS = ['RecordID', 'Amount']
+
+
+class FakeConnection:
+    """
+    Server connection stand-in that answers read requests from an in-memory table. Responses are completed in the
+    reverse of the order the requests were sent in, once the first response is waited on.
+    """
+
+    def __init__(self, records):
+        self.records = records
+        self.pending = []
+        self.nrequest = 0
+
+    def submit(self, request, timeout: int = 60, handler=None, window=None, event: str = None):
+        future = concurrent.futures.Future()
+        self.pending.append((future, request, handler))
+        self.nrequest += 1
+
+        return future
+
+    def wait(self, future):
+        while self.pending:
+            pending_future, request, handler = self.pending.pop()
+            params = request['content']['value']['parameters']
+            df = self.records[self.records['RecordID'].isin(params)].sort_values('RecordID')
+            pending_future.set_result(handler({'success': True, 'value': df.to_dict()}))
+
+        return future.result()
+
+
+class SlowConnection:
+    """
+    Server connection stand-in that answers read requests one at a time, each after a fixed delay.
+    """
+
+    def __init__(self, records, latency):
+        self.records = records
+        self.latency = latency
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+    def submit(self, request, timeout: int = 60, handler=None, window=None, event: str = None):
+        return self._executor.submit(self._respond, request, handler)
+
+    def wait(self, future):
+        return future.result()
+
+    def close(self):
+        self._executor.shutdown()
+
+    def _respond(self, request, handler):
+        time.sleep(self.latency)
+
+        params = request['content']['value']['parameters']
+        df = self.records[self.records['RecordID'].isin(params)].sort_values('RecordID')
+
+        return handler({'success': True, 'value': df.to_dict()})
+
+
+class FakeAccountManager(mod_client.AccountManager):
+    """
+    Account manager that sends read requests over fake server connections.
+    """
+
+    def __init__(self, records, latency: float = None):
+        super().__init__()
+
+        self.uid = 'test'
+        if latency is None:
+            self.conns = [FakeConnection(records) for _ in range(4)]
+        else:
+            self.conns = [SlowConnection(records, latency) for _ in range(4)]
+
+    def _prepare_conn_str(self, database: str = None):
+        return {'UID': self.uid, 'PWD': None, 'Database': database}
+
+    def _read_connections(self, nconn):
+        # All fake connections share the pending responses of the first, so responses complete across connections
+        for conn in self.conns[1:nconn]:
+            if isinstance(conn, FakeConnection):
+                conn.pending = self.conns[0].pending
+
+        return self.conns[:nconn]
+
+    def table_schema(self, database, table, timeout: int = 5):
+        return {i: ('varchar', None) for i in COLUMNS}
+
+
+@pytest.fixture
+def record_group(monkeypatch):
+    test_settings = types.SimpleNamespace(prog_db='REM', dbname='REM', alt_dbs=['REM'], cache_size=1, cache_ttl=300,
+                                          parallel_reads=4)
+    monkeypatch.setattr(mod_client, 'settings', test_settings)
+    monkeypatch.setattr(mod_records, 'settings', test_settings)
+
+    entry = {'IDCode': 'TR', 'ProgramRecord': 1, 'RecordLayout': {},
+             'ImportRules': {TABLE: {'Columns': {i: i for i in COLUMNS}}}}
+
+    return mod_records.RecordGroup('TestRecord', entry)
+
+
+def test_load_records_merges_id_sets_in_order(record_group, monkeypatch):
+    records = pd.DataFrame({'RecordID': ['TR{:05d}'.format(i) for i in range(3000)],
+                            'Amount': [float(i) for i in range(3000)]})
+    fake_user = FakeAccountManager(records)
+    monkeypatch.setattr(mod_records, 'user', fake_user)
+
+    # Request records in sets spread over several connections, including IDs that are not in the table
+    record_ids = ['TR{:05d}'.format(i) for i in range(2999, -1, -2)] + ['TR99999', 'TR00001']
+    loaded_df = record_group.load_records(record_ids, parallel=3)
+
+    expected = records[records['RecordID'].isin(record_ids)].sort_values('RecordID').reset_index(drop=True)
+    assert sum([i.nrequest for i in fake_user.conns]) == 2
+    assert loaded_df['RecordID'].tolist() == expected['RecordID'].tolist()
+    assert loaded_df['Amount'].tolist() == expected['Amount'].tolist()
+    assert loaded_df.index.tolist() == list(range(expected.shape[0]))
+
+
+def test_load_records_without_ids(record_group, monkeypatch):
+    monkeypatch.setattr(mod_records, 'user', FakeAccountManager(pd.DataFrame(columns=COLUMNS)))
+
+    loaded_df = record_group.load_records([])
+
+    assert loaded_df.empty
+
+
+def test_load_records_reads_id_sets_concurrently(record_group, monkeypatch):
+    nset = 4
+    latency = 0.2
+    records = pd.DataFrame({'RecordID': ['TR{:05d}'.format(i) for i in range(nset * 1000)],
+                            'Amount': [float(i) for i in range(nset * 1000)]})
+    fake_user = FakeAccountManager(records, latency=latency)
+    monkeypatch.setattr(mod_records, 'user', fake_user)
+
+    record_ids = records['RecordID'].tolist()[::-1]
+    try:
+        start = time.perf_counter()
+        serial_df = record_group.load_records(record_ids, parallel=1)
+        serial_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        loaded_df = record_group.load_records(record_ids, parallel=nset)
+        load_time = time.perf_counter() - start
+    finally:
+        for conn in fake_user.conns:
+            conn.close()
+
+    # Reading the sets one at a time takes at least the latency of each set, while reading them concurrently takes
+    # little more than the latency of one set
+    assert serial_time >= nset * latency
+    assert load_time < nset * latency / 2
+    assert loaded_df.equals(serial_df)
+    assert loaded_df['RecordID'].tolist() == sorted(record_ids)
+
+
+def test_count_records_aggregates_on_the_server(record_group, monkeypatch):
+    fake_user = FakeAccountManager(pd.DataFrame(columns=COLUMNS))
+    requests = []
+
+    def aggregate_db(tables, aggregates, group_by=None, where=None, params=None, prog_db=False, database=None):
+        requests.append((tables, aggregates, group_by, where, params))
+
+        return pd.DataFrame({'NRecords': [42]})
+
+    monkeypatch.setattr(fake_user, 'aggregate_db', aggregate_db)
+    monkeypatch.setattr(mod_records, 'user', fake_user)
+
+    nrecord = record_group.count_records(filter_rules=('{}.Amount > ?'.format(TABLE), (5,)))
+
+    assert nrecord == 42
+    tables, aggregates, group_by, where, params = requests[0]
+    assert TABLE in tables
+    assert aggregates == {'NRecords': ('count', '{}.RecordID'.format(TABLE))}
+    assert group_by == {}
+    assert '{}.Amount > ?'.format(TABLE) in where
+    assert list(params) == [5]
@@ -5,14 +5,18 @@ REM server.
 
 __version__ = '0.3.10'
 
+import concurrent.futures
 import datetime
+import hashlib
 import logging
 import logging.handlers as handlers
 import os
+import queue
 import selectors
 import socket
 import struct
 import sys
+import time
 from multiprocessing import freeze_support
 
 import pandas as pd
@@ -84,6 +88,14 @@ class WinService:
         logger.info('initializing program managers')
         configuration.load_configuration(cnfg)
 
+        self.serve()
+
+    def serve(self):
+        """
+        Listen for and process client connections until the service is stopped.
+        """
+        self.running = True
+
         # Start listening for connections
         logger.info('starting the server')
         logger.info('running REM server version {VER}'.format(VER=__version__))
@@ -96,6 +108,9 @@ class WinService:
             lsock.listen()
             lsock.setblocking(False)
             sel.register(lsock, selectors.EVENT_READ, data=None)
+
+            # Database requests are answered by worker threads so that slow queries don't hold up other clients
+            workers = ResponseWorkers(sel, configuration.db_workers) if configuration.db_workers > 0 else None
         except Exception as e:
             logger.error('failed to bind socket on port {HOST}:{PORT} - {ERR}'
                          .format(HOST=configuration.host, PORT=configuration.port, ERR=e))
@@ -105,17 +120,20 @@ class WinService:
                     .format(HOST=configuration.host, PORT=configuration.port))
 
         # Start main loop
+        last_sweep = time.monotonic()
         try:
             while self.running:
-                events = sel.select(timeout=None)
+                events = sel.select(timeout=configuration.sweep_interval)
                 for key, mask in events:
                     if key.data is None:  # open connection to client
                         sock = key.fileobj
                         conn, addr = sock.accept()  # should be ready to read
                         logger.info('accepted connection from {ADDR}'.format(ADDR=addr))
                         conn.setblocking(False)
-                        message = ClientConnection(sel, conn, addr)
+                        configure_socket(conn)
+                        message = ClientConnection(sel, conn, addr, workers=workers)
                         sel.register(conn, selectors.EVENT_READ, data=message)
+                        metrics.record_accept()
                     else:  # process a client request / return data
                         message = key.data
                         try:
@@ -124,15 +142,143 @@ class WinService:
                             # Close and remove the connection to the client if any exception raised
                             logger.exception('failed to process client {ADDR} event ... closing the connection'
                                              .format(ADDR=message.addr))
-                            message.close()
+                            message.close(reason='error')
+
+                # Periodically close connections that have been idle for longer than the configured timeout
+                current_time = time.monotonic()
+                if current_time - last_sweep >= configuration.sweep_interval:
+                    self.sweep(sel, current_time)
+                    last_sweep = current_time
         except Exception:
             logger.exception('server "{HOST}" no longer monitoring connections on port {PORT}'
                              .format(HOST=configuration.host, PORT=configuration.port))
         finally:
+            for key in list(sel.get_map().values()):
+                if key.data is not None:
+                    key.data.close(reason='shutdown')
+
             sel.close()
+            logger.info(metrics.summary())
 
         lsock.close()
 
+    def sweep(self, sel, current_time):
+        """
+        Close client connections that have been idle for longer than the configured idle timeout.
+
+        Arguments:
+            sel (selector): selector object.
+
+            current_time (float): current value of the monotonic clock.
+        """
+        idle_timeout = configuration.idle_timeout
+
+        if idle_timeout:
+            for key in list(sel.get_map().values()):
+                message = key.data
+                if not isinstance(message, ClientConnection) or message.pending:  # listening socket or worker pool
+                    continue
+
+                idle_time = message.idle_time(current_time)
+                if idle_time > idle_timeout:
+                    logger.info('connection to {ADDR} has been idle for {TIME:.0f} seconds ... closing the connection'
+                                .format(ADDR=message.addr, TIME=idle_time))
+                    message.close(reason='idle')
+
+        logger.debug(metrics.summary())
+
+
+class ResponseWorkers:
+    """
+    Pool of threads that create the responses to database requests outside of the selector loop. Completed responses
+    are handed back to the selector loop, which sends them to the clients.
+
+    Attributes:
+        selector (selector): selector object.
+
+        addr (str): name of the pool, used in place of a client address.
+    """
+
+    def __init__(self, selector, nworkers: int = 4):
+        """
+        Arguments:
+            selector (selector): selector object.
+
+            nworkers (int): number of worker threads [Default: 4].
+        """
+        self.selector = selector
+        self.addr = 'response workers'
+
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=nworkers,
+                                                               thread_name_prefix='ResponseWorker')
+        self._completed = queue.Queue()
+
+        # Workers wake up the selector loop by writing to a socket that the selector is waiting on
+        self._wakeup_recv, self._wakeup_send = socket.socketpair()
+        self._wakeup_recv.setblocking(False)
+        self.selector.register(self._wakeup_recv, selectors.EVENT_READ, data=self)
+
+    def submit(self, message):
+        """
+        Create the response to a client request in a worker thread.
+
+        Arguments:
+            message (ClientConnection): client connection with a complete request.
+        """
+        future = self._executor.submit(message._create_response)
+        future.add_done_callback(lambda completed: self._complete(message, completed))
+
+    def _complete(self, message, future):
+        """
+        Queue a completed response for sending and wake up the selector loop. Called from the worker threads.
+        """
+        self._completed.put((message, future))
+
+        try:
+            self._wakeup_send.send(b'\0')
+        except OSError:  # pool is closed
+            pass
+
+    def process_events(self, mask):
+        """
+        Hand completed responses to their client connections for sending.
+        """
+        try:
+            while self._wakeup_recv.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+        while True:
+            try:
+                message, future = self._completed.get_nowait()
+            except queue.Empty:
+                break
+
+            try:
+                response = future.result()
+            except Exception as e:
+                logger.exception('{ADDR}: failed to create response - {ERR}'.format(ADDR=message.addr, ERR=e))
+                message.close(reason='error')
+            else:
+                message.finish_response(response)
+
+    def close(self, reason: str = 'shutdown'):
+        if self._wakeup_recv is None:  # pool already closed
+            return
+
+        logger.info('stopping the response workers ({REASON})'.format(REASON=reason))
+        self._executor.shutdown(wait=False)
+
+        try:
+            self.selector.unregister(self._wakeup_recv)
+        except Exception:
+            logger.exception('unable to unregister the response worker wakeup socket')
+
+        self._wakeup_recv.close()
+        self._wakeup_send.close()
+        self._wakeup_recv = None
+
 
 class ClientConnection:
     """
@@ -150,9 +296,16 @@ class ClientConnection:
 
         response_created (bool): indicates whether a response to a request has already been created or not
         [default: False].
+
+        last_activity (float): monotonic time of the last read or write event on the connection.
+
+        pending (bool): the response to the request is being created by a worker thread [default: False].
     """
 
-    def __init__(self, selector, sock, addr):
+    # Requests answered by the worker threads. These only use the per-request database connection, not shared state.
+    worker_actions = ('db_transact', 'db_aggregate')
+
+    def __init__(self, selector, sock, addr, workers: ResponseWorkers = None):
         """
         Arguments:
             selector (selector): selector object.
@@ -160,10 +313,14 @@ class ClientConnection:
             sock (str): socket connection.
 
             addr (str): client address.
+
+            workers (ResponseWorkers): optional pool of worker threads to create database responses in.
         """
         self.selector = selector
         self.sock = sock
         self.addr = addr
+        self.workers = workers
+        self.pending = False
 
         # Dynamic attributes
         self._recv_buffer = b""
@@ -173,6 +330,7 @@ class ClientConnection:
         self.request = None
         self.action = None
         self.response_created = False
+        self.last_activity = time.monotonic()
 
     def _reset(self):
         """
@@ -263,6 +421,7 @@ class ClientConnection:
                     conn_str = value.get('connection_string')
                     statement = value.get('statement')
                     params = value.get('parameters')
+                    page = value.get('page', None)
                 except TypeError:
                     msg = 'request value formatted incorrectly'
                     logger.error('{ADDR}: failed to create response - {ERR}'.format(ADDR=self.addr, ERR=msg))
@@ -272,7 +431,10 @@ class ClientConnection:
                     conn_str['Port'] = configuration.odbc_port
                     conn_str['Driver'] = configuration.odbc_driver
                     db_manager = SQLTransactManager(conn_str)
-                    if transaction_type == 'read':
+                    if transaction_type == 'read' and page:
+                        content = db_manager.read_db_page(statement, params, page.get('key'), page.get('size'),
+                                                          after=page.get('after', None))
+                    elif transaction_type == 'read':
                         content = db_manager.read_db(statement, params)
                     elif transaction_type == 'write':
                         if isinstance(statement, str):
@@ -312,6 +474,27 @@ class ClientConnection:
                         content = {'success': False, 'value': msg}
                     db_manager.disconnect()
 
+            elif action == 'db_aggregate':
+                try:
+                    conn_str = value.get('connection_string')
+                    tables = value.get('tables')
+                    aggregates = value.get('aggregates')
+                    group_by = value.get('group_by', None)
+                    where = value.get('where', None)
+                    params = value.get('parameters', None)
+                except TypeError:
+                    msg = 'request value formatted incorrectly'
+                    logger.error('{ADDR}: failed to create response - {ERR}'.format(ADDR=self.addr, ERR=msg))
+                    content = {'success': False, 'value': msg}
+                else:
+                    conn_str['Server'] = configuration.odbc_server
+                    conn_str['Port'] = configuration.odbc_port
+                    conn_str['Driver'] = configuration.odbc_driver
+                    db_manager = SQLTransactManager(conn_str)
+                    content = db_manager.aggregate_db(tables, aggregates, group_by=group_by, where=where,
+                                                      params=params)
+                    db_manager.disconnect()
+
             elif action == 'db_login':
                 try:
                     conn_str = value.get('connection_string')
@@ -369,7 +552,10 @@ class ClientConnection:
                     db_manager.disconnect()
 
             elif action == 'constants':
-                content = configuration.format_attrs(value)
+                if isinstance(value, dict):  # client holds a cached copy of the configuration
+                    content = configuration.format_attrs(value.get('subset', None), version=value.get('version', None))
+                else:
+                    content = configuration.format_attrs(value)
 
             elif action == 'add_ids':
                 try:
@@ -425,7 +611,17 @@ class ClientConnection:
 
         return response
 
+    def idle_time(self, current_time: float = None):
+        """
+        Return the number of seconds since the last read or write event on the connection.
+        """
+        current_time = current_time if current_time is not None else time.monotonic()
+
+        return current_time - self.last_activity
+
     def process_events(self, mask):
+        self.last_activity = time.monotonic()
+
         if mask & selectors.EVENT_READ:
             self.read()
         if mask & selectors.EVENT_WRITE:
@@ -434,6 +630,9 @@ class ClientConnection:
     def read(self):
         self._read()
 
+        if self.pending:  # the client sends its next request only after receiving the response
+            return
+
         if self._header_len is None:
             self.process_protoheader()
 
@@ -449,13 +648,18 @@ class ClientConnection:
             logger.info('receiving request "{REQ}" from address {ADDR}'.format(REQ=self.action, ADDR=self.addr))
 #            logger.debug('request received: {}'.format(self.request))
 
-            # Set selector to listen for write events, we're done reading.
-            self._set_selector_events_mask('w')
-
             # Reset attributes related to the client's request
             self._header_len = None
             self.header = None
 
+            if self.workers is not None and self.action in self.worker_actions:
+                # Keep listening for read events to notice a closed connection while the response is created
+                self.pending = True
+                self.workers.submit(self)
+            else:
+                # Set selector to listen for write events, we're done reading.
+                self._set_selector_events_mask('w')
+
     def write(self):
         if self.request:  # request was previously sent by client
             if not self.response_created:  # first time calling after processing query / request
@@ -502,16 +706,36 @@ class ClientConnection:
             except TypeError:
                 logger.error('an improperly formatted request was received from address {ADDR}'.format(ADDR=self.addr))
 
-    def create_response(self):
-        response = self._create_response()
+    def create_response(self, response: dict = None):
+        if response is None:
+            response = self._create_response()
 
         message = self._create_message(**response)
 
         self.response_created = True
         self._send_buffer += message
 
-    def close(self):
-        logger.info("closing connection to {ADDR}".format(ADDR=self.addr))
+    def finish_response(self, response):
+        """
+        Send a response created by a worker thread.
+        """
+        self.pending = False
+        if self.sock is None:  # connection was closed while the response was created
+            return
+
+        self.last_activity = time.monotonic()
+        self.create_response(response)
+        logger.info('sending response to request "{REQ}" to address {ADDR}'.format(REQ=self.action, ADDR=self.addr))
+
+        self._set_selector_events_mask('w')
+
+    def close(self, reason: str = 'error'):
+        if self.sock is None:  # connection already closed
+            return
+
+        logger.info('closing connection to {ADDR} ({REASON})'.format(ADDR=self.addr, REASON=reason))
+        metrics.record_close(reason)
+
         try:
             self.selector.unregister(self.sock)
         except Exception:
@@ -526,6 +750,56 @@ class ClientConnection:
             self.sock = None
 
 
+class ServerMetrics:
+    """
+    Class to track client connection statistics.
+
+    Attributes:
+        accepted (int): number of client connections accepted since the server started.
+
+        closures (dict): number of client connections closed since the server started, by reason for closing.
+    """
+
+    def __init__(self):
+        self.start_time = time.monotonic()
+        self.accepted = 0
+        self.closures = {}
+
+    def record_accept(self):
+        """
+        Record a newly accepted client connection.
+        """
+        self.accepted += 1
+
+    def record_close(self, reason):
+        """
+        Record the closing of a client connection.
+
+        Arguments:
+            reason (str): reason that the connection was closed (e.g. idle, error, shutdown).
+        """
+        try:
+            self.closures[reason] += 1
+        except KeyError:
+            self.closures[reason] = 1
+
+    def open_connections(self):
+        """
+        Return the number of currently open client connections.
+        """
+        return self.accepted - sum(self.closures.values())
+
+    def summary(self):
+        """
+        Format the connection statistics for logging.
+        """
+        closures = ', '.join(['{REASON}={N}'.format(REASON=i, N=j) for i, j in sorted(self.closures.items())])
+
+        return 'server metrics: uptime={TIME:.0f}s, accepted={ACC}, open={OPEN}, closed=[{CLOSED}]' \
+            .format(TIME=time.monotonic() - self.start_time, ACC=self.accepted, OPEN=self.open_connections(),
+                    CLOSED=closures)
+
+
 class ConfigManager:
     """
     Class to manage the program configuration.
@@ -536,6 +810,16 @@ class ConfigManager:
         # Socket parameters
         self.port = 65432
         self.host = 'localhost'
+        self.idle_timeout = 900
+        self.sweep_interval = 30
+        self.db_workers = 4
+        self.tcp_nodelay = True
+        self.keepalive = True
+        self.keepalive_idle = 60
+        self.keepalive_interval = 10
+        self.keepalive_count = 5
+        self.rcvbuf = None
+        self.sndbuf = None
 
         # Configuration database parameters
         self.mongod_port = 27017
@@ -577,6 +861,7 @@ class ConfigManager:
         self.bank_rules = None
         self.records = None
         self.aliases = None
+        self.version = None  # hash of the formatted configuration, computed when first requested
 
         # Unsaved record IDs
         self.unsaved_ids = {}
@@ -600,6 +885,42 @@ class ConfigManager:
         except KeyError:
             self.host = 'localhost'
 
+        # Connection management and TCP tuning parameters
+        int_params = {'idle_timeout': 900, 'sweep_interval': 30, 'db_workers': 4, 'keepalive_idle': 60,
+                      'keepalive_interval': 10, 'keepalive_count': 5, 'rcvbuf': None, 'sndbuf': None}
+        for param, default in int_params.items():
+            try:
+                value = int(cnfg['server'][param])
+            except KeyError:
+                value = default
+            except (ValueError, TypeError):
+                logger.error(f'unsupported value {cnfg["server"][param]} provided to server configuration parameter '
+                             f'"{param}"')
+                value = default
+
+            setattr(self, param, value)
+
+        if self.sweep_interval < 1:
+            self.sweep_interval = 1
+
+        try:
+            self.tcp_nodelay = bool(int(cnfg['server']['tcp_nodelay']))
+        except KeyError:
+            self.tcp_nodelay = True
+        except (ValueError, TypeError):
+            logger.error(f'unsupported value {cnfg["server"]["tcp_nodelay"]} provided to server configuration '
+                         f'parameter "tcp_nodelay"')
+            self.tcp_nodelay = True
+
+        try:
+            self.keepalive = bool(int(cnfg['server']['keepalive']))
+        except KeyError:
+            self.keepalive = True
+        except (ValueError, TypeError):
+            logger.error(f'unsupported value {cnfg["server"]["keepalive"]} provided to server configuration '
+                         f'parameter "keepalive"')
+            self.keepalive = True
+
         # Configuration database parameters
         try:
             self.mongod_port = int(cnfg['configuration']['mongod_port'])
@@ -853,11 +1174,19 @@ class ConfigManager:
             logger.error('unable to find required collection parameters - {ERR}'.format(ERR=e))
             raise
 
+        self.version = None
+
         logger.info('configuration successfully loaded')
 
-    def format_attrs(self, subset=None):
+    def format_attrs(self, subset=None, version: str = None):
         """
         Format attributes for messaging.
+
+        Arguments:
+            subset (list): only include these attributes [Default: include all attributes].
+
+            version (str): version of the configuration already held by the client. Only the version is returned when
+                it matches the current configuration version.
         """
         logger.debug('formatting attributes for sending')
 
@@ -876,8 +1205,17 @@ class ConfigManager:
                  'records': self.records, 'parameters': self.aliases, 'table_fields': tbl_fields,
                  'database': database_attrs}
 
+        if self.version is None:
+            self.version = hashlib.sha256(json_util.dumps(attrs, sort_keys=True).encode('utf-8')).hexdigest()
+
+        if version is not None and version == self.version:
+            return {'success': True, 'value': {'version': self.version, 'modified': False}}
+
         if subset is not None:
-            attrs = {i: j for i, j in attrs if i in subset}
+            attrs = {i: j for i, j in attrs.items() if i in subset}
+
+        attrs['version'] = self.version
+        attrs['modified'] = True
 
         return {'success': True, 'value': attrs}
 
@@ -1165,6 +1503,134 @@ class SQLTransactManager:
         # Add return value to the queue
         return {'success': status, 'value': value}
 
+    def read_db_page(self, statement, params, key, size, after=None):
+        """
+        Read a single page of the results of a query using keyset pagination.
+
+        Arguments:
+            statement (str): query statement. The statement is used as a derived table and so must not contain an
+                ORDER BY clause.
+
+            params (list): query parameters.
+
+            key (str): name of the result column used to order the pages. Values of the column must be unique.
+
+            size (int): maximum number of rows in the page.
+
+            after: return only rows where the ordering key is greater than this value [Default: return the first page].
+
+        Returns:
+            result (dict): success status and a value containing the page rows and the cursor for the next page. The
+                cursor is None when there are no more rows to read.
+        """
+        try:
+            size = int(size)
+        except (ValueError, TypeError):
+            msg = 'page size must be an integer'
+            logger.error('database read failed - {ERR}'.format(ERR=msg))
+
+            return {'success': False, 'value': msg}
+
+        if not isinstance(key, str) or not key.replace('_', '').isalnum() or size < 1:
+            msg = 'invalid page key "{KEY}" or page size "{SIZE}" provided'.format(KEY=key, SIZE=size)
+            logger.error('database read failed - {ERR}'.format(ERR=msg))
+
+            return {'success': False, 'value': msg}
+
+        params = list(params) if params else []
+        if after is not None:
+            where = 'WHERE Page.{KEY} > ?'.format(KEY=key)
+            params.append(after)
+        else:
+            where = ''
+
+        # Request one more row than the page size to determine whether another page exists
+        page_statement = 'SELECT TOP ({SIZE}) * FROM ({STATEMENT}) AS Page {WHERE} ORDER BY Page.{KEY};' \
+            .format(SIZE=size + 1, STATEMENT=statement.strip().rstrip(';'), WHERE=where, KEY=key)
+
+        result = self.read_db(page_statement, tuple(params))
+        if not result['success']:
+            return result
+
+        df = pd.DataFrame(result['value'])
+        if df.shape[0] > size:
+            df = df.iloc[0: size]
+            cursor = df[key].iloc[-1]
+            if hasattr(cursor, 'item'):  # convert numpy data types to native data types for encoding
+                cursor = cursor.item()
+        else:
+            cursor = None
+
+        # Rebuilding the frame turns missing dates back into NaT, which can't be encoded
+        rows = df.replace({pd.NaT: None}).to_dict()
+
+        return {'success': True, 'value': {'rows': rows, 'cursor': cursor}}
+
+    def aggregate_db(self, tables, aggregates, group_by=None, where=None, params=None):
+        """
+        Summarize database records by aggregating column values on the database server.
+
+        Arguments:
+            tables (str): table component of the query statement, including any joins.
+
+            aggregates (dict): aggregate column aliases mapped to the aggregate function (SUM, COUNT, MIN, or MAX) and
+                the column expression to aggregate.
+
+            group_by (dict): group column aliases mapped to the column expression to group the records on [Default:
+                aggregate over all records].
+
+            where (str): where clause of the query statement [Default: no filtering].
+
+            params (list): where clause parameters.
+
+        Returns:
+            result (dict): success status and the aggregated rows as the value.
+        """
+        functions = ('SUM', 'COUNT', 'MIN', 'MAX')
+
+        group_by = group_by if group_by else {}
+        if not tables or not aggregates:
+            msg = 'a table and at least one aggregate are required'
+            logger.error('database aggregation failed - {ERR}'.format(ERR=msg))
+
+            return {'success': False, 'value': msg}
+
+        group_columns = []
+        for alias in group_by:
+            if not alias.isidentifier():
+                msg = 'invalid group column alias "{ALIAS}" provided'.format(ALIAS=alias)
+                logger.error('database aggregation failed - {ERR}'.format(ERR=msg))
+
+                return {'success': False, 'value': msg}
+
+            group_columns.append(group_by[alias])
+
+        select_columns = ['{COL} AS {ALIAS}'.format(COL=group_by[i], ALIAS=i) for i in group_by]
+        for alias in aggregates:
+            try:
+                func, column = aggregates[alias]
+            except (ValueError, TypeError):
+                msg = 'aggregate "{ALIAS}" requires both a function and a column'.format(ALIAS=alias)
+                logger.error('database aggregation failed - {ERR}'.format(ERR=msg))
+
+                return {'success': False, 'value': msg}
+
+            func = str(func).upper()
+            if func not in functions or not alias.isidentifier():
+                msg = 'invalid aggregate function "{FUNC}" or alias "{ALIAS}" provided'.format(FUNC=func, ALIAS=alias)
+                logger.error('database aggregation failed - {ERR}'.format(ERR=msg))
+
+                return {'success': False, 'value': msg}
+
+            select_columns.append('{FUNC}({COL}) AS {ALIAS}'.format(FUNC=func, COL=column, ALIAS=alias))
+
+        where_clause = where if where else ''
+        group_clause = 'GROUP BY {}'.format(', '.join(group_columns)) if group_columns else ''
+        statement = 'SELECT {COLS} FROM {TABLE} {WHERE} {GROUP};' \
+            .format(COLS=', '.join(select_columns), TABLE=tables, WHERE=where_clause, GROUP=group_clause)
+
+        return self.read_db(statement, tuple(params) if params else None)
+
     def write_db(self, statement, params):
         """
         Thread database write functions.
@@ -1266,6 +1732,37 @@ def load_config(cnfg_file):
     return cnfg
 
 
+def configure_socket(sock):
+    """
+    Set the TCP options of an accepted client socket.
+    """
+    try:
+        if configuration.tcp_nodelay:  # small requests and responses should not wait on Nagle's algorithm
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        if configuration.rcvbuf:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, configuration.rcvbuf)
+        if configuration.sndbuf:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, configuration.sndbuf)
+
+        if configuration.keepalive:  # detect half-open connections from clients that have disappeared
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+            idle = configuration.keepalive_idle
+            interval = configuration.keepalive_interval
+            if hasattr(socket, 'SIO_KEEPALIVE_VALS'):  # Windows
+                sock.ioctl(socket.SIO_KEEPALIVE_VALS, (1, idle * 1000, interval * 1000))
+            else:
+                if hasattr(socket, 'TCP_KEEPIDLE'):
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, idle)
+                if hasattr(socket, 'TCP_KEEPINTVL'):
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, interval)
+                if hasattr(socket, 'TCP_KEEPCNT'):
+                    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, configuration.keepalive_count)
+    except OSError as e:
+        logger.warning('unable to set the TCP options of the client socket - {ERR}'.format(ERR=e))
+
+
 def configure_handler(dirname, cnfg):
     """
     Configure the rotating file handler for logging.
@@ -1332,6 +1829,7 @@ logger.addHandler(configure_handler(DIR, load_config(CNF_FILE)))
 logger.info('logging successfully configured')
 
 configuration = ConfigManager()
+metrics = ServerMetrics()
 
 # Load the encryption key
 ENCRYPT_FILE = 'REM.aes'
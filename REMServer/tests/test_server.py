@@ -0,0 +1,68 @@
+"""
+Tests of the server database functions.
+"""
+import importlib.util
+import os
+import shutil
+
+import pandas as pd
+import pytest
+from bson import json_util
+
+SERVER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+
+@pytest.fixture(scope='module')
+def server(tmp_path_factory):
+    # The server module loads the configuration file and the encryption key from its own directory on import
+    server_dir = tmp_path_factory.mktemp('server')
+    shutil.copy(os.path.join(SERVER_DIR, 'server.py'), server_dir)
+    with open(os.path.join(server_dir, 'cnfg.yaml'), 'w', encoding='utf-8') as fh:
+        fh.write('log:\n  log_file: {}\n'.format(os.path.join(server_dir, 'REM.log')))
+
+    spec = importlib.util.spec_from_file_location('server', os.path.join(server_dir, 'server.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    return module
+
+
+def test_read_db_page_encodes_null_dates(server, monkeypatch):
+    df = pd.DataFrame({'RecordID': ['R1', 'R2', 'R3'],
+                       'RecordDate': pd.to_datetime(['2021-01-01', None, '2021-01-03'])})
+
+    db_manager = server.SQLTransactManager.__new__(server.SQLTransactManager)
+    read_result = {'success': True, 'value': df.replace({pd.NaT: None}).to_dict()}
+    monkeypatch.setattr(db_manager, 'read_db', lambda statement, params: read_result)
+
+    result = db_manager.read_db_page('SELECT * FROM Records', (), 'RecordID', 2)
+    rows = json_util.loads(json_util.dumps(result))['value']['rows']
+
+    assert result['value']['cursor'] == 'R2'
+    assert rows['RecordID'] == {'0': 'R1', '1': 'R2'}
+    assert rows['RecordDate']['1'] is None
+
+
+def test_aggregate_db_statement(server, monkeypatch):
+    db_manager = server.SQLTransactManager.__new__(server.SQLTransactManager)
+    statements = []
+    monkeypatch.setattr(db_manager, 'read_db', lambda statement, params: statements.append((statement, params)))
+
+    db_manager.aggregate_db('Records', {'NRecords': ('count', 'Records.RecordID'), 'Total': ('sum', 'Records.Amount')},
+                            group_by={'RecordType': 'Records.DocType'}, where='WHERE Records.Amount > ?', params=[5])
+
+    statement, params = statements[0]
+    expected = 'SELECT Records.DocType AS RecordType, COUNT(Records.RecordID) AS NRecords, SUM(Records.Amount) AS ' \
+               'Total FROM Records WHERE Records.Amount > ? GROUP BY Records.DocType;'
+    assert ' '.join(statement.split()) == expected
+    assert params == (5,)
+
+
+@pytest.mark.parametrize('aggregates', [{'Total': ('avg', 'Records.Amount')}, {'Total; DROP': ('sum', 'Amount')},
+                                        {'Total': 'Amount'}, {}])
+def test_aggregate_db_rejects_invalid_aggregates(server, aggregates):
+    db_manager = server.SQLTransactManager.__new__(server.SQLTransactManager)
+
+    result = db_manager.aggregate_db('Records', aggregates)
+
+    assert result['success'] is False
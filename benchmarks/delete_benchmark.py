@@ -0,0 +1,91 @@
+"""
+Benchmark of per-row and set-based deletion statements.
+
+Prepares deletion statements for a number of entries with prepare_sql_delete, once with one parameter set per entry
+and once with multi-row deletions, and reports the number of statement executions each requires. Single-column
+deletions are also executed against an in-memory SQLite table to compare the time spent in the database. Deletions
+matched on multiple columns join the table to a set of values using Transact-SQL syntax, so only their statement
+executions are reported.
+
+Usage:
+    python delete_benchmark.py --rows 1000 10000 100000
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import REM.database as mod_db
+
+TABLE = 'BenchmarkReferences'
+
+
+def load_table(nrow):
+    """
+    Create an in-memory SQLite table of reference entries.
+    """
+    conn = sqlite3.connect(':memory:')
+    conn.execute('CREATE TABLE {} (DocNo TEXT PRIMARY KEY, RefNo TEXT, IsDeleted INTEGER)'.format(TABLE))
+    conn.executemany('INSERT INTO {} VALUES (?, ?, 0)'.format(TABLE),
+                     [('DOC{:08d}'.format(i), 'REF{:08d}'.format(i)) for i in range(nrow)])
+    conn.commit()
+
+    return conn
+
+
+def execute(conn, statements):
+    """
+    Execute a batch of statements and return the execution time and the number of statement executions.
+    """
+    sstrings, psets = statements.flatten()
+
+    start = time.perf_counter()
+    for statement, params in zip(sstrings, psets):
+        conn.executemany(statement, params)
+    conn.commit()
+
+    return time.perf_counter() - start, sum([len(i) for i in psets])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark per-row and set-based deletion statements')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000], help='numbers of entries')
+    args = parser.parse_args()
+
+    print('{:>8}  {:<8}  {:>14}  {:>14}  {:>12}  {:>12}'
+          .format('rows', 'columns', 'per-row execs', 'set execs', 'per-row time', 'set time'))
+    for nrow in args.rows:
+        keys = pd.DataFrame({'DocNo': ['DOC{:08d}'.format(i) for i in range(nrow)],
+                             'RefNo': ['REF{:08d}'.format(i) for i in range(nrow)]})
+
+        # Single-column deletions
+        conn = load_table(nrow)
+        row_time, row_execs = execute(conn, mod_db.prepare_sql_delete(TABLE, ['DocNo'], keys[['DocNo']]))
+        remaining = conn.execute('SELECT COUNT(*) FROM {}'.format(TABLE)).fetchone()[0]
+
+        conn = load_table(nrow)
+        set_time, set_execs = execute(conn, mod_db.prepare_sql_delete(TABLE, ['DocNo'], keys[['DocNo']],
+                                                                      multirow=True))
+        set_remaining = conn.execute('SELECT COUNT(*) FROM {}'.format(TABLE)).fetchone()[0]
+        if remaining != 0 or set_remaining != 0:
+            print('deletions left {} (per-row) and {} (set-based) of {} entries'.format(remaining, set_remaining, nrow))
+
+        print('{:>8}  {:<8}  {:>14}  {:>14}  {:>11.4f}s  {:>11.4f}s'
+              .format(nrow, 'single', row_execs, set_execs, row_time, set_time))
+
+        # Multiple-column deletions
+        row_execs = sum([len(i) for i in mod_db.prepare_sql_delete(TABLE, ['DocNo', 'RefNo'], keys).flatten()[1]])
+        set_execs = sum([len(i) for i in mod_db.prepare_sql_delete(TABLE, ['DocNo', 'RefNo'], keys,
+                                                                   multirow=True).flatten()[1]])
+
+        print('{:>8}  {:<8}  {:>14}  {:>14}  {:>12}  {:>12}'.format(nrow, 'multiple', row_execs, set_execs, '-', '-'))
+
+
+if __name__ == "__main__":
+    main()
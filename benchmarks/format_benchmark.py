@@ -0,0 +1,84 @@
+"""
+Benchmark of the display formatting of money and date columns.
+
+Compares the per-value formatters (format_display_money, format_display_date) applied cell by cell against the column
+formatters (format_display_money_values, format_display_date_values) on randomly generated columns, and checks that both
+paths produce the same display values.
+
+Usage:
+    python format_benchmark.py --rows 1000 10000 50000 --repeat 3
+
+The client settings are loaded from settings.yaml in the current working directory, or from the program directory if
+one is not found.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from REM.client import settings
+
+
+def generate_columns(nrow):
+    """
+    Generate random money and date columns containing a small fraction of missing values.
+    """
+    rng = np.random.default_rng(nrow)
+
+    money = pd.Series(np.round(rng.uniform(-1e7, 1e7, nrow), 2))
+    money[rng.random(nrow) < 0.01] = np.nan
+
+    dates = pd.Series(pd.Timestamp('2000-01-01') + pd.to_timedelta(rng.integers(0, 365 * 30, nrow), unit='D'))
+    dates[rng.random(nrow) < 0.01] = pd.NaT
+
+    return money, dates
+
+
+def time_func(func, repeat):
+    """
+    Return the result and the best run time of a function over several runs.
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        duration = time.perf_counter() - start
+        best = duration if best is None else min(best, duration)
+
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the display formatting of money and date columns')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 50000], help='column sizes to benchmark')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs per measurement')
+    args = parser.parse_args()
+
+    print('{:>8}  {:<6}  {:>12}  {:>12}  {:>8}'.format('rows', 'dtype', 'per-value', 'column', 'speedup'))
+    for nrow in args.rows:
+        money, dates = generate_columns(nrow)
+
+        cases = [('money', money, settings.format_display_money, settings.format_display_money_values),
+                 ('date', dates, settings.format_display_date, settings.format_display_date_values)]
+        for dtype, values, value_func, column_func in cases:
+            expected, value_time = time_func(lambda: values.apply(value_func).fillna(''), args.repeat)
+            observed, column_time = time_func(lambda: column_func(values), args.repeat)
+
+            if not expected.astype(str).equals(observed.astype(str)):
+                mismatches = (expected.astype(str) != observed.astype(str)).sum()
+                print('{} column formatting differs from the per-value formatting in {} of {} rows'
+                      .format(dtype, mismatches, nrow))
+
+            print('{:>8}  {:<6}  {:>11.4f}s  {:>11.4f}s  {:>7.1f}x'
+                  .format(nrow, dtype, value_time, column_time, value_time / column_time))
+
+
+if __name__ == "__main__":
+    main()
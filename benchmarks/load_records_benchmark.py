@@ -0,0 +1,183 @@
+"""
+Benchmark of the concurrent loading of records by record ID.
+
+Loads records with RecordGroup.load_records through a fake account manager whose server connections send their read
+requests to a fake server. The fake server answers from an in-memory table after an artificial delay, standing in for
+the time taken to run the query, using a fixed number of worker threads like the database workers of the REM server.
+A single server worker models a server that answers requests one at a time, which no number of client connections can
+speed up. Each fake connection sends one request at a time, like a connection to the server. Loading is timed for each
+combination of server workers and client connections, and all results are checked to match.
+
+Usage:
+    python load_records_benchmark.py --records 50000 --latency 0.05 --server-workers 1 4 --parallel 1 4 8
+
+The client settings are loaded from settings.yaml in the current working directory, or from the program directory if
+one is not found.
+"""
+
+import argparse
+import concurrent.futures
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import REM.client as mod_client
+import REM.records as mod_records
+from REM.client import settings
+
+DATABASE = 'REM'
+TABLE = 'BenchmarkRecords'
+COLUMNS = ['RecordID', 'RecordDate', 'Amount', 'Notes']
+
+
+class FakeServer:
+    """
+    Stand-in for the server that answers read requests from an in-memory table after a delay.
+    """
+
+    def __init__(self, records, latency, nworkers):
+        self.records = records
+        self.latency = latency
+        self.nrequest = 0
+
+        # Requests from all connections share the server workers
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=nworkers)
+
+    def answer(self, request):
+        return self._executor.submit(self._answer, request).result()
+
+    def close(self):
+        self._executor.shutdown()
+
+    def _answer(self, request):
+        time.sleep(self.latency)
+        self.nrequest += 1
+
+        params = request['content']['value']['parameters']
+        df = self.records[self.records['RecordID'].isin(params)]
+
+        return {'success': True, 'value': df.to_dict()}
+
+
+class FakeConnection:
+    """
+    Stand-in for a server connection that sends its requests to the fake server one at a time.
+    """
+
+    def __init__(self, server):
+        self.addr = ('localhost', 0)
+        self.server = server
+
+        # Requests are sent one at a time, in the order they were submitted
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+    def submit(self, request, timeout: int = 60, handler=None, window=None, event: str = None):
+        return self._executor.submit(self._respond, request, handler)
+
+    def wait(self, future):
+        return future.result()
+
+    def close(self):
+        self._executor.shutdown()
+
+    def _respond(self, request, handler):
+        response = self.server.answer(request)
+
+        return handler(response) if handler is not None else response
+
+
+class FakeAccountManager(mod_client.AccountManager):
+    """
+    Account manager that sends read requests over fake server connections.
+    """
+
+    def __init__(self, server):
+        super().__init__()
+
+        self.uid = 'benchmark'
+        self.conns = [FakeConnection(server) for _ in range(64)]
+
+    def _prepare_conn_str(self, database: str = None):
+        return {'UID': self.uid, 'PWD': None, 'Database': database}
+
+    def _read_connections(self, nconn):
+        return self.conns[:nconn]
+
+    def table_schema(self, database, table, timeout: int = 5):
+        return {i: ('varchar', None) for i in COLUMNS}
+
+
+def generate_records(nrow):
+    """
+    Generate a table of records.
+    """
+    rng = np.random.default_rng(nrow)
+
+    return pd.DataFrame({'RecordID': ['BR{:08d}'.format(i) for i in range(nrow)],
+                         'RecordDate': pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 365, nrow),
+                                                                                    unit='D'),
+                         'Amount': np.round(rng.uniform(0, 1e5, nrow), 2),
+                         'Notes': rng.choice(['', 'checked', 'pending'], nrow)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the concurrent loading of records by record ID')
+    parser.add_argument('--records', type=int, default=50000, help='number of records to load')
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds taken by the server to answer a request')
+    parser.add_argument('--server-workers', type=int, nargs='+', default=[1, 4],
+                        help='numbers of server workers answering requests')
+    parser.add_argument('--parallel', type=int, nargs='+', default=[1, 4, 8], help='numbers of connections to use')
+    args = parser.parse_args()
+
+    settings.prog_db = DATABASE
+    records = generate_records(args.records)
+
+    entry = {'IDCode': 'BR', 'ProgramRecord': 1, 'RecordLayout': {},
+             'ImportRules': {TABLE: {'Columns': {i: i for i in COLUMNS}}}}
+    record_group = mod_records.RecordGroup('BenchmarkRecord', entry)
+
+    record_ids = records['RecordID'].sample(frac=1, random_state=args.records).tolist()
+
+    expected = None
+    print('{:>8}  {:>8}  {:>9}  {:>9}  {:>10}  {:>8}'
+          .format('records', 'workers', 'parallel', 'requests', 'time', 'speedup'))
+    for nworkers in args.server_workers:
+        # Load records through the fake account manager
+        server = FakeServer(records, args.latency, nworkers)
+        fake_user = FakeAccountManager(server)
+        mod_records.user = fake_user
+
+        base_time = None
+        for parallel in args.parallel:
+            fake_user.cache.invalidate()
+            server.nrequest = 0
+
+            start = time.perf_counter()
+            loaded_df = record_group.load_records(record_ids, parallel=parallel)
+            load_time = time.perf_counter() - start
+
+            base_time = load_time if base_time is None else base_time
+
+            if expected is None:
+                expected = loaded_df
+            elif not loaded_df.equals(expected):
+                print('records loaded with {} connections and {} server workers differ from the first records loaded'
+                      .format(parallel, nworkers))
+            if loaded_df.shape[0] != args.records:
+                print('loaded {} of {} records'.format(loaded_df.shape[0], args.records))
+
+            print('{:>8}  {:>8}  {:>9}  {:>9}  {:>9.3f}s  {:>7.1f}x'
+                  .format(args.records, nworkers, parallel, server.nrequest, load_time, base_time / load_time))
+
+        for conn in fake_user.conns:
+            conn.close()
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+"""
+Load generator for the REM server.
+
+Runs the server core in-process with an SQLite stand-in for the SQL database and replays a configurable mix of client
+actions over concurrent sockets, using the same message framing and encryption as the REM client. Request latency
+percentiles and throughput are reported at the end of the run.
+
+Usage:
+    python load_test.py --clients 20 --requests 200 --mix constants=1,read=6,write=2,request_ids=1,add_ids=1,remove_ids=1
+
+The server module is imported from the directory given by --server-dir, which must contain the server configuration
+file (cnfg.yaml). The encryption key file (REM.aes) is created by the server module if it does not already exist.
+"""
+
+import argparse
+import importlib
+import os
+import random
+import socket
+import sqlite3
+import struct
+import sys
+import threading
+import time
+
+import pandas as pd
+from bson import json_util
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from REM.tests.test import rand_int, rand_str
+
+DEFAULT_MIX = {'constants': 1, 'read': 6, 'write': 2, 'request_ids': 1, 'add_ids': 1, 'remove_ids': 1}
+FAKE_DB_URI = 'file:rem_load_test?mode=memory&cache=shared'
+FAKE_DB_WRITE_LOCK = threading.Lock()  # shared-cache SQLite fails concurrent writers instead of waiting on them
+FAKE_TABLE = 'LoadTestRecords'
+ID_CODE = 'LT'
+
+
+class FakeTransactManager:
+    """
+    In-process stand-in for the server SQLTransactManager backed by a shared in-memory SQLite database.
+    """
+
+    def __init__(self, conn_obj, timeout: int = 5):
+        self.uid = conn_obj.get('UID', None)
+        self.conn = sqlite3.connect(FAKE_DB_URI, uri=True, timeout=timeout, check_same_thread=False)
+        self.cursor = self.conn.cursor()
+
+        # Readers on the server worker threads don't wait on table locks held by writers
+        self.cursor.execute('PRAGMA read_uncommitted = 1')
+        self._writing = False
+
+    def _release(self):
+        if self._writing:
+            self._writing = False
+            FAKE_DB_WRITE_LOCK.release()
+
+    def disconnect(self):
+        self._release()
+        self.cursor.close()
+        self.conn.close()
+
+    def commit(self):
+        self.conn.commit()
+        self._release()
+
+    def login(self):
+        return {'success': True, 'value': ['admin']}
+
+    def database_tables(self, database):
+        cursor_val = self.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+
+        return {'success': True, 'value': [i[0] for i in cursor_val]}
+
+    def table_schema(self, table):
+        cursor_val = self.cursor.execute('PRAGMA table_info({TBL})'.format(TBL=table))
+
+        return {'success': True, 'value': {i[1]: (i[2], None) for i in cursor_val}}
+
+    def read_db(self, statement, params):
+        try:
+            df = pd.read_sql(statement, self.conn, params=params if params else None)
+        except Exception as e:
+            return {'success': False, 'value': str(e)}
+
+        return {'success': True, 'value': df.replace({pd.NaT: None}).to_dict()}
+
+    def write_db(self, statement, params):
+        if not self._writing:  # held until the transaction is committed or the connection closed
+            FAKE_DB_WRITE_LOCK.acquire()
+            self._writing = True
+
+        try:
+            if isinstance(params, list) and all([isinstance(i, (tuple, list)) for i in params]):
+                self.cursor.executemany(statement, [tuple(i) for i in params])
+            else:
+                self.cursor.execute(statement, params if params else ())
+        except sqlite3.Error as e:
+            return {'success': False, 'value': str(e)}
+
+        return {'success': True, 'value': None}
+
+    def user_permissions(self, object_ids: list = None, actions: list = None):
+        return {'success': True, 'value': {}}
+
+
+class LoadClient:
+    """
+    Blocking client connection that frames and encrypts requests in the same manner as the REM client.
+    """
+
+    def __init__(self, addr, cipher, instance_id):
+        self.sock = socket.create_connection(addr)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.cipher = cipher
+        self.instance_id = instance_id
+        self.unsaved_ids = []
+
+    def _recv_exactly(self, nbytes):
+        buff = b''
+        while len(buff) < nbytes:
+            data = self.sock.recv(nbytes - len(buff))
+            if not data:
+                raise RuntimeError('Peer connection closed')
+
+            buff += data
+
+        return buff
+
+    def request(self, content):
+        content_bytes = self.cipher.encrypt(json_util.dumps(content, ensure_ascii=False).encode('utf-8'))
+        header = {'byteorder': sys.byteorder, 'content-encoding': 'utf-8', 'content-length': len(content_bytes)}
+        header_bytes = json_util.dumps(header).encode('utf-8')
+        self.sock.sendall(struct.pack('>H', len(header_bytes)) + header_bytes + content_bytes)
+
+        header_len = struct.unpack('>H', self._recv_exactly(2))[0]
+        header = json_util.loads(self._recv_exactly(header_len).decode('utf-8'))
+        content = self.cipher.decrypt(self._recv_exactly(header['content-length']))
+
+        return json_util.loads(content.decode(header['content-encoding']))
+
+    def close(self):
+        self.sock.close()
+
+
+def connection_string():
+    return {'UID': 'loadtest', 'PWD': 'loadtest', 'Database': 'REM'}
+
+
+def prepare_request(action, client, record_ids):
+    """
+    Prepare the request content for an action of the load mix.
+    """
+    if action == 'constants':
+        content = {'action': 'constants', 'value': None}
+    elif action == 'read':
+        record_id = random.choice(record_ids)
+        value = {'connection_string': connection_string(), 'transaction_type': 'read',
+                 'statement': 'SELECT RecordID, RecordDate, Amount, Notes FROM {TBL} WHERE RecordID = ?;'
+                     .format(TBL=FAKE_TABLE),
+                 'parameters': (record_id,)}
+        content = {'action': 'db_transact', 'value': value}
+    elif action == 'write':
+        record_id = random.choice(record_ids)
+        value = {'connection_string': connection_string(), 'transaction_type': 'write',
+                 'statement': ['UPDATE {TBL} SET Amount=?,Notes=? WHERE RecordID = ?;'.format(TBL=FAKE_TABLE)],
+                 'parameters': [[(rand_int(), rand_str(), record_id)]]}
+        content = {'action': 'db_transact', 'value': value}
+    elif action == 'request_ids':
+        content = {'action': 'request_ids', 'value': {'instance': client.instance_id, 'id_code': ID_CODE}}
+    elif action == 'add_ids' or (action == 'remove_ids' and not client.unsaved_ids):
+        unsaved_id = '{CODE}{NUM}-{STR}'.format(CODE=ID_CODE, NUM=client.instance_id, STR=rand_str())
+        client.unsaved_ids.append(unsaved_id)
+        content = {'action': 'add_ids', 'value': {'ids': [(unsaved_id, client.instance_id)], 'id_code': ID_CODE}}
+    elif action == 'remove_ids':
+        unsaved_id = client.unsaved_ids.pop()
+        content = {'action': 'remove_ids', 'value': {'ids': [unsaved_id], 'id_code': ID_CODE}}
+    else:
+        raise ValueError('unknown load test action {ACTION}'.format(ACTION=action))
+
+    return content
+
+
+def load_fake_database(nrows):
+    """
+    Create and populate the fake database table. The returned connection must be kept open for the lifetime of the
+    shared in-memory database.
+    """
+    keeper = sqlite3.connect(FAKE_DB_URI, uri=True, check_same_thread=False)
+    keeper.execute('DROP TABLE IF EXISTS {TBL}'.format(TBL=FAKE_TABLE))
+    keeper.execute('CREATE TABLE {TBL} (RecordID TEXT PRIMARY KEY, RecordDate TEXT, Amount REAL, Notes TEXT)'
+                   .format(TBL=FAKE_TABLE))
+
+    record_ids = ['{CODE}2101-{NUM}'.format(CODE=ID_CODE, NUM=str(i).zfill(5)) for i in range(nrows)]
+    rows = [(i, '2021-01-01 00:00:00', float(rand_int()), rand_str()) for i in record_ids]
+    keeper.executemany('INSERT INTO {TBL} VALUES (?,?,?,?)'.format(TBL=FAKE_TABLE), rows)
+    keeper.commit()
+
+    return keeper, record_ids
+
+
+def start_server(server, host, port):
+    """
+    Start the server core in a background thread with the database manager replaced by the fake.
+    """
+    server.SQLTransactManager = FakeTransactManager
+
+    configuration = server.configuration
+    configuration.host = host
+    configuration.port = port
+    configuration.records = {'name': 'records', 'rules': {}}
+    configuration.audit_rules = {'name': 'audit_rules', 'rules': {}}
+    configuration.bank_rules = {'name': 'bank_rules', 'rules': {}}
+    configuration.cash_rules = {'name': 'cash_rules', 'rules': {}}
+    configuration.aliases = {'name': 'parameters', 'definition': {}}
+
+    service = server.WinService()
+    thread = threading.Thread(target=service.serve, daemon=True)
+    thread.start()
+
+    # Wait for the server to start listening
+    start_time = time.time()
+    while time.time() - start_time < 10:
+        try:
+            socket.create_connection((host, port)).close()
+        except OSError:
+            time.sleep(0.05)
+        else:
+            break
+    else:
+        raise TimeoutError('server failed to start listening on {HOST}:{PORT}'.format(HOST=host, PORT=port))
+
+    return service, thread
+
+
+def run_client(addr, cipher, instance_id, actions, record_ids, barrier, results):
+    """
+    Replay a sequence of actions over a single client connection and record the latency of each request.
+    """
+    client = LoadClient(addr, cipher, instance_id)
+    latencies = []
+    failures = 0
+
+    barrier.wait()
+    for action in actions:
+        content = prepare_request(action, client, record_ids)
+
+        start_time = time.perf_counter()
+        response = client.request(content)
+        latencies.append((action, time.perf_counter() - start_time))
+
+        if not response.get('success', False):
+            failures += 1
+
+    client.close()
+    results[instance_id] = (latencies, failures)
+
+
+def percentile(values, pct):
+    """
+    Return the nearest-rank percentile of a sorted list of values.
+    """
+    if not values:
+        return float('nan')
+
+    index = max(int(round(pct / 100 * len(values) + 0.5)) - 1, 0)
+
+    return values[min(index, len(values) - 1)]
+
+
+def format_report(results, elapsed):
+    """
+    Format the latency percentiles and throughput of the load test.
+    """
+    by_action = {}
+    failures = 0
+    for latencies, nfailed in results.values():
+        failures += nfailed
+        for action, latency in latencies:
+            try:
+                by_action[action].append(latency)
+            except KeyError:
+                by_action[action] = [latency]
+
+    all_latencies = sorted([j for i in by_action.values() for j in i])
+    nrequests = len(all_latencies)
+
+    lines = ['{:<12} {:>8} {:>10} {:>10} {:>10}'.format('action', 'count', 'p50 (ms)', 'p95 (ms)', 'p99 (ms)')]
+    for action in sorted(by_action):
+        values = sorted(by_action[action])
+        lines.append('{:<12} {:>8} {:>10.2f} {:>10.2f} {:>10.2f}'
+                     .format(action, len(values), percentile(values, 50) * 1000, percentile(values, 95) * 1000,
+                             percentile(values, 99) * 1000))
+    lines.append('{:<12} {:>8} {:>10.2f} {:>10.2f} {:>10.2f}'
+                 .format('all', nrequests, percentile(all_latencies, 50) * 1000,
+                         percentile(all_latencies, 95) * 1000, percentile(all_latencies, 99) * 1000))
+    lines.append('')
+    lines.append('{N} requests in {TIME:.2f} seconds ({RPS:.1f} requests per second), {FAIL} failed responses'
+                 .format(N=nrequests, TIME=elapsed, RPS=nrequests / elapsed if elapsed else 0, FAIL=failures))
+
+    return '\n'.join(lines)
+
+
+def parse_mix(mix_str):
+    """
+    Parse an action mix of the form "action=weight,action=weight".
+    """
+    mix = {}
+    for component in mix_str.split(','):
+        try:
+            action, weight = component.split('=')
+            mix[action.strip()] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError('action mix component "{}" must be of the form action=weight'
+                                             .format(component))
+
+        if action.strip() not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError('unknown action "{ACTION}" - supported actions are {ALL}'
+                                             .format(ACTION=action, ALL=', '.join(DEFAULT_MIX)))
+
+    return mix
+
+
+def main():
+    default_server_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'REMServer')
+
+    parser = argparse.ArgumentParser(description='Load test the REM server with a local database stand-in')
+    parser.add_argument('--server-dir', default=default_server_dir,
+                        help='directory containing the server module and its configuration file')
+    parser.add_argument('--host', default='127.0.0.1', help='address for the in-process server to listen on')
+    parser.add_argument('--port', type=int, default=65431, help='port for the in-process server to listen on')
+    parser.add_argument('--clients', type=int, default=10, help='number of concurrent client connections')
+    parser.add_argument('--requests', type=int, default=100, help='number of requests sent by each client')
+    parser.add_argument('--rows', type=int, default=10000, help='number of rows in the fake database table')
+    parser.add_argument('--mix', type=parse_mix, default=DEFAULT_MIX,
+                        help='weighted mix of actions to replay, e.g. constants=1,read=6,write=2')
+    parser.add_argument('--seed', type=int, default=None, help='random seed for the action sequence')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+
+    sys.path.insert(0, os.path.abspath(args.server_dir))
+    server = importlib.import_module('server')
+
+    keeper, record_ids = load_fake_database(args.rows)
+    service, thread = start_server(server, args.host, args.port)
+
+    actions = list(args.mix)
+    weights = [args.mix[i] for i in actions]
+
+    results = {}
+    barrier = threading.Barrier(args.clients + 1)
+    clients = []
+    for instance_id in range(args.clients):
+        client_actions = random.choices(actions, weights=weights, k=args.requests)
+        client = threading.Thread(target=run_client, args=((args.host, args.port), server.cipher, instance_id,
+                                                           client_actions, record_ids, barrier, results))
+        client.start()
+        clients.append(client)
+
+    barrier.wait()
+    start_time = time.perf_counter()
+    for client in clients:
+        client.join()
+    elapsed = time.perf_counter() - start_time
+
+    service.stop()
+    thread.join(timeout=server.configuration.sweep_interval + 1)
+    keeper.close()
+
+    print(format_report(results, elapsed))
+
+
+if __name__ == '__main__':
+    main()
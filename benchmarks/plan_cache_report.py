@@ -0,0 +1,97 @@
+"""
+Report on the reuse of cached query plans for parameterized statements.
+
+With a connection string, the cached plans of prepared statements on the SQL Server instance are summarized from the
+plan cache views, along with the plan cache hit ratio of the server. Run the report before and after a workload (or
+after clearing the plan cache with DBCC FREEPROCCACHE on a test server) to compare how well statement plans are reused.
+The account used requires the VIEW SERVER STATE permission.
+
+Without a connection string, the number of distinct statement texts generated for IN lists of random lengths is
+compared with and without bucketing of the list sizes.
+
+Usage:
+    python plan_cache_report.py --conn "DRIVER={ODBC Driver 17 for SQL Server};SERVER=...;DATABASE=...;UID=...;PWD=..."
+    python plan_cache_report.py --pattern "%RecordID IN%"
+    python plan_cache_report.py --lists 10000
+"""
+
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+PLAN_QUERY = """
+             SELECT COUNT(*) AS Plans, SUM(cp.usecounts) AS Uses,
+                 SUM(CASE WHEN cp.usecounts = 1 THEN 1 ELSE 0 END) AS SingleUsePlans,
+                 SUM(CAST(cp.size_in_bytes AS BIGINT)) / 1024 AS SizeKB
+             FROM sys.dm_exec_cached_plans AS cp
+             CROSS APPLY sys.dm_exec_sql_text(cp.plan_handle) AS st
+             WHERE cp.objtype = 'Prepared' AND st.text LIKE ?
+             """
+HIT_RATIO_QUERY = """
+                  SELECT
+                      MAX(CASE WHEN counter_name = 'Cache Hit Ratio' THEN cntr_value END),
+                      MAX(CASE WHEN counter_name = 'Cache Hit Ratio Base' THEN cntr_value END)
+                  FROM sys.dm_os_performance_counters
+                  WHERE object_name LIKE '%Plan Cache%' AND instance_name = 'SQL Plans'
+                  """
+
+
+def report_server(conn_str, pattern):
+    """
+    Summarize the cached plans of prepared statements matching a pattern.
+    """
+    import pyodbc
+
+    conn = pyodbc.connect(conn_str)
+    cursor = conn.cursor()
+
+    plans, uses, single_use, size_kb = cursor.execute(PLAN_QUERY, pattern).fetchone()
+    hits, base = cursor.execute(HIT_RATIO_QUERY).fetchone()
+    conn.close()
+
+    plans = plans or 0
+    uses = uses or 0
+    print('prepared statement plans matching "{}": {}'.format(pattern, plans))
+    print('  executions: {}'.format(uses))
+    print('  single-use plans: {}'.format(single_use or 0))
+    print('  plan cache size: {} KB'.format(size_kb or 0))
+    if plans:
+        print('  plan reuse rate: {:.1%}'.format(1 - plans / uses))
+    if base:
+        print('SQL plan cache hit ratio: {:.1%}'.format(hits / base))
+
+
+def report_texts(nlist, max_size):
+    """
+    Count the distinct IN statement texts generated for lists of random lengths.
+    """
+    import REM.database as mod_db
+
+    lengths = [random.randint(1, max_size) for _ in range(nlist)]
+    exact = {'RecordID IN ({})'.format(','.join(['?'] * i)) for i in lengths}
+    bucketed = {mod_db.format_in_clause('RecordID', range(i))[0] for i in lengths}
+
+    print('{} IN lists of 1 to {} values'.format(nlist, max_size))
+    print('  distinct statement texts without bucketing: {}'.format(len(exact)))
+    print('  distinct statement texts with bucketing: {}'.format(len(bucketed)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report on the reuse of cached query plans')
+    parser.add_argument('--conn', help='ODBC connection string of the SQL Server instance')
+    parser.add_argument('--pattern', default='%IN (@P1%', help='LIKE pattern of the statement texts to summarize')
+    parser.add_argument('--lists', type=int, default=10000, help='number of IN lists to generate without --conn')
+    parser.add_argument('--max-size', type=int, default=1000, help='largest IN list to generate without --conn')
+    args = parser.parse_args()
+
+    if args.conn:
+        report_server(args.conn, args.pattern)
+    else:
+        report_texts(args.lists, args.max_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark of the preparation of database transaction statements.
+
+Compares the accumulation of insertion parameter sets into a statement batch (prepare_sql_insert) against the previous
+accumulation into a dictionary of parameter lists, where each parameter set was checked for uniqueness by scanning the
+list. Both paths start from the same DataFrame of records and are checked to produce the same parameter sets.
+
+Usage:
+    python statement_benchmark.py --rows 1000 10000 100000 --legacy-max 20000
+
+The list-scan accumulation is quadratic in the number of rows and is skipped for sizes above --legacy-max.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import REM.database as mod_db
+
+TABLE = 'BenchmarkRecords'
+
+
+def generate_records(nrow):
+    """
+    Generate a DataFrame of records with a small fraction of duplicated rows.
+    """
+    rng = np.random.default_rng(nrow)
+
+    df = pd.DataFrame({'RecordID': ['BR{:08d}'.format(i) for i in range(nrow)],
+                       'Amount': np.round(rng.uniform(0, 1e5, nrow), 2),
+                       'Quantity': rng.integers(0, 1000, nrow),
+                       'Notes': rng.choice(['', 'checked', 'pending', None], nrow)})
+
+    return pd.concat([df, df.sample(frac=0.01, random_state=nrow)], ignore_index=True)
+
+
+def legacy_insert(table, columns, df, statements: dict = None):
+    """
+    Accumulate insertion parameter sets as prepare_sql_insert did before statement batches.
+    """
+    if not statements:
+        statements = {}
+
+    params = [tuple([mod_db.convert_datatypes(i) for i in param_tup]) for param_tup in
+              [tuple(i) for i in df.values.tolist()]]
+
+    markers = '({})'.format(','.join(['?' for _ in columns]))
+    insert_str = 'INSERT INTO {TABLE} {COLS} VALUES {VALS};' \
+        .format(TABLE=table, COLS='({})'.format(','.join(columns)), VALS=markers)
+
+    if insert_str not in statements:
+        statements[insert_str] = []
+
+    for param_tuple in params:
+        if param_tuple not in statements[insert_str]:
+            statements[insert_str].append(param_tuple)
+
+    return statements
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the preparation of database transaction statements')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000], help='numbers of records')
+    parser.add_argument('--legacy-max', type=int, default=20000,
+                        help='largest number of records to run the list-scan accumulation on')
+    args = parser.parse_args()
+
+    print('{:>8}  {:>12}  {:>12}  {:>8}'.format('rows', 'list scan', 'batch', 'speedup'))
+    for nrow in args.rows:
+        df = generate_records(nrow)
+        columns = df.columns.tolist()
+
+        start = time.perf_counter()
+        batch = mod_db.prepare_sql_insert(TABLE, columns, df)
+        statements, params = batch.flatten()
+        batch_time = time.perf_counter() - start
+
+        if nrow > args.legacy_max:
+            print('{:>8}  {:>12}  {:>11.4f}s  {:>8}'.format(nrow, 'skipped', batch_time, '-'))
+            continue
+
+        start = time.perf_counter()
+        legacy = legacy_insert(TABLE, columns, df)
+        legacy_time = time.perf_counter() - start
+
+        if list(legacy) != statements or list(legacy.values()) != params:
+            print('statement batch parameters differ from the list-scan parameters for {} records'.format(nrow))
+
+        print('{:>8}  {:>11.4f}s  {:>11.4f}s  {:>7.1f}x'
+              .format(nrow, legacy_time, batch_time, legacy_time / batch_time))
+
+
+if __name__ == "__main__":
+    main()